@@ -1,15 +1,39 @@
 #CIRCULAR QUEUE VISUALIZER
 from tkinter import *
 from tkinter import messagebox
-import time
+from animation_engine import AnimationEngine
+from canvas_items import CanvasItemCache
+from frame_scheduler import FrameScheduler
+from ring_buffer import RingBuffer
+from tree_viewport import visible_region
 
+#Slot geometry: slot i spans [SLOT_X + i * SLOT_PITCH, + SLOT_WIDTH] on the queue row
+SLOT_X = 230
+SLOT_PITCH = 64
+SLOT_WIDTH = 60
+ROW_TOP = 253
+ROW_BOTTOM = 297
 
-#Size of the Circular Queue taken as 10
+
+def slot_left(index):
+    return SLOT_X + index * SLOT_PITCH
+
+
+def slot_center(index):  #Index -1 is where both arrows rest while the queue is empty
+    return slot_left(index) + SLOT_WIDTH // 2
+
+
+#Queue state lives in a RingBuffer; the canvas only draws the slots in view,
+#so the capacity can be raised to thousands without creating thousands of items
 class CircularQueue:
-    def __init__(self, root):
+    def __init__(self, root, capacity=10):
         self.window = root
-        self.canvas_make = Canvas(self.window, width=1150, height=500, bg="chocolate", relief=RAISED, bd=8)
+        self.queue = RingBuffer(capacity, typecode=None)  #Any label text, like the original list
+        self.canvas_make = Canvas(self.window, width=1150, height=500, bg="chocolate", relief=RAISED, bd=8,
+                                  xscrollcommand=self._on_xscroll)
         self.canvas_make.pack()
+        self.scroll_x = Scrollbar(self.window, orient=HORIZONTAL, command=self._xview)
+        self.scroll_x.pack(fill=X)
         #Initialize somethings that should be NULL by default
         self.rear_indicator = None
         self.front_indicator = None
@@ -21,22 +45,17 @@ class CircularQueue:
 
         self.make_label = None
         self.status_label = None
-        #By default value set
-        self.rear_index = -1
-        self.front_index = -1
-        self.input_label_x = 80
-        self.input_label_y = 410
-        self.index_marker = 85
-        self.start_x = 0
-        self.start_y = 0
-        self.rear_move = 0
-        self.rear_move_indicator = 62
-        self.front_move_indicator = 62
-        self.rear_label_position_controller = 176
-        self.front_label_position_controller = 176
-        #By default make list to store box number with label
-        self.value_store = []
+        #Current x of each arrow's center, so a move only needs the difference
+        self.marker_x = {"rear": slot_center(-1), "front": slot_center(-1)}
+        self.in_flight = set()  #Slots whose value is still animating towards them
         self.value_show = []
+        #Slot rectangles, index numbers and values are synced only for visible slots
+        self.slot_items = CanvasItemCache(self.canvas_make, tag="slot")
+        self.scheduler = FrameScheduler(self.canvas_make)
+        self.scheduler.register("slots", self.render_slots)
+        #Animations run from after() callbacks, one queued operation at a time
+        self.animator = AnimationEngine(self.canvas_make)
+        self.canvas_make.bind("<Configure>", lambda e: self.scheduler.mark_dirty("slots"))
         #Default function call
         self.set_up()
         self.show_result()
@@ -47,48 +66,39 @@ class CircularQueue:
                              font=("Arial", 25, "bold", "italic"))
         make_heading.place(x=350, y=20)
         #Make Queue Container
-        self.canvas_make.create_line(229, 250, 611 + 254 + 3, 250, width=3, fill="yellow")
-        self.canvas_make.create_line(229, 300, 611 + 254 + 3, 300, width=3, fill="yellow")
-
-        take_x = 190
-        for i in range(11):
-            make_index = Label(self.canvas_make, text=i - 1, bg="chocolate", fg="blue", font=("Arial", 15, "bold"))
-            make_index.place(x=take_x, y=165 + 50)
-            take_x += 63
+        row_end = slot_left(self.queue.capacity) + 4
+        self.canvas_make.create_line(SLOT_X - 1, 250, row_end, 250, width=3, fill="yellow")
+        self.canvas_make.create_line(SLOT_X - 1, 300, row_end, 300, width=3, fill="yellow")
+        self.canvas_make.create_text(slot_center(-1), 228, text=-1, fill="blue", font=("Arial", 15, "bold"))
 
         #About rear
-        points_rear = (205, 255 + 50, 205 - 20, (255 + 320) / 2 + 50, 205 - 10, (255 + 320) / 2 + 50, 205 - 10,
-                       320 + 50, 205 + 10, 320 + 50, 205 + 10, (255 + 320) / 2 + 50, 205 + 20, (255 + 320) / 2 + 50)
-        self.rear_indicator = self.canvas_make.create_polygon(points_rear, width=3, fill="#0FFF0F", outline="black")
-        self.rear_label = Label(self.canvas_make, text="rear", fg="brown", bg="chocolate", font=("Arial", 20, "bold"))
-        self.rear_label.place(x=self.rear_label_position_controller, y=323 + 50)
+        x = slot_center(-1)
+        points_rear = (x, 255 + 50, x - 20, (255 + 320) / 2 + 50, x - 10, (255 + 320) / 2 + 50, x - 10,
+                       320 + 50, x + 10, 320 + 50, x + 10, (255 + 320) / 2 + 50, x + 20, (255 + 320) / 2 + 50)
+        self.rear_indicator = self.canvas_make.create_polygon(points_rear, width=3, fill="#0FFF0F", outline="black",
+                                                             tags=("rear",))
+        self.rear_label = self.canvas_make.create_text(x - 29, 323 + 50, anchor=NW, text="rear", fill="brown",
+                                                       font=("Arial", 20, "bold"), tags=("rear",))
 
         #About front
-        points_front = (205, 160 + 50, 205 - 20, (160 + 90) / 2 + 50, 205 - 10, (160 + 90) / 2 + 50, 205 - 10, 90 + 50,
-                        205 + 10, 90 + 50, 205 + 10, (160 + 90) / 2 + 50, 205 + 20, (160 + 90) / 2 + 50)
-        self.front_indicator = self.canvas_make.create_polygon(points_front, width=3, fill="#0FFF0F", outline="black")
-        self.front_label = Label(self.canvas_make, text="front", fg="brown", bg="chocolate", font=("Arial", 20, "bold"))
-        self.front_label.place(x=self.front_label_position_controller, y=50 + 50)
-
-        #About index no.
-        points_index = (660 + 20 + 254, 230, (660 + 580) / 2 - 7 + 20 + 254, 230 - 20, (660 + 580) / 2 + 20 + 254,
-                        230 - 7, 580 + 20 + 254, 230 - 7, 580 + 20 + 254, 230 + 7, (660 + 580) / 2 + 20 + 254, 230 + 7,
-                        (660 + 580) / 2 - 7 + 20 + 254, 230 + 20)
+        points_front = (x, 160 + 50, x - 20, (160 + 90) / 2 + 50, x - 10, (160 + 90) / 2 + 50, x - 10, 90 + 50,
+                        x + 10, 90 + 50, x + 10, (160 + 90) / 2 + 50, x + 20, (160 + 90) / 2 + 50)
+        self.front_indicator = self.canvas_make.create_polygon(points_front, width=3, fill="#0FFF0F", outline="black",
+                                                              tags=("front",))
+        self.front_label = self.canvas_make.create_text(x - 29, 50 + 50, anchor=NW, text="front", fill="brown",
+                                                        font=("Arial", 20, "bold"), tags=("front",))
+
+        #About index no., pointing at the end of the row
+        end = row_end - 12
+        points_index = (end + 80, 230, end + 33, 230 - 20, end + 40, 230 - 7, end, 230 - 7, end, 230 + 7,
+                        end + 40, 230 + 7, end + 33, 230 + 20)
         self.canvas_make.create_polygon(points_index, width=3, fill="red", outline="black")
-        index_no = Label(self.canvas_make, text="Index no.", fg="#9B1B30", bg="chocolate", font=("Arial", 15, "bold"))
-        index_no.place(x=690 + 254, y=215)
-
-        #Make small room in queue
-        self.canvas_make.create_rectangle(230, 253, 290, 297, width=3)
-        self.canvas_make.create_rectangle(294, 253, 354, 297, width=3)
-        self.canvas_make.create_rectangle(358, 253, 418, 297, width=3)
-        self.canvas_make.create_rectangle(422, 253, 482, 297, width=3)
-        self.canvas_make.create_rectangle(486, 253, 546, 297, width=3)
-        self.canvas_make.create_rectangle(550, 253, 610, 297, width=3)
-        self.canvas_make.create_rectangle(614, 253, 674, 297, width=3)
-        self.canvas_make.create_rectangle(678, 253, 738, 297, width=3)
-        self.canvas_make.create_rectangle(742, 253, 802, 297, width=3)
-        self.canvas_make.create_rectangle(806, 253, 866, 297, width=3)
+        self.canvas_make.create_text(end + 90, 215, anchor=NW, text="Index no.", fill="#9B1B30",
+                                     font=("Arial", 15, "bold"))
+
+        self.scroll_width = max(1150, end + 200)
+        self.canvas_make.configure(scrollregion=(0, 0, self.scroll_width, 500))
+        self.scheduler.mark_dirty("slots")
 
     def show_result(self):
         self.status_label = Label(self.window, text="At first, root Node value inserted to the queue", fg="blue",
@@ -103,135 +113,139 @@ class CircularQueue:
             self.value_show[i].place(x=distance_maintainer, y=430)
             distance_maintainer += 70
 
+    #Scrolling
+    def _xview(self, *args):
+        self.canvas_make.xview(*args)
+        self.scheduler.mark_dirty("slots")
+
+    def _on_xscroll(self, first, last):
+        self.scroll_x.set(first, last)
+        self.scheduler.mark_dirty("slots")
+
+    def visible_slots(self):
+        x0, _, x1, _ = visible_region(self.canvas_make)
+        first = max(0, int((x0 - SLOT_X) // SLOT_PITCH))
+        last = min(self.queue.capacity - 1, int((x1 - SLOT_X) // SLOT_PITCH))
+        return first, last
+
+    def reveal(self, index):  #Scroll so that slot index is in view
+        first, last = self.visible_slots()
+        if first <= index <= last:
+            return
+        self.canvas_make.xview_moveto(max(0.0, (slot_center(index) - 575) / self.scroll_width))
+        self.scheduler.mark_dirty("slots")
+
+    def render_slots(self):
+        first, last = self.visible_slots()
+        cache = self.slot_items
+        cache.begin()
+        for i in range(first, last + 1):
+            x = slot_left(i)
+            cache.sync(("slot", i), "rectangle", (x, ROW_TOP, x + SLOT_WIDTH, ROW_BOTTOM), width=3)
+            cache.sync(("index", i), "text", (x + SLOT_WIDTH // 2, 228), text=i, fill="blue",
+                       font=("Arial", 15, "bold"))
+            value = self.queue.slot(i)
+            if value is not None and i not in self.in_flight:
+                cache.sync(("value", i), "rectangle", (x + 1, ROW_TOP + 1, x + SLOT_WIDTH - 1, ROW_BOTTOM - 1),
+                           width=3, fill="black", outline="blue")
+                cache.sync(("label", i), "text", (x + 20, ROW_TOP + 8), anchor=NW, text=value, fill="red",
+                           font=("Arial", 12, "bold"))
+        cache.end()
+        self.canvas_make.tag_raise("rear")
+        self.canvas_make.tag_raise("front")
+
+    #Animation speeds in pixels per second, scaled by animator.speed
+    ARROW_SPEED = 250
+    BOX_SPEED = 800
+    LONGEST_MOVE = 1.5  #Seconds; wraparounds across a wide queue speed up to fit
+
+    def set_speed(self, speed):  #1.0 = default, 2.0 = twice as fast
+        self.animator.set_speed(speed)
+
+    def set_batch_mode(self, enabled):  #Batch mode skips animations entirely
+        self.animator.instant = enabled
+        if enabled:
+            self.animator.skip()
+
     def box_insert(self, value):  #Box insert in Queue
-        self.make_box = self.canvas_make.create_rectangle(60, 402, 120, 444, width=3, fill="black", outline="blue")
-        self.make_label = Label(self.window, text=value, fg="red", bg="black",
-                                font=("Arial", 12, "bold"))
-        self.make_label.place(x=self.input_label_x, y=self.input_label_y)
-
-        if self.front_index > 0 and self.rear_index == 9:
-            self.rear_reset()
-
-        else:
-            if self.rear_index < 9:
-                self.rear_index += 1
-            if self.front_index == -1:
-                self.front_index = 0
-            self.rear_move = 0
-            while self.rear_move < self.rear_move_indicator:  #Move rear and front arrow with label
-                self.rear_label.place_forget()
-                self.rear_label_position_controller += 2
-                self.rear_label.place(x=self.rear_label_position_controller, y=323 + 50)
-                self.canvas_make.move(self.rear_indicator, 2, 0)
-                if self.rear_index == 0:  #Only When rear == 0, then if front == -1,front = 0
-                    self.front_label.place_forget()
-                    self.front_label_position_controller += 2
-                    self.front_label.place(x=self.front_label_position_controller, y=50 + 50)
-                    self.canvas_make.move(self.front_indicator, 2, 0)
-                self.rear_move += 2
-                time.sleep(0.008)
-                self.window.update()
-
-        while self.start_y < 37:  #Block with label vertical movement
-            self.make_label.place_forget()
-            self.canvas_make.move(self.make_box, 0, -4)
-            self.start_y += 1
-            self.input_label_y -= 4
-            self.make_label.place(x=self.input_label_x, y=self.input_label_y)
-            time.sleep(0.005)
-            self.window.update()
-
-        while self.start_x < self.index_marker:  #Block with label horizontal movement
-            self.make_label.place_forget()
-            self.canvas_make.move(self.make_box, 2, 0)
-            self.start_x += 1
-            self.input_label_x += 2
-            self.make_label.place(x=self.input_label_x, y=self.input_label_y)
-            self.window.update()
-
-        self.reset_and_store()
-
-    def rear_reset(self):  #When rear is 9 and again input value, rear becomes at 0 index
-        rear_move = 312 + 254
-        while rear_move > 0:
-            self.rear_label.place_forget()
-            self.rear_label_position_controller -= 2
-            self.rear_label.place(x=self.rear_label_position_controller, y=323 + 50)
-            self.canvas_make.move(self.rear_indicator, -2, 0)
-            if self.rear_index == 0:
-                self.front_label.place_forget()
-                self.front_label_position_controller -= 2
-                self.front_label.place(x=self.front_label_position_controller, y=50 + 50)
-                self.canvas_make.move(self.front_indicator, -2, 0)
-            rear_move -= 2
-            time.sleep(0.01)
-            self.window.update()
-        self.index_marker = 85
-        self.rear_index = 0
-
-    def reset_and_store(self):  #For reset some variable and store box value with corresponding label
-        temp = []
-        temp.append(self.make_box)
-        temp.append(self.make_label)
-        self.value_store.append(temp)
-        self.start_x = 0
-        self.start_y = 0
-        self.index_marker += 32
-        self.input_label_x = 80
-        self.input_label_y = 410
+        self.animator.submit(self._insert_steps, value)
 
     def deletion(self):  #For delete a value from the Queue
-        if self.front_index == -1 and self.rear_index == -1:
+        self.animator.submit(self._deletion_steps)
+
+    def insert_many(self, values):  #Bulk enqueue, drawn as a single update
+        self.animator.submit(self._insert_many_steps, values)
+
+    def delete_many(self, count):  #Bulk dequeue, drawn as a single update
+        self.animator.submit(self._delete_many_steps, count)
+
+    def move_marker(self, markers, index, px_per_sec):
+        dx = slot_center(index) - self.marker_x[markers[0]]
+        for marker in markers:
+            self.marker_x[marker] += dx
+        return self.animator.move(markers, dx, 0, self.pace(dx, px_per_sec))
+
+    def pace(self, distance, px_per_sec):
+        return max(px_per_sec, abs(distance) / self.LONGEST_MOVE)
+
+    def _insert_steps(self, value):
+        #Runs when the previous operation has finished, so the model already
+        #holds the final state of the last one
+        was_empty = self.queue.is_empty()
+        if not self.queue.enqueue(value):
+            messagebox.showerror("Overflow", "The Queue is full")
+            return []
+        rear = self.queue.rear_index
+        self.reveal(rear)
+        self.in_flight.add(rear)
+
+        #Move rear arrow with label, and front too when the queue was empty
+        steps = [self.move_marker(("rear", "front") if was_empty else ("rear",), rear, self.ARROW_SPEED)]
+
+        #Block with label: up into the row, then across to its slot
+        left = self.canvas_make.canvasx(0) + 60
+        self.make_box = self.canvas_make.create_rectangle(left, 402, left + 60, 444, width=3, fill="black",
+                                                          outline="blue")
+        self.make_label = self.canvas_make.create_text(left + 20, 410, anchor=NW, text=value, fill="red",
+                                                       font=("Arial", 12, "bold"))
+        box = (self.make_box, self.make_label)
+        steps.append(self.animator.move(box, 0, -4 * 37, self.BOX_SPEED))
+        dx = slot_left(rear) - left
+        steps.append(self.animator.move(box, dx, 0, self.pace(dx, self.BOX_SPEED)))
+        steps.append(lambda: self._land(box, rear))
+        return steps
+
+    def _land(self, box, index):  #The moving block hands over to the slot's cached items
+        self.canvas_make.delete(*box)
+        self.in_flight.discard(index)
+        self.scheduler.mark_dirty("slots")
+
+    def _deletion_steps(self):
+        if self.queue.is_empty():
             messagebox.showerror("Underflow", "The Queue is empty")
             self.window.destroy()
-        else:
-            if self.value_store:
-                self.canvas_make.delete(self.value_store[0][0])
-                self.value_store[0][1].place_forget()
-                self.value_store.pop(0)
-
-            if self.rear_index == self.front_index:
-                self.default_reset()
-            elif self.front_index == 9 and self.rear_index < self.front_index:
-                self.take_zero_reset()
-            else:
-                front_move = 0
-                while front_move < self.front_move_indicator:
-                    self.front_label.place_forget()
-                    self.front_label_position_controller += 2
-                    self.front_label.place(x=self.front_label_position_controller, y=50 + 50)
-                    self.canvas_make.move(self.front_indicator, 2, 0)
-                    front_move += 2
-                    time.sleep(0.01)
-                    self.window.update()
-                if self.front_index < 9:
-                    self.front_index += 1
-
-    def default_reset(self):  #When rear == front, set both at -1
-        while self.rear_label_position_controller != 176:
-            self.rear_label.place_forget()
-            self.front_label.place_forget()
-            self.rear_label_position_controller -= 2
-            self.front_label_position_controller -= 2
-            self.rear_label.place(x=self.rear_label_position_controller, y=323 + 50)
-            self.front_label.place(x=self.front_label_position_controller, y=50 + 50)
-            self.canvas_make.move(self.rear_indicator, -2, 0)
-            self.canvas_make.move(self.front_indicator, -2, 0)
-            time.sleep(0.008)
-            self.window.update()
-
-        self.front_index = -1
-        self.rear_index = -1
-        self.index_marker = 85
-
-    def take_zero_reset(self):  #When front == 9 , then after deletion set front at 0
-        front_move = 312 + 254
-        while front_move > 0:
-            self.front_label.place_forget()
-            self.front_label_position_controller -= 2
-            self.front_label.place(x=self.front_label_position_controller, y=50 + 50)
-            self.canvas_make.move(self.front_indicator, -2, 0)
-            front_move -= 2
-            time.sleep(0.008)
-            self.window.update()
-        self.front_index = 0
\ No newline at end of file
+            return []
+        self.queue.dequeue()
+        self.scheduler.mark_dirty("slots")
+        return self._marker_steps()
+
+    def _insert_many_steps(self, values):
+        if self.queue.extend(values) < len(values):
+            messagebox.showerror("Overflow", "The Queue is full")
+        self.scheduler.mark_dirty("slots")
+        return self._marker_steps()
+
+    def _delete_many_steps(self, count):
+        self.queue.drain(count)
+        self.scheduler.mark_dirty("slots")
+        return self._marker_steps()
+
+    def _marker_steps(self):  #Move both arrows to wherever the model says they are
+        front, rear = self.queue.front_index, self.queue.rear_index
+        if front != -1:
+            self.reveal(front)
+        steps = []
+        for marker, index in (("front", front), ("rear", rear)):
+            if slot_center(index) != self.marker_x[marker]:
+                steps.append(self.move_marker((marker,), index, self.ARROW_SPEED))
+        return steps
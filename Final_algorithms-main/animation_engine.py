@@ -0,0 +1,111 @@
+#ANIMATION ENGINE
+#Non-blocking tweens for Tk canvas items, driven by after() callbacks.
+#Operations are queued and run one after another, so repeated clicks line
+#up instead of re-entering a half finished animation.
+import time
+from collections import deque
+
+
+class Tween:
+    #Moves every item/tag in items by (dx, dy) at px_per_sec
+    __slots__ = ("items", "dx", "dy", "px_per_sec")
+
+    def __init__(self, items, dx, dy, px_per_sec):
+        self.items = items
+        self.dx = dx
+        self.dy = dy
+        self.px_per_sec = px_per_sec
+
+    def duration(self, speed):
+        distance = max(abs(self.dx), abs(self.dy))
+        if distance == 0 or self.px_per_sec <= 0 or speed <= 0:
+            return 0.0
+        return distance / (self.px_per_sec * speed)
+
+
+class AnimationEngine:
+    def __init__(self, canvas, fps=60):
+        self.canvas = canvas
+        self.fps = fps
+        self.speed = 1.0      #Multiplier on every tween's px/sec
+        self.instant = False  #Batch mode: apply tweens without animating
+        self._operations = deque()
+        self._steps = deque()
+        self._tween = None
+        self._tween_start = 0.0
+        self._moved = (0.0, 0.0)
+        self._after_id = None
+
+    @staticmethod
+    def move(items, dx, dy, px_per_sec):
+        return Tween(items, dx, dy, px_per_sec)
+
+    def submit(self, operation, *args):
+        #operation(*args) runs when its turn comes and returns its steps:
+        #Tweens to animate and plain callables to run in between
+        self._operations.append((operation, args))
+        self._pump()
+
+    @property
+    def busy(self):
+        return self._tween is not None or bool(self._steps) or bool(self._operations)
+
+    def set_speed(self, speed):
+        self.speed = speed
+
+    def skip(self):
+        #Finish the running tween and every queued operation right now
+        instant = self.instant
+        self.instant = True
+        if self._tween is not None:
+            self._finish_tween()
+        self._pump()
+        self.instant = instant
+
+    def _pump(self):
+        while self._tween is None:
+            if not self._steps:
+                if not self._operations:
+                    return
+                operation, args = self._operations.popleft()
+                self._steps.extend(operation(*args) or ())
+                continue
+            step = self._steps.popleft()
+            if not isinstance(step, Tween):
+                step()
+            elif self.instant or step.duration(self.speed) == 0:
+                self._move(step, step.dx, step.dy)
+            else:
+                self._tween = step
+                self._tween_start = time.perf_counter()
+                self._moved = (0.0, 0.0)
+                self._after_id = self.canvas.after(int(1000 / self.fps), self._frame)
+
+    def _frame(self):
+        self._after_id = None
+        tween = self._tween
+        duration = tween.duration(self.speed)
+        fraction = 1.0 if duration == 0 else min(1.0, (time.perf_counter() - self._tween_start) / duration)
+        if fraction >= 1.0:
+            self._finish_tween()
+            self._pump()
+            return
+        moved_x, moved_y = self._moved
+        target_x, target_y = tween.dx * fraction, tween.dy * fraction
+        self._move(tween, target_x - moved_x, target_y - moved_y)
+        self._moved = (target_x, target_y)
+        self._after_id = self.canvas.after(int(1000 / self.fps), self._frame)
+
+    def _finish_tween(self):
+        if self._after_id is not None:
+            self.canvas.after_cancel(self._after_id)
+            self._after_id = None
+        tween = self._tween
+        moved_x, moved_y = self._moved
+        self._move(tween, tween.dx - moved_x, tween.dy - moved_y)
+        self._tween = None
+
+    def _move(self, tween, dx, dy):
+        if dx or dy:
+            for item in tween.items:
+                self.canvas.move(item, dx, dy)
@@ -1,159 +1,212 @@
 #BINARY SEARCH TREE LOGIC
+from array import array
+from collections import deque
+
+from node_pool import NodePool
+
+
+def _notation_from_path(bits):
+    #One int() call over the whole path instead of a bigint multiply per level
+    if bits is None:
+        return None
+    return int('1' + ''.join(bits), 2)
+
 
 class BSTNode:
     def __init__(self, value):
         self.value = value
         self.left = None
         self.right = None
-        self.notation_index = 0
+        self.payload = None  #Value in map mode, count in multiset mode
 
 
 class BinarySearchTree:
-    def __init__(self):
+    def __init__(self, pool_size=0):
         self.root = None
-        self.nodes = []
+        self.size = 0  #Kept up to date by insert/delete, so len() is O(1)
+        #Optional capped free list: deleted nodes are handed to later inserts,
+        #so don't hold on to a node after deleting its value
+        self.pool = NodePool(pool_size) if pool_size else None
 
-    def insert(self, value):
-        if self.root is None:
-            self.root = BSTNode(value)
-            self.root.notation_index = 1
-            self.nodes = [self.root]
-            return True
+    def _new_node(self, value):
+        node = self.pool.take() if self.pool is not None else None
+        if node is None:
+            return BSTNode(value)
+        node.value = value
+        node.payload = None
+        return node
 
-        return self._insert_recursive(self.root, value)
+    def insert(self, value):
+        return self.find_or_insert(value)[1]  #No duplicates
 
-    def _insert_recursive(self, node, value):
-        if value == node.value:
-            return False  #No duplicates
+    def find_or_insert(self, value):
+        #One descent: (node, False) if the value is there, else the new node
+        #and True.  Iterative so deep (unbalanced) trees don't hit the
+        #recursion limit
+        if self.root is None:
+            self.root = self._new_node(value)
+            self.size = 1
+            return self.root, True
+
+        node = self.root
+        while True:
+            if value == node.value:
+                return node, False
+
+            if value < node.value:
+                if node.left is None:
+                    node.left = self._new_node(value)
+                    self.size += 1
+                    return node.left, True
+                node = node.left
 
-        if value < node.value:
-            if node.left is None:
-                node.left = BSTNode(value)
-                node.left.notation_index = node.notation_index * 2
-                self.nodes.append(node.left)
-                return True
             else:
-                return self._insert_recursive(node.left, value)
-
-        else:
-            if node.right is None:
-                node.right = BSTNode(value)
-                node.right.notation_index = node.notation_index * 2 + 1
-                self.nodes.append(node.right)
-                return True
-            else:
-                return self._insert_recursive(node.right, value)
+                if node.right is None:
+                    node.right = self._new_node(value)
+                    self.size += 1
+                    return node.right, True
+                node = node.right
 
     def delete(self, value):
-        if self.root is None:
-            return False
-
-        self.root, deleted = self._delete_recursive(self.root, value)
-        if deleted:
-            self._update_nodes_list()
-        return deleted
-
-    def _delete_recursive(self, node, value):
+        parent, node = None, self.root
+        while node is not None and node.value != value:
+            parent, node = node, (node.left if value < node.value else node.right)
         if node is None:
-            return node, False
-
-        if value < node.value:
-            node.left, deleted = self._delete_recursive(node.left, value)
-
-        elif value > node.value:
-            node.right, deleted = self._delete_recursive(node.right, value)
+            return False
 
+        if node.left is not None and node.right is not None:
+            #Two children: copy the in-order successor up and unlink it instead
+            parent, successor = node, node.right
+            while successor.left is not None:
+                parent, successor = successor, successor.left
+            node.value = successor.value
+            node.payload = successor.payload
+            node = successor
+
+        child = node.left if node.left is not None else node.right
+        if parent is None:
+            self.root = child
+        elif parent.left is node:
+            parent.left = child
         else:
-            if node.left is None:
-                return node.right, True
-            elif node.right is None:
-                return node.left, True
-            else:
-                min_node = self._find_min(node.right)
-                node.value = min_node.value
-                node.right, _ = self._delete_recursive(node.right, min_node.value)
-                return node, True
+            parent.right = child
+        self.size -= 1
+        if self.pool is not None:
+            node.left = node.right = None
+            self.pool.give(node)
+        return True
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def nodes(self):
+        #Built on demand (pre-order), like CompactBinarySearchTree.nodes
+        stack = [self.root] if self.root else []
+        result = []
+        while stack:
+            node = stack.pop()
+            result.append(node)
+            if node.right:
+                stack.append(node.right)
+            if node.left:
+                stack.append(node.left)
+        return result
 
-        return node, False
+    def clear(self):
+        self.root = None
+        self.size = 0
 
     def _find_min(self, node):
         while node.left is not None:
             node = node.left
         return node
 
-    def _update_nodes_list(self):
-        self.nodes = []
-        if self.root:
-            self._collect_nodes(self.root)
-
-    def _collect_nodes(self, node):
-        if node:
-            self.nodes.append(node)
-            self._collect_nodes(node.left)
-            self._collect_nodes(node.right)
-
     def search(self, value):
-        return self._search_recursive(self.root, value)
+        node = self.root
+        while node is not None and node.value != value:
+            node = node.left if value < node.value else node.right
+        return node
 
-    def _search_recursive(self, node, value):
-        if node is None or node.value == value:
-            return node
+    def get_notation_index(self, value):
+        #Heap-style position (root 1, left 2i, right 2i + 1), computed on
+        #demand from the current root path so it stays right after deletes
+        return _notation_from_path(self._path_bits(value))
+
+    def _path_bits(self, value):
+        bits = []
+        node = self.root
+        while node is not None:
+            if value == node.value:
+                return bits
+            if value < node.value:
+                bits.append('0')
+                node = node.left
+            else:
+                bits.append('1')
+                node = node.right
+        return None
+
+    #Lazy traversals: values are produced one at a time, so a caller that
+    #only shows the first screenful never walks the rest of the tree.  The
+    #tree must not be modified while one of these is being consumed.
+    def iter_pre_order(self):
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            yield node.value
+            if node.right:
+                stack.append(node.right)
+            if node.left:
+                stack.append(node.left)
+
+    def iter_in_order(self):
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.value
+            node = node.right
+
+    def iter_post_order(self):
+        stack = []
+        node, last = self.root, None
+        while stack or node:
+            if node:
+                stack.append(node)
+                node = node.left
+                continue
+            top = stack[-1]
+            if top.right and top.right is not last:
+                node = top.right
+            else:
+                yield top.value
+                last = stack.pop()
 
-        if value < node.value:
-            return self._search_recursive(node.left, value)
-        else:
-            return self._search_recursive(node.right, value)
+    def iter_level_order(self):
+        queue = deque([self.root] if self.root else [])
+        while queue:
+            node = queue.popleft()
+            yield node.value
+            if node.left:
+                queue.append(node.left)
+            if node.right:
+                queue.append(node.right)
 
     def pre_order_traversal(self):
-        result = []
-        self._pre_order_recursive(self.root, result)
-        return result
-
-    def _pre_order_recursive(self, node, result):
-        if node:
-            result.append(node.value)
-            self._pre_order_recursive(node.left, result)
-            self._pre_order_recursive(node.right, result)
+        return list(self.iter_pre_order())
 
     def in_order_traversal(self):
-        result = []
-        self._in_order_recursive(self.root, result)
-        return result
-
-    def _in_order_recursive(self, node, result):
-        if node:
-            self._in_order_recursive(node.left, result)
-            result.append(node.value)
-            self._in_order_recursive(node.right, result)
+        return list(self.iter_in_order())
 
     def post_order_traversal(self):
-        result = []
-        self._post_order_recursive(self.root, result)
-        return result
-
-    def _post_order_recursive(self, node, result):
-        if node:
-            self._post_order_recursive(node.left, result)
-            self._post_order_recursive(node.right, result)
-            result.append(node.value)
+        return list(self.iter_post_order())
 
     def level_order_traversal(self):
-        if not self.root:
-            return []
-
-        result = []
-        queue = [self.root]
-
-        while queue:
-            node = queue.pop(0)
-            result.append(node.value)
-
-            if node.left:
-                queue.append(node.left)
-            if node.right:
-                queue.append(node.right)
-
-        return result
+        return list(self.iter_level_order())
 
     def is_empty(self):
         return self.root is None
@@ -169,3 +222,266 @@ class BinarySearchTree:
         right_height = self._height_recursive(node.right)
 
         return max(left_height, right_height) + 1
+
+
+#COMPACT STORAGE ENGINE
+#Same public API as BinarySearchTree, but values and left/right child slots
+#live in parallel typed arrays instead of one BSTNode object per value.
+#Values must fit in a signed 64-bit integer.
+
+NO_CHILD = -1
+
+
+class CompactBSTNode:
+    #Read-only view of one slot so callers can keep using node.value etc.
+    __slots__ = ("tree", "slot")
+
+    def __init__(self, tree, slot):
+        self.tree = tree
+        self.slot = slot
+
+    @property
+    def value(self):
+        return self.tree._values[self.slot]
+
+    @property
+    def left(self):
+        return self.tree._view(self.tree._left[self.slot])
+
+    @property
+    def right(self):
+        return self.tree._view(self.tree._right[self.slot])
+
+    def __eq__(self, other):
+        return (isinstance(other, CompactBSTNode)
+                and other.tree is self.tree and other.slot == self.slot)
+
+    def __hash__(self):
+        return hash((id(self.tree), self.slot))
+
+
+class CompactBinarySearchTree:
+    def __init__(self):
+        self._values = array('q')
+        self._left = array('i')
+        self._right = array('i')
+        self._root = NO_CHILD
+        self._free = NO_CHILD  #Deleted slots, chained through _left
+        self._size = 0
+
+    def _view(self, slot):
+        if slot == NO_CHILD:
+            return None
+        return CompactBSTNode(self, slot)
+
+    @property
+    def root(self):
+        return self._view(self._root)
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def nodes(self):
+        #Built on demand instead of being stored next to the arrays
+        return [CompactBSTNode(self, slot) for slot in self._pre_order_slots()]
+
+    def _new_slot(self, value):
+        if self._free != NO_CHILD:
+            slot = self._free
+            self._free = self._left[slot]
+            self._values[slot] = value
+            self._left[slot] = NO_CHILD
+            self._right[slot] = NO_CHILD
+        else:
+            slot = len(self._values)
+            self._values.append(value)
+            self._left.append(NO_CHILD)
+            self._right.append(NO_CHILD)
+        return slot
+
+    def _free_slot(self, slot):
+        self._left[slot] = self._free
+        self._right[slot] = NO_CHILD
+        self._free = slot
+
+    def insert(self, value):
+        if self._root == NO_CHILD:
+            self._root = self._new_slot(value)
+            self._size = 1
+            return True
+
+        values, left, right = self._values, self._left, self._right
+        slot = self._root
+        while True:
+            current = values[slot]
+            if value == current:
+                return False  #No duplicates
+            if value < current:
+                child = left[slot]
+                if child == NO_CHILD:
+                    left[slot] = self._new_slot(value)
+                    self._size += 1
+                    return True
+            else:
+                child = right[slot]
+                if child == NO_CHILD:
+                    right[slot] = self._new_slot(value)
+                    self._size += 1
+                    return True
+            slot = child
+
+    def delete(self, value):
+        values, left, right = self._values, self._left, self._right
+        parent = NO_CHILD
+        slot = self._root
+        while slot != NO_CHILD and values[slot] != value:
+            parent = slot
+            slot = left[slot] if value < values[slot] else right[slot]
+        if slot == NO_CHILD:
+            return False
+
+        if left[slot] != NO_CHILD and right[slot] != NO_CHILD:
+            #Copy the in-order successor up, then unlink the successor instead
+            parent = slot
+            successor = right[slot]
+            while left[successor] != NO_CHILD:
+                parent = successor
+                successor = left[successor]
+            values[slot] = values[successor]
+            slot = successor
+
+        child = left[slot] if left[slot] != NO_CHILD else right[slot]
+        if parent == NO_CHILD:
+            self._root = child
+        elif left[parent] == slot:
+            left[parent] = child
+        else:
+            right[parent] = child
+        self._free_slot(slot)
+        self._size -= 1
+        return True
+
+    def search(self, value):
+        values, left, right = self._values, self._left, self._right
+        slot = self._root
+        while slot != NO_CHILD:
+            current = values[slot]
+            if value == current:
+                return CompactBSTNode(self, slot)
+            slot = left[slot] if value < current else right[slot]
+        return None
+
+    def get_notation_index(self, value):
+        values, left, right = self._values, self._left, self._right
+        bits = []
+        slot = self._root
+        while slot != NO_CHILD:
+            current = values[slot]
+            if value == current:
+                return _notation_from_path(bits)
+            if value < current:
+                bits.append('0')
+                slot = left[slot]
+            else:
+                bits.append('1')
+                slot = right[slot]
+        return None
+
+    def _pre_order_slots(self):
+        left, right = self._left, self._right
+        stack = [self._root] if self._root != NO_CHILD else []
+        while stack:
+            slot = stack.pop()
+            yield slot
+            if right[slot] != NO_CHILD:
+                stack.append(right[slot])
+            if left[slot] != NO_CHILD:
+                stack.append(left[slot])
+
+    def iter_pre_order(self):
+        values = self._values
+        for slot in self._pre_order_slots():
+            yield values[slot]
+
+    def iter_in_order(self):
+        values, left, right = self._values, self._left, self._right
+        stack = []
+        slot = self._root
+        while stack or slot != NO_CHILD:
+            while slot != NO_CHILD:
+                stack.append(slot)
+                slot = left[slot]
+            slot = stack.pop()
+            yield values[slot]
+            slot = right[slot]
+
+    def iter_post_order(self):
+        values, left, right = self._values, self._left, self._right
+        stack = []
+        slot, last = self._root, NO_CHILD
+        while stack or slot != NO_CHILD:
+            if slot != NO_CHILD:
+                stack.append(slot)
+                slot = left[slot]
+                continue
+            top = stack[-1]
+            if right[top] != NO_CHILD and right[top] != last:
+                slot = right[top]
+            else:
+                yield values[top]
+                last = stack.pop()
+
+    def iter_level_order(self):
+        values, left, right = self._values, self._left, self._right
+        queue = deque([self._root] if self._root != NO_CHILD else [])
+        while queue:
+            slot = queue.popleft()
+            yield values[slot]
+            if left[slot] != NO_CHILD:
+                queue.append(left[slot])
+            if right[slot] != NO_CHILD:
+                queue.append(right[slot])
+
+    def pre_order_traversal(self):
+        values = self._values
+        return [values[slot] for slot in self._pre_order_slots()]
+
+    def in_order_traversal(self):
+        return list(self.iter_in_order())
+
+    def post_order_traversal(self):
+        #Root-right-left pre-order, reversed: cheaper than the lazy walk
+        values, left, right = self._values, self._left, self._right
+        result = []
+        stack = [self._root] if self._root != NO_CHILD else []
+        while stack:
+            slot = stack.pop()
+            result.append(values[slot])
+            if left[slot] != NO_CHILD:
+                stack.append(left[slot])
+            if right[slot] != NO_CHILD:
+                stack.append(right[slot])
+        result.reverse()
+        return result
+
+    def level_order_traversal(self):
+        return list(self.iter_level_order())
+
+    def is_empty(self):
+        return self._root == NO_CHILD
+
+    def get_height(self):
+        left, right = self._left, self._right
+        height = 0
+        level = [self._root] if self._root != NO_CHILD else []
+        while level:
+            height += 1
+            next_level = []
+            for slot in level:
+                if left[slot] != NO_CHILD:
+                    next_level.append(left[slot])
+                if right[slot] != NO_CHILD:
+                    next_level.append(right[slot])
+            level = next_level
+        return height
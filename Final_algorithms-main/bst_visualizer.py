@@ -2,6 +2,12 @@
 from tkinter import *
 from tkinter import messagebox
 import random
+from bst_logic import BinarySearchTree
+from canvas_items import CanvasItemCache
+from op_trace import OpTrace
+from traversal_panel import TraversalPanel
+from tree_worker import TreeWorker
+from tree_viewport import cull, min_columns_for, subtree_stats, visible_region
 
 class BSTVisualizer:
     def __init__(self, root):
@@ -34,10 +40,10 @@ class BSTVisualizer:
         self.canvas.pack(side=LEFT, fill=BOTH, expand=True)
 
         #Scrollbars
-        self.v_scroll = Scrollbar(inner, orient=VERTICAL, command=self.canvas.yview)
+        self.v_scroll = Scrollbar(inner, orient=VERTICAL, command=self._yview)
         self.v_scroll.pack(side=RIGHT, fill=Y)
 
-        self.h_scroll = Scrollbar(self.frame, orient=HORIZONTAL, command=self.canvas.xview)
+        self.h_scroll = Scrollbar(self.frame, orient=HORIZONTAL, command=self._xview)
         self.h_scroll.pack(side=BOTTOM, fill=X)
 
         #Bind scrollbars to canvas
@@ -63,20 +69,15 @@ class BSTVisualizer:
                                      font=("Times New Roman", 15, "bold", "italic"))
         self.traversal_label.place(x=530, y=10)
 
-        #Traversal output labels
-        self.value_show = []
-        pos = 8
-        for i in range(15):
-            lbl = Label(self.result_canvas, bg="white", fg="black",
-                        text=" ", width=4, height=1,
-                        font=("Arial", 15, "bold", "italic"),
-                        relief=SUNKEN, bd=5)
-            lbl.place(x=pos, y=50)
-            self.value_show.append(lbl)
-            pos += 91
-
-        #Root of BST
-        self.root_node = None
+        #Traversal output: a scrollable row that only draws the cells in view
+        self.traversal_panel = TraversalPanel(self.result_canvas, width=1320)
+        self.traversal_panel.place(x=8, y=45, width=1325, height=80)
+        self.animate_var = BooleanVar(value=False)
+        self.traversal_step_ms = 400
+
+        #The tree itself lives in the logic engine; this class only keeps
+        #per-node rendering state in side tables keyed by node
+        self.tree = BinarySearchTree()
 
         #Node input
         self.input_entry = Entry(self.window, fg="black", bg="white", width=5,
@@ -125,208 +126,323 @@ class BSTVisualizer:
                          command=self.create_random_tree)
         self.random_btn.place(x=1180, y=415) 
 
+        Checkbutton(self.window, text="Animate", variable=self.animate_var,
+                    bg="light blue", font=("Arial", 10, "bold")).place(x=1190, y=360)
+
+        #How many values Random Tree inserts
+        self.random_count_entry = Entry(self.window, fg="black", bg="white", width=7,
+                                        font=("Arial", 12, "bold"))
+        self.random_count_entry.insert(0, "10")
+        self.random_count_entry.place(x=1200, y=385)
+
 
         #layout
-        self._inorder_counter = 0
-        self.h_gap = 120      
-        self.v_gap = 120       
-        self.canvas_center_x = 580  
-
-    #Node structure
-    class Node:
-        def __init__(self, value):
-            self.value = value
-            self.left = None
-            self.right = None
-            self.oval = None
-            self.text = None
-            self.x = 0
-            self.y = 0
-
-    #tree height
-    def get_height(self, node):
-        if not node:
-            return 0
-        return 1 + max(self.get_height(node.left), self.get_height(node.right))
-    
+        self.h_gap = 120
+        self.v_gap = 120
+        self.canvas_center_x = 580
+        self.node_radius = 25
+        self.zoom = 1.0
+        #Subtrees narrower than this many pixels collapse into one glyph
+        self.lod_px = 24
+        self._node_count = 0
+        #node -> (in-order column, depth), refreshed by _relayout
+        self.cells = {}
+        self._stats = {}
+        #Node highlighted by an animated traversal
+        self.highlight = None
+        #Canvas items are kept between redraws and only patched when they change
+        self.items = CanvasItemCache(self.canvas)
+        #Random trees and the relayout after deletes in big trees run on a
+        #worker thread; Esc cancels
+        self.worker = TreeWorker(self.window)
+        self.job = None
+        self.background_nodes = 20000
+        #With TREE_TRACE set, operations are recorded for tree_cli.py to replay
+        self.trace = OpTrace.from_env("bst")
+        self.layout_stale = False
+        self.window.bind("<Escape>", lambda event: self.cancel_job())
+        self.window.bind("<Destroy>", self._on_destroy, add="+")
+
+        #Only the scrolled-in part is drawn, so redraw on resize/scroll/zoom
+        self.canvas.bind("<Configure>", lambda event: self.render_view())
+        self.canvas.bind("<Control-MouseWheel>",
+                         lambda event: self.set_zoom(self.zoom * (1.25 if event.delta > 0 else 0.8)))
+        self.canvas.bind("<Control-Button-4>", lambda event: self.set_zoom(self.zoom * 1.25))
+        self.canvas.bind("<Control-Button-5>", lambda event: self.set_zoom(self.zoom * 0.8))
+
+    @property
+    def root_node(self):
+        return self.tree.root
+
+    #Background jobs
+    def _on_destroy(self, event):
+        if event.widget is self.window:
+            self.worker.close()
+            if self.trace is not None:
+                self.trace.close()
+
+    def _record(self, command, values=()):
+        if self.trace is not None:
+            self.trace.record(command, values)
+
+    def _busy(self):
+        if self.job is None:
+            return False
+        self.status_label.config(text=f"Busy: {self.job.name} (Esc cancels)")
+        return True
+
+    def run_job(self, name, fn, *args, on_done=None, on_cancel=None):
+        def finish():
+            self.job = None
+            self.status_label.config(text="BST Algorithm")
+
+        def done(result):
+            finish()
+            on_done(result)
+
+        def cancelled():
+            finish()
+            if on_cancel:
+                on_cancel()
+
+        def failed(error):
+            finish()
+            messagebox.showerror("Error", f"{name} failed:\n{error}")
+
+        def progress(done, total, snapshot):
+            self.status_label.config(text=f"{name}: {done:,}/{total:,} (Esc cancels)")
+
+        self.status_label.config(text=f"{name}... (Esc cancels)")
+        self.job = self.worker.submit(name, fn, *args, on_progress=progress,
+                                      on_done=done, on_cancel=cancelled, on_error=failed)
+
+    def cancel_job(self):
+        if self.job is not None:
+            self.job.cancel()
+
     #insertion
     def insert_node(self):
-        val = self.input_entry.get()
-        if not val.isdigit():
+        if self._busy():
+            return
+        #Accepts one integer or several separated by commas/spaces
+        tokens = self.input_entry.get().replace(",", " ").split()
+        if not tokens or not all(token.isdigit() for token in tokens):
             messagebox.showerror("Input Error!", "Please enter an integer!")
             return
 
-        val = int(val)
         self.input_entry.delete(0, END)
+        values = [int(token) for token in tokens]
+        if self.insert_values(values) == 0 and len(values) == 1:
+            messagebox.showerror("Duplicate!", "Duplicated values is not allowed!")
 
-        if self.root_node is None:
-            self.root_node = self.Node(val)
-        else:
-            self._insert(self.root_node, val)
+    def insert_values(self, values):
+        #Batch insert: one relayout and one redraw however many values
+        self._tree_changing()
+        self._record("insert", values)
+        inserted = [val for val in values if self.tree.insert(val)]
+        if inserted:
+            #Only nodes at or after the smallest new value can have moved
+            self.layout_and_draw(start_value=min(inserted))
+        return len(inserted)
 
-        #Compute positions and redraw tree
-        self.layout_and_draw()
+    #In-order layout
+    def layout_and_draw(self, start_value=None):
+        """Lays out the tree and redraws the visible part.  With start_value,
+        only nodes whose value is >= start_value are laid out again, since an
+        insert or delete never moves anything that comes before it in-order."""
+        self._node_count = self._relayout(start_value)
+        self._stats = subtree_stats(self.root_node, lambda n: (n.left, n.right))
+        self.render_view()
+
+    def layout_in_background(self, start_value=None):
+        #Same as layout_and_draw, but the relayout runs on the worker against
+        #a copy of the cells; the tree must not change until it is done
+        def relayout(job, root, cells):
+            count = self._relayout(start_value, root, cells)
+            job.check()
+            return cells, count, subtree_stats(root, lambda n: (n.left, n.right))
+
+        def done(result):
+            self.layout_stale = False
+            self.cells, self._node_count, self._stats = result
+            self.render_view()
+
+        def cancelled():
+            #A cancelled relayout leaves nothing half done: just do it here
+            self.layout_stale = False
+            self.layout_and_draw(start_value)
+
+        self.layout_stale = True
+        self.run_job("relayout", relayout, self.root_node, dict(self.cells), on_done=done,
+                     on_cancel=cancelled)
+
+    def _relayout(self, start_value=None, root=None, cells=None):
+        """Single iterative in-order pass assigning (rank, depth) to every
+        node from start_value on.  Defaults to this tree and self.cells;
+        returns the node count."""
+        #Descend to the first node >= start_value, remembering the path so
+        #the walk can resume from there with correct depth and parent
+        if cells is None:
+            root, cells = self.root_node, self.cells
+        if start_value is None:
+            cells.clear()
+        stack = []
+        rank = 0
+        node, depth = root, 0
+        while node:
+            if start_value is None or node.value >= start_value:
+                stack.append((node, depth))
+                node, depth = node.left, depth + 1
+            else:
+                #Everything up to here keeps its rank
+                rank = cells[node][0] + 1
+                node, depth = node.right, depth + 1
 
-    def _insert(self, node, val):
-        if val == node.value:
-            messagebox.showerror("Duplicate!", "Duplicated values is not allowed!")
-            return
+        while stack:
+            node, depth = stack.pop()
+            cells[node] = (rank, depth)
+            rank += 1
 
-        if val < node.value:
-            if node.left is None:
-                node.left = self.Node(val)
-            else:
-                self._insert(node.left, val)
-        else:
-            if node.right is None:
-                node.right = self.Node(val)
-            else:
-                self._insert(node.right, val)
+            child, child_depth = node.right, depth + 1
+            while child:
+                stack.append((child, child_depth))
+                child, child_depth = child.left, child_depth + 1
 
-    #In-order layout
-    def layout_and_draw(self):
-        #Clear canvas items
-        self.canvas.delete("all")
-        #Reset inorder counter
-        self._inorder_counter = 0
-
-        #Assigns x positions (in-order) and y positions by depth
-        self._assign_positions(self.root_node, depth=1)
-
-        #Center the layout around desired center x
-        if self.root_node:
-            #Finds min and max x
-            xs = []
-            def collect_x(n):
-                if not n: return
-                xs.append(n.x)
-                collect_x(n.left)
-                collect_x(n.right)
-            collect_x(self.root_node)
-            if xs:
-                min_x, max_x = min(xs), max(xs)
-                current_center = (min_x + max_x) / 2
-                shift = self.canvas_center_x - current_center
-                if abs(shift) > 0.1:
-                    self._shift_tree(self.root_node, shift)
-
-        #Draw nodes and lines
-        self._draw_all(self.root_node)
-
-        #Update scrollregion
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-
-    def _assign_positions(self, node, depth):
-        #docstring 
-        """In-order traversal that assigns x positions based on inorder index
-           and y positions based on depth. This keeps the tree compact and
-           preserves BST ordering horizontally."""
-        if not node:
-            return
-        #left
-        self._assign_positions(node.left, depth + 1)
+        return rank
 
-        #Assign x based on inorder counter
-        x = (self._inorder_counter + 1) * self.h_gap
-        y = 50 + (depth - 1) * self.v_gap
-        node.x = x
-        node.y = y
-        self._inorder_counter += 1
+    def set_zoom(self, zoom):
+        self.zoom = min(2.0, max(0.05, zoom))
+        self.render_view()
 
-        #Right
-        self._assign_positions(node.right, depth + 1)
+    def _xview(self, *args):
+        self.canvas.xview(*args)
+        self.render_view()
 
-    def _shift_tree(self, node, shift):
-        if not node:
-            return
-        node.x += shift
-        self._shift_tree(node.left, shift)
-        self._shift_tree(node.right, shift)
+    def _yview(self, *args):
+        self.canvas.yview(*args)
+        self.render_view()
+
+    def _pixel(self, node):
+        rank, depth = self.cells[node]
+        return ((rank + 1) * self.h_gap * self.zoom,
+                50 + depth * self.v_gap * self.zoom)
 
     #Tree drawing
-    def _draw_all(self, node):
-        if not node:
+    def render_view(self):
+        """Draws the nodes, edges and collapsed subtrees that intersect the
+        scrolled-in region, reusing canvas items from the previous frame."""
+        if self.layout_stale:
+            return  #cells are being rebuilt for the changed tree
+        self.items.begin()
+        if not self.root_node:
+            self.items.end()
             return
-        #Draw left subtree first
-        if node.left:
-            self._draw_all(node.left)
-            self.draw_line(node, node.left)
-        if node.right:
-            self._draw_all(node.right)
-            self.draw_line(node, node.right)
-        #Draw node itself
-        self.draw_node(node)
+
+        h_gap = self.h_gap * self.zoom
+        v_gap = self.v_gap * self.zoom
+        r = self.node_radius * self.zoom
+        count, height = self._stats[self.root_node]
+
+        #Center the layout around desired center x: in-order x runs from
+        #h_gap to count * h_gap, so the shift is known without scanning nodes
+        current_center = (h_gap + count * h_gap) / 2
+        offset = self.canvas_center_x - current_center
+        self.items.set_offset(offset, 0)
+
+        #Scrollregion comes from the layout, most items are never created
+        self.canvas.configure(scrollregion=(offset + h_gap - r - 5, 0,
+                                            offset + count * h_gap + r + 5,
+                                            50 + (height - 1) * v_gap + r + 5))
+
+        x0, y0, x1, y1 = visible_region(self.canvas, pad=int(h_gap))
+        columns = ((x0 - offset) / h_gap - 1, (x1 - offset) / h_gap - 1)
+        rows = ((y0 - 50) / v_gap, (y1 - 50) / v_gap)
+        view = cull(self.root_node, lambda n: (n.left, n.right),
+                    self.cells.__getitem__, self._stats,
+                    columns, rows, min_columns_for(h_gap, self.lod_px))
+
+        for parent, child in view.edges:
+            self.draw_line(parent, child)
+        for node in view.nodes:
+            self.draw_node(node)
+        for node in view.collapsed:
+            self.draw_collapsed(node)
+
+        self.items.end()
+        if self.items.created:
+            self.canvas.tag_lower("edge")
 
     def draw_node(self, node):
-        r = 25
-        node.oval = self.canvas.create_oval(node.x - r, node.y - r,
-                                            node.x + r, node.y + r,
-                                            fill="green", outline="yellow", width=2)
-        node.text = self.canvas.create_text(node.x, node.y,
-                                            text=str(node.value),
-                                            fill="yellow",
-                                            font=("Arial", 12, "bold"))
+        r = self.node_radius * self.zoom
+        x, y = self._pixel(node)
+        self.items.sync(("oval", node), "oval",
+                        (x - r, y - r, x + r, y + r),
+                        fill="orange" if node is self.highlight else "green",
+                        outline="yellow", width=2, tags=("node",))
+        self.items.sync(("text", node), "text", (x, y),
+                        text=str(node.value), fill="yellow",
+                        font=("Arial", max(6, int(12 * self.zoom)), "bold"), tags=("node",))
 
     def draw_line(self, parent, child):
         #Draws line from parent to child
-        self.canvas.create_line(parent.x, parent.y + 25,
-                                child.x, child.y - 25,
-                                width=3, fill="red4")
+        r = self.node_radius * self.zoom
+        px, py = self._pixel(parent)
+        cx, cy = self._pixel(child)
+        self.items.sync(("edge", child), "line",
+                        (px, py + r, cx, cy - r),
+                        width=3, fill="red4", tags=("edge",))
+
+    def draw_collapsed(self, node):
+        #Summary glyph for a subtree too narrow to draw: a triangle over its
+        #columns labelled with node count and height
+        size, height = self._stats[node]
+        h_gap = self.h_gap * self.zoom
+        x, y = self._pixel(node)
+        lo = x - (self._stats[node.left][0] if node.left else 0) * h_gap
+        hi = x + (self._stats[node.right][0] if node.right else 0) * h_gap
+        bottom = y + max(1, height - 1) * self.v_gap * self.zoom
+        self.items.sync(("glyph", node), "polygon", (x, y, lo, bottom, hi, bottom),
+                        fill="green", outline="yellow", tags=("glyph",))
+        self.items.sync(("glyph_text", node), "text", (x, bottom + 8),
+                        text=f"{size} / h{height}", fill="black",
+                        font=("Arial", 7), tags=("glyph",))
 
     #Transversals
     def traverse(self, order):
-        for lbl in self.value_show:
-            lbl.config(text=" ")
-
-        self._counter = 0
-
+        if self._busy():
+            return
         if not self.root_node:
+            self.traversal_panel.clear()
             messagebox.showinfo("Empty Tree!", "BST is empty!")
             return
 
-        if order == "pre":
-            self._pre_order(self.root_node)
-        elif order == "in":
-            self._in_order(self.root_node)
-        elif order == "post":
-            self._post_order(self.root_node)
-        elif order == "level":
-            self._level_order()
-
-    def _pre_order(self, node):
-        if node:
-            self.value_show[self._counter].config(text=node.value)
-            self._counter += 1
-            self._pre_order(node.left)
-            self._pre_order(node.right)
-
-    def _in_order(self, node):
-        if node:
-            self._in_order(node.left)
-            self.value_show[self._counter].config(text=node.value)
-            self._counter += 1
-            self._in_order(node.right)
-
-    def _post_order(self, node):
-        if node:
-            self._post_order(node.left)
-            self._post_order(node.right)
-            self.value_show[self._counter].config(text=node.value)
-            self._counter += 1
-
-    def _level_order(self):
-        queue = [self.root_node]
-        while queue:
-            node = queue.pop(0)
-            self.value_show[self._counter].config(text=node.value)
-            self._counter += 1
-            if node.left:
-                queue.append(node.left)
-            if node.right:
-                queue.append(node.right)
+        self._record("dump", [order + "order"])
+        walks = {"pre": self.tree.iter_pre_order, "in": self.tree.iter_in_order,
+                 "post": self.tree.iter_post_order, "level": self.tree.iter_level_order}
+        animate = self.animate_var.get()
+        self._set_highlight(None)
+        self.traversal_panel.show(walks[order](), total=len(self.tree), animate=animate,
+                                  step_ms=self.traversal_step_ms,
+                                  on_step=self._on_traversal_step if animate else None,
+                                  on_done=(lambda: self._set_highlight(None)) if animate else None)
+
+    def _on_traversal_step(self, index, value):
+        self._set_highlight(self.tree.search(value))
+
+    def _set_highlight(self, node):
+        if node is not self.highlight:
+            self.highlight = node
+            self.render_view()
+
+    def _tree_changing(self):
+        #A lazy traversal must not keep walking a tree that is being modified
+        self.traversal_panel.detach()
+        self.highlight = None
 
     #Delete and redraw
     def delete_node(self):
+        if self._busy():
+            return
         val = self.input_entry.get()
         if not val.isdigit():
             messagebox.showerror("Input Error", "Enter integer")
@@ -335,30 +451,29 @@ class BSTVisualizer:
         val = int(val)
         self.input_entry.delete(0, END)
 
-        self.root_node = self._delete(self.root_node, val)
-        #Recomputes positions and redraw
-        self.layout_and_draw()
-
-    def _delete(self, node, val):
-        if node is None:
+        #Relayout starts at the smallest value that can move: a lone left
+        #subtree moves up a level, everything else affected is >= val
+        target = self.tree.search(val)
+        if target is None:
             messagebox.showinfo("Not Found", f"{val} not found")
-            return None
-
-        if val < node.value:
-            node.left = self._delete(node.left, val)
-        elif val > node.value:
-            node.right = self._delete(node.right, val)
+            return
+        start_value = val
+        if target.left and target.right is None:
+            start_value = self._min_value_node(target.left).value
+        #With two children the successor's node is the one unlinked
+        removed = target
+        if target.left and target.right:
+            removed = self._min_value_node(target.right)
+
+        self._tree_changing()
+        self._record("delete", [val])
+        self.tree.delete(val)
+        self.cells.pop(removed, None)
+        #Recomputes positions and redraw
+        if len(self.tree) >= self.background_nodes:
+            self.layout_in_background(start_value)
         else:
-            if node.left is None:
-                return node.right
-            if node.right is None:
-                return node.left
-
-            successor = self._min_value_node(node.right)
-            node.value = successor.value
-            node.right = self._delete(node.right, successor.value)
-
-        return node
+            self.layout_and_draw(start_value=start_value)
 
     def _min_value_node(self, node):
         while node.left:
@@ -366,37 +481,47 @@ class BSTVisualizer:
         return node
     
     def create_random_tree(self):
-        #Clear existing tree
-        self.root_node = None
+        if self._busy():
+            return
+        count = self.random_count_entry.get()
+        if not count.isdigit() or int(count) < 1:
+            messagebox.showerror("Input Error", "Enter a positive integer count")
+            return
+        count = int(count)
 
         #Generate a list of random integers
-        values = random.sample(range(1, 101), 10)  #Avoids duplicates automatically
-
-        #Insert all values into the BST
-        for val in values:
-            self._insert_random(self.root_node, val) if self.root_node else self._set_root(val)
-
-        #Redraw the tree
-        self.layout_and_draw()
-
-    #Sets root if tree is empty
-    def _set_root(self, val):
-        self.root_node = self.Node(val)
-
-    #Recursive insert method that avoids duplicate messages
-    def _insert_random(self, node, val):
-        if val == node.value:
+        values = random.sample(range(1, max(101, count * 10)), count)  #Avoids duplicates automatically
+
+        #Small trees are built right here, laying out and drawing once
+        if count < self.background_nodes:
+            self._tree_changing()
+            self._record("clear")
+            self.tree = BinarySearchTree()
+            self.cells.clear()
+            self.insert_values(values)
             return
-        if val < node.value:
-            if node.left is None:
-                node.left = self.Node(val)
-            else:
-                self._insert_random(node.left, val)
-        else:
-            if node.right is None:
-                node.right = self.Node(val)
-            else:
-                self._insert_random(node.right, val)
+
+        #Big ones on the worker; the current tree stays up until it's done
+        def build(job, values):
+            tree = BinarySearchTree()
+            for i, val in enumerate(values):
+                tree.insert(val)
+                if not i & 1023:
+                    job.check()
+                    job.report(i, len(values))
+            cells = {}
+            node_count = self._relayout(None, tree.root, cells)
+            job.check()
+            return tree, cells, node_count, subtree_stats(tree.root, lambda n: (n.left, n.right))
+
+        def done(result):
+            self._tree_changing()
+            self.tree, self.cells, self._node_count, self._stats = result
+            self._record("clear")
+            self._record("insert", values)
+            self.render_view()
+
+        self.run_job("random tree", build, values, on_done=done)
 
 if __name__ == "__main__":
     window = Tk()
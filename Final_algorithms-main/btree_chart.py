@@ -0,0 +1,72 @@
+import random
+import time
+import tracemalloc
+import matplotlib.pyplot as plt
+from bst_logic import BinarySearchTree, CompactBinarySearchTree
+from rbt_logic import RedBlackTree
+from btree_logic import BTree
+
+
+def build(make_tree, nums):
+    """Builds a tree from nums and returns it with the bytes it holds."""
+    tracemalloc.start()
+    tree = make_tree()
+    for num in nums:
+        tree.insert(num)
+    if hasattr(tree, "rebalance_all"):
+        tree.rebalance_all()
+        tree.steps.clear()          # the step log is not part of the tree
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tree, used
+
+
+def measure_lookups(tree, queries):
+    """Returns successful + failed lookups per second."""
+    search = getattr(tree, "search_value", None) or tree.search
+    start = time.perf_counter()
+    for q in queries:
+        search(q)
+    end = time.perf_counter()
+    return len(queries) / (end - start)
+
+
+# --- same node counts used for the BST / RBT charts ---
+sizes = [10000, 20000, 30000, 50000, 60000]
+engines = {
+    "BST": BinarySearchTree,
+    "Compact BST": CompactBinarySearchTree,
+    "Red-Black": lambda: RedBlackTree(color_only=False),
+    "B-Tree (t=32)": lambda: BTree(order=32),
+}
+
+throughput = {name: [] for name in engines}
+bytes_per_key = {name: [] for name in engines}
+for n in sizes:
+    nums = random.sample(range(n * 10), n)
+    queries = random.sample(range(n * 10), n)      # ~10% hits, rest misses
+    for name, make_tree in engines.items():
+        tree, used = build(make_tree, nums)
+        ops = measure_lookups(tree, queries)
+        throughput[name].append(ops)
+        bytes_per_key[name].append(used / n)
+        print(f"{n} nodes  {name:<14} → {ops:,.0f} lookups/s, {used / n:.1f} bytes/key")
+
+# --- plot the comparison ---
+fig, (ax_ops, ax_mem) = plt.subplots(1, 2, figsize=(11, 4))
+for name in engines:
+    ax_ops.plot(sizes, throughput[name], marker='o', label=name)
+    ax_mem.plot(sizes, bytes_per_key[name], marker='o', label=name)
+ax_ops.set_title("Lookup Throughput")
+ax_ops.set_xlabel("Total Input Nodes")
+ax_ops.set_ylabel("Lookups / second")
+ax_mem.set_title("Memory per Key")
+ax_mem.set_xlabel("Total Input Nodes")
+ax_mem.set_ylabel("Bytes / key")
+for ax in (ax_ops, ax_mem):
+    ax.grid(True)
+    ax.legend()
+plt.tight_layout()
+
+plt.savefig("btree_chart.png")
+plt.show()
@@ -0,0 +1,263 @@
+# btree_logic.py  –  pure B-Tree algorithms (no GUI)
+#
+# Wide, array-backed nodes: every node keeps its keys in one contiguous
+# array('q'), so a lookup touches O(log_t n) nodes instead of O(log2 n)
+# scattered RedBlackTreeNode objects.  The public surface mirrors
+# rbt_logic.RedBlackTree so benchmarks and the visualizer can swap it in.
+
+from __future__ import annotations
+from array import array
+from bisect import bisect_left
+from typing import Optional, List, Tuple
+
+
+class BTreeNode:
+    __slots__ = ("keys", "children")
+
+    def __init__(self, leaf: bool = True) -> None:
+        self.keys: array = array("q")
+        # None for leaves, otherwise len(keys) + 1 child nodes
+        self.children: Optional[List[BTreeNode]] = None if leaf else []
+
+    @property
+    def is_leaf(self) -> bool:
+        return self.children is None
+
+
+class BTree:
+    """B-Tree of minimum degree ``order`` (every node but the root holds
+    between order - 1 and 2 * order - 1 keys).  Keys must fit in a signed
+    64-bit integer."""
+
+    def __init__(self, order: int = 32, color_only: bool = False) -> None:
+        if order < 2:
+            raise ValueError("B-Tree order must be >= 2")
+        self.order: int = order
+        self.max_keys: int = 2 * order - 1
+        self.root: BTreeNode = BTreeNode()
+        self.size: int = 0
+        self.steps: List[str] = []
+        # kept for RedBlackTree compatibility: a B-Tree never has pending fixes
+        self.pending_nodes: List[BTreeNode] = []
+        self.color_only: bool = color_only
+
+    # --------------------------------------------------
+    #  INSERTION
+    # --------------------------------------------------
+    def insert(self, value: int) -> None:
+        root = self.root
+        if len(root.keys) == self.max_keys:
+            new_root = BTreeNode(leaf=False)
+            new_root.children.append(root)  # type: ignore
+            self._split_child(new_root, 0)
+            self.root = new_root
+
+        # single top-down pass: full children are split before we enter them
+        node = self.root
+        while True:
+            keys = node.keys
+            i = bisect_left(keys, value)
+            if i < len(keys) and keys[i] == value:
+                self.steps.append(f"Value {value} already exists, skipping.")
+                return
+            if node.children is None:
+                keys.insert(i, value)
+                self.size += 1
+                self.steps.append(f"Inserted key {value}.")
+                return
+            child = node.children[i]
+            if len(child.keys) == self.max_keys:
+                self._split_child(node, i)
+                if keys[i] == value:
+                    self.steps.append(f"Value {value} already exists, skipping.")
+                    return
+                if value > keys[i]:
+                    i += 1
+            node = node.children[i]
+
+    def _split_child(self, parent: BTreeNode, i: int) -> None:
+        t = self.order
+        child = parent.children[i]  # type: ignore
+        right = BTreeNode(leaf=child.children is None)
+        median = child.keys[t - 1]
+        right.keys = child.keys[t:]
+        del child.keys[t - 1:]
+        if child.children is not None:
+            right.children = child.children[t:]
+            del child.children[t:]
+        parent.keys.insert(i, median)
+        parent.children.insert(i + 1, right)  # type: ignore
+        self.steps.append(f"Split node at key {median}.")
+
+    def rebalance_step(self) -> None:
+        self.steps.append("No pending nodes to rebalance.")
+
+    def rebalance_all(self) -> None:
+        pass
+
+    # --------------------------------------------------
+    #  DELETION
+    # --------------------------------------------------
+    def delete(self, value: int) -> None:
+        deleted = self._delete_from(self.root, value)
+        # merges on the way down may have emptied the root
+        if not self.root.keys and self.root.children:
+            self.root = self.root.children[0]
+        if not deleted:
+            self.steps.append(f"Value {value} not found for deletion.")
+            return
+        self.size -= 1
+        self.steps.append(f"Deleted key {value}.")
+
+    def _delete_from(self, node: BTreeNode, value: int) -> bool:
+        # top-down: every child we descend into holds at least `order` keys,
+        # so removing one key from it never needs to walk back up
+        t = self.order
+        while True:
+            keys = node.keys
+            i = bisect_left(keys, value)
+            found = i < len(keys) and keys[i] == value
+            children = node.children
+            if children is None:
+                if found:
+                    del keys[i]
+                return found
+
+            if found:
+                left, right = children[i], children[i + 1]
+                if len(left.keys) >= t:
+                    pred = self._max_key(left)
+                    keys[i] = pred
+                    node, value = left, pred
+                elif len(right.keys) >= t:
+                    succ = self._min_key(right)
+                    keys[i] = succ
+                    node, value = right, succ
+                else:
+                    self._merge(node, i)
+                    node = left
+                continue
+
+            child = children[i]
+            if len(child.keys) == t - 1:
+                if i > 0 and len(children[i - 1].keys) >= t:
+                    self._borrow_from_left(node, i)
+                elif i < len(children) - 1 and len(children[i + 1].keys) >= t:
+                    self._borrow_from_right(node, i)
+                else:
+                    if i == len(children) - 1:
+                        i -= 1
+                    self._merge(node, i)
+                child = children[i]
+            node = child
+
+    def _borrow_from_left(self, parent: BTreeNode, i: int) -> None:
+        child = parent.children[i]  # type: ignore
+        sibling = parent.children[i - 1]  # type: ignore
+        child.keys.insert(0, parent.keys[i - 1])
+        parent.keys[i - 1] = sibling.keys.pop()
+        if sibling.children is not None:
+            child.children.insert(0, sibling.children.pop())  # type: ignore
+
+    def _borrow_from_right(self, parent: BTreeNode, i: int) -> None:
+        child = parent.children[i]  # type: ignore
+        sibling = parent.children[i + 1]  # type: ignore
+        child.keys.append(parent.keys[i])
+        parent.keys[i] = sibling.keys.pop(0)
+        if sibling.children is not None:
+            child.children.append(sibling.children.pop(0))  # type: ignore
+
+    def _merge(self, parent: BTreeNode, i: int) -> None:
+        left = parent.children[i]  # type: ignore
+        right = parent.children[i + 1]  # type: ignore
+        left.keys.append(parent.keys[i])
+        left.keys.extend(right.keys)
+        if left.children is not None:
+            left.children.extend(right.children)  # type: ignore
+        del parent.keys[i]
+        del parent.children[i + 1]  # type: ignore
+
+    def _max_key(self, node: BTreeNode) -> int:
+        while node.children is not None:
+            node = node.children[-1]
+        return node.keys[-1]
+
+    def _min_key(self, node: BTreeNode) -> int:
+        while node.children is not None:
+            node = node.children[0]
+        return node.keys[0]
+
+    # --------------------------------------------------
+    #  SEARCH
+    # --------------------------------------------------
+    def search_value(self, value: int) -> Optional[BTreeNode]:
+        """Return the node holding ``value`` or None."""
+        node = self.root
+        while True:
+            keys = node.keys
+            i = bisect_left(keys, value)
+            if i < len(keys) and keys[i] == value:
+                return node
+            if node.children is None:
+                return None
+            node = node.children[i]
+
+    # --------------------------------------------------
+    #  TRAVERSALS
+    # --------------------------------------------------
+    # Every key is reported with color "black" so results keep the same
+    # (value, color) shape as RedBlackTree traversals.
+    def inorder(self, node: Optional[BTreeNode] = None,
+                result: Optional[List[Tuple[int, str]]] = None) -> List[Tuple[int, str]]:
+        if result is None:
+            result = []
+        if node is None:
+            node = self.root
+        if node.children is None:
+            result.extend((key, "black") for key in node.keys)
+            return result
+        for key, child in zip(node.keys, node.children):
+            self.inorder(child, result)
+            result.append((key, "black"))
+        self.inorder(node.children[-1], result)
+        return result
+
+    def preorder(self, node: Optional[BTreeNode] = None,
+                 result: Optional[List[Tuple[int, str]]] = None) -> List[Tuple[int, str]]:
+        if result is None:
+            result = []
+        if node is None:
+            node = self.root
+        result.extend((key, "black") for key in node.keys)
+        if node.children is not None:
+            for child in node.children:
+                self.preorder(child, result)
+        return result
+
+    def postorder(self, node: Optional[BTreeNode] = None,
+                  result: Optional[List[Tuple[int, str]]] = None) -> List[Tuple[int, str]]:
+        if result is None:
+            result = []
+        if node is None:
+            node = self.root
+        if node.children is not None:
+            for child in node.children:
+                self.postorder(child, result)
+        result.extend((key, "black") for key in node.keys)
+        return result
+
+    def get_height(self) -> int:
+        if not self.root.keys:
+            return 0
+        height = 1
+        node = self.root
+        while node.children is not None:
+            node = node.children[0]
+            height += 1
+        return height
+
+    def clear(self) -> None:
+        self.root = BTreeNode()
+        self.size = 0
+        self.pending_nodes.clear()
+        self.steps.append("Cleared the entire tree.")
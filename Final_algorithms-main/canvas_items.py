@@ -0,0 +1,92 @@
+# canvas_items.py  –  keeps Tk canvas items alive between redraws
+
+import tkinter as tk
+from typing import Any, Dict, Hashable, List, Sequence, Set, Tuple
+
+
+class CanvasItemCache:
+    """Maps a caller-chosen key (a node, an edge tuple, ...) to one canvas item.
+
+    A redraw is ``begin()`` + one ``sync()`` per item that should be visible +
+    ``end()``.  ``sync`` only issues ``coords``/``itemconfigure`` for values that
+    differ from the previous frame, and ``end`` deletes whatever was not synced,
+    so the Tk work of a frame is proportional to what changed.
+
+    Coordinates are given in layout space; ``set_offset`` translates every
+    cached item with a single ``canvas.move`` instead of touching each one.
+    """
+
+    def __init__(self, canvas: tk.Canvas, tag: str = "cached") -> None:
+        self.canvas = canvas
+        self.tag = tag
+        self.offset: Tuple[float, float] = (0, 0)
+        self._items: Dict[Hashable, List[Any]] = {}   # key -> [item id, coords, options]
+        self._seen: Set[Hashable] = set()
+        self.created: int = 0
+        self.updated: int = 0
+        self.deleted: int = 0
+
+    def begin(self) -> None:
+        self._seen = set()
+        self.created = self.updated = self.deleted = 0
+
+    def set_offset(self, dx: float, dy: float) -> None:
+        old_dx, old_dy = self.offset
+        if (dx, dy) != (old_dx, old_dy):
+            self.canvas.move(self.tag, dx - old_dx, dy - old_dy)
+            self.offset = (dx, dy)
+
+    def _placed(self, coords: Tuple[float, ...]) -> List[float]:
+        dx, dy = self.offset
+        return [c + (dy if i % 2 else dx) for i, c in enumerate(coords)]
+
+    def sync(self, key: Hashable, kind: str, coords: Sequence[float], **options: Any) -> int:
+        self._seen.add(key)
+        coords = tuple(coords)
+        entry = self._items.get(key)
+        if entry is None:
+            create = getattr(self.canvas, "create_" + kind)
+            tags = tuple(options.pop("tags", ())) + (self.tag,)
+            item = create(*self._placed(coords), tags=tags, **options)
+            self._items[key] = [item, coords, options]
+            self.created += 1
+            return item
+
+        options.pop("tags", None)
+        item, old_coords, old_options = entry
+        if coords != old_coords:
+            self.canvas.coords(item, *self._placed(coords))
+            entry[1] = coords
+            self.updated += 1
+        if options != old_options:
+            changed = {k: v for k, v in options.items() if old_options.get(k) != v}
+            self.canvas.itemconfigure(item, **changed)
+            entry[2] = options
+            self.updated += 1
+        return item
+
+    def end(self) -> None:
+        for key in self._items.keys() - self._seen:
+            self.canvas.delete(self._items.pop(key)[0])
+            self.deleted += 1
+
+    def discard(self, key: Hashable) -> None:
+        """Delete one item right away, for callers that sync incrementally
+        instead of redrawing a whole frame between begin() and end()."""
+        entry = self._items.pop(key, None)
+        if entry is not None:
+            self.canvas.delete(entry[0])
+            self.deleted += 1
+
+    def item(self, key: Hashable) -> int:
+        return self._items[key][0]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def clear(self) -> None:
+        for item, _, _ in self._items.values():
+            self.canvas.delete(item)
+        self._items.clear()
+        self._seen = set()
+        self.offset = (0, 0)
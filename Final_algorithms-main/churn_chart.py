@@ -0,0 +1,120 @@
+import gc
+import random
+import time
+import matplotlib.pyplot as plt
+from bst_logic import BinarySearchTree
+from rbt_logic import RedBlackTree
+
+N = 20000           # steady-state tree size
+OPS = 100000        # insert/delete pairs per run
+POOL = 1024         # pool capacity for the pooled runs
+
+
+def churn_workload():
+    """N starting keys, then OPS (insert new key, delete a random live key)
+    pairs that keep the tree at N keys.  Generated up front so the runs only
+    time the tree."""
+    rng = random.Random(49)
+    live = rng.sample(range(N * 10), N)
+    start = list(live)
+    present = set(live)
+    ops = []
+    for _ in range(OPS):
+        value = rng.randrange(N * 10)
+        while value in present:
+            value = rng.randrange(N * 10)
+        slot = rng.randrange(N)
+        gone = live[slot]
+        live[slot] = value
+        present.add(value)
+        present.discard(gone)
+        ops.append((value, gone))
+    return start, ops
+
+
+class GCTimer:
+    """Records the wall time of every garbage collection through gc.callbacks."""
+
+    def __init__(self):
+        self.pauses = []
+        self._start = 0.0
+
+    def __call__(self, phase, info):
+        if phase == "start":
+            self._start = time.perf_counter()
+        else:
+            self.pauses.append(time.perf_counter() - self._start)
+
+    def __enter__(self):
+        gc.callbacks.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        gc.callbacks.remove(self)
+
+
+def churn(make, start, ops, is_rbt):
+    """Operations/sec, GC pauses and (reused, allocated) node counts for
+    the churn phase only."""
+    tree = make()
+    for value in start:
+        tree.insert(value)
+        if is_rbt:
+            tree.rebalance_batch(1)
+    if is_rbt:
+        tree.steps.clear()
+    if tree.pool is not None:
+        prefill = tree.pool.stats()
+    gc.collect()
+    with GCTimer() as timer:
+        begin = time.perf_counter()
+        for i, (value, gone) in enumerate(ops):
+            tree.insert(value)
+            if is_rbt:
+                tree.rebalance_batch(1)
+            tree.delete(gone)
+            if is_rbt and not i & 1023:
+                tree.steps.clear()
+        elapsed = time.perf_counter() - begin
+    reuse = None
+    if tree.pool is not None:
+        stats = tree.pool.stats()
+        reuse = (stats["reused"] - prefill["reused"], stats["allocated"] - prefill["allocated"])
+    return 2 * len(ops) / elapsed, timer.pauses, reuse
+
+
+start, ops = churn_workload()
+runs = {
+    "BST":               (lambda: BinarySearchTree(), False),
+    "BST + pool":        (lambda: BinarySearchTree(pool_size=POOL), False),
+    "Red-Black":         (lambda: RedBlackTree(), True),
+    "Red-Black + pool":  (lambda: RedBlackTree(pool_size=POOL), True),
+}
+labels, rates, gc_totals, gc_max = [], [], [], []
+for label, (make, is_rbt) in runs.items():
+    rate, pauses, reuse = churn(make, start, ops, is_rbt)
+    labels.append(label)
+    rates.append(rate)
+    gc_totals.append(sum(pauses) * 1000)
+    gc_max.append(max(pauses, default=0.0) * 1000)
+    print(f"{label:>17}: {rate:,.0f} ops/sec, {len(pauses)} collections, "
+          f"GC total {gc_totals[-1]:.1f} ms, longest {gc_max[-1]:.2f} ms")
+    if reuse is not None:
+        print(f"{'':>17}  pool during churn: {reuse[0]:,} nodes reused, {reuse[1]:,} allocated")
+
+# --- plot throughput and GC time side by side ---
+colors = ['#94a3b8', '#3b82f6', '#fca5a5', '#ef4444']
+fig, (left, right) = plt.subplots(1, 2, figsize=(10, 4))
+left.bar(labels, rates, color=colors)
+left.set_title(f"Churn Throughput ({N:,} keys)")
+left.set_ylabel("Operations per second")
+right.bar(labels, gc_totals, color=colors)
+right.set_title("Total GC Pause During Churn")
+right.set_ylabel("Milliseconds")
+for axis in (left, right):
+    axis.tick_params(axis='x', labelsize=8)
+    axis.grid(True, axis='y')
+plt.tight_layout()
+
+plt.savefig("churn_chart.png")
+plt.show()
@@ -0,0 +1,116 @@
+import random
+import sys
+import threading
+import time
+import matplotlib.pyplot as plt
+from concurrent_tree import ConcurrentTree
+from rbt_logic import RedBlackTree
+
+N = 200000          # keys in the tree
+SECONDS = 2.0       # per measurement
+BATCH = 64          # lookups per read-lock acquire in the batched runs
+
+
+class GlobalLockTree:
+    """What we had before: every call behind one threading.Lock."""
+
+    def __init__(self, tree):
+        self.inner = ConcurrentTree(tree)
+        self.lock = threading.Lock()
+
+    def contains(self, value):
+        with self.lock:
+            return self.inner._contains(value)
+
+    def contains_many(self, values):
+        with self.lock:
+            return [self.inner._contains(value) for value in values]
+
+    def insert(self, value):
+        with self.lock:
+            return self.inner._insert(value)
+
+    def delete(self, value):
+        with self.lock:
+            return self.inner._delete(value)
+
+
+def build():
+    tree = RedBlackTree()
+    for num in random.sample(range(N * 10), N):
+        tree.insert(num)
+        tree.rebalance_batch(1)
+    tree.steps.clear()
+    return tree
+
+
+def measure(wrapper, readers, batched, with_writer):
+    """Lookups/sec summed over `readers` threads, optionally while one
+    writer thread keeps inserting and deleting."""
+    stop = threading.Event()
+    counts = [0] * readers
+
+    def read(slot):
+        rng = random.Random(slot)
+        done = 0
+        while not stop.is_set():
+            if batched:
+                wrapper.contains_many([rng.randrange(N * 10) for _ in range(BATCH)])
+                done += BATCH
+            else:
+                wrapper.contains(rng.randrange(N * 10))
+                done += 1
+        counts[slot] = done
+
+    def write():
+        rng = random.Random(-1)
+        while not stop.is_set():
+            value = rng.randrange(N * 10)
+            wrapper.insert(value)
+            wrapper.delete(value)
+
+    threads = [threading.Thread(target=read, args=(i,)) for i in range(readers)]
+    if with_writer:
+        threads.append(threading.Thread(target=write))
+    for t in threads:
+        t.start()
+    time.sleep(SECONDS)
+    stop.set()
+    for t in threads:
+        t.join()
+    return sum(counts) / SECONDS
+
+
+gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled (free-threaded)'}")
+tree = build()
+thread_counts = [1, 2, 4, 8]
+runs = {
+    "global lock":                  lambda: GlobalLockTree(tree),
+    "reader-writer":                lambda: ConcurrentTree(tree),
+    "reader-writer (batched)":      lambda: ConcurrentTree(tree),
+}
+results = {}
+for with_writer in (False, True):
+    for name, make in runs.items():
+        label = name + (" + writer" if with_writer else "")
+        results[label] = []
+        for readers in thread_counts:
+            rate = measure(make(), readers, "batched" in name, with_writer)
+            results[label].append(rate)
+            print(f"{label:>36}: {readers} readers → {rate:,.0f} lookups/sec")
+
+# --- plot the line chart ---
+plt.figure()
+for label, rates in results.items():
+    plt.plot(thread_counts, rates, marker='o', label=label,
+             linestyle='--' if "writer" in label else '-')
+plt.title(f"Red-Black Tree Read Scaling ({'GIL' if gil else 'free-threaded'} build)")
+plt.xlabel("Reader threads")
+plt.ylabel("Lookups per second")
+plt.legend(fontsize=8)
+plt.grid(True)
+plt.tight_layout()
+
+plt.savefig("concurrent_chart.png")
+plt.show()
@@ -0,0 +1,251 @@
+# concurrent_tree.py  –  reader–writer locked access to a BST or Red-Black tree
+
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional, Union
+
+from bst_logic import BinarySearchTree
+from rbt_logic import RedBlackTree
+from tree_walks import range_values
+
+Tree = Union[BinarySearchTree, RedBlackTree]
+
+
+class ConcurrentModificationError(RuntimeError):
+    """A strict iterator saw the tree change between two of its chunks."""
+
+
+class RWLock:
+    """Many readers or one writer.  Writer-preferring: once a writer is
+    waiting, new readers queue behind it, so a steady stream of reads
+    cannot starve updates."""
+
+    def __init__(self) -> None:
+        # the fast paths only touch the C-level mutex; the condition (and its
+        # Python-level wait/notify) is used only when someone has to wait
+        self._mutex = threading.Lock()
+        self._cond = threading.Condition(self._mutex)
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    def acquire_read(self) -> None:
+        with self._mutex:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self) -> None:
+        with self._mutex:
+            self._readers -= 1
+            if not self._readers and self._writers_waiting:
+                self._cond.notify_all()
+
+    def acquire_write(self) -> None:
+        with self._mutex:
+            self._writers_waiting += 1
+            try:
+                while self._writer or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = True
+
+    def release_write(self) -> None:
+        with self._mutex:
+            self._writer = False
+            self._cond.notify_all()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class TreeWriter:
+    """What a ``batch()`` section works through: the tree's operations with
+    the write lock already held, so a whole batch pays for one acquire."""
+
+    def __init__(self, owner: "ConcurrentTree") -> None:
+        self._owner = owner
+
+    def insert(self, value: int) -> bool:
+        return self._owner._insert(value)
+
+    def delete(self, value: int) -> bool:
+        return self._owner._delete(value)
+
+    def contains(self, value: int) -> bool:
+        return self._owner._contains(value)
+
+
+class ConcurrentTree:
+    """Thread-safe wrapper for ``BinarySearchTree`` or ``RedBlackTree``.
+
+    Lookups, ranges and iteration chunks share a read lock.  Updates take
+    the write lock, one call at a time or a whole ``batch()`` section at
+    once.  Every update bumps ``version``.  Iterators hold the lock only
+    while fetching a chunk and resume after the last value they returned,
+    so they never block a writer for longer than one chunk.  By default they
+    tolerate updates: values inserted ahead of the cursor show up, deleted
+    ones don't.  With ``strict=True`` they raise ConcurrentModificationError
+    instead, like a dict changed during iteration.
+
+    The wrapper's own methods must not be called inside its ``batch()``
+    section (the lock is not reentrant); use the TreeWriter it yields.
+    """
+
+    def __init__(self, tree: Optional[Tree] = None, chunk: int = 256) -> None:
+        self.tree: Tree = tree if tree is not None else RedBlackTree()
+        self.chunk = chunk
+        self.lock = RWLock()
+        self.version = 0
+        if isinstance(self.tree, RedBlackTree):
+            # _insert fixes up one queued node per insert, oldest first, so
+            # nodes left pending by the tree's builder must be settled now
+            self.tree.rebalance_all()
+            self.tree.steps.clear()
+            self._nil = self.tree.nil
+            self._size = len(self._after(None, sys.maxsize))
+        else:
+            self._nil = None
+            self._size = len(self.tree)
+
+    # --------------------------------------------------
+    #  UNLOCKED CORE (caller holds the right lock)
+    # --------------------------------------------------
+    def _insert(self, value: int) -> bool:
+        tree = self.tree
+        if not tree.insert(value):
+            return False
+        if self._nil is not None:
+            tree.rebalance_batch(1)
+            tree.steps.clear()
+        self._size += 1
+        self.version += 1
+        return True
+
+    def _delete(self, value: int) -> bool:
+        if not self.tree.delete(value):
+            return False
+        if self._nil is not None:
+            self.tree.steps.clear()
+        self._size -= 1
+        self.version += 1
+        return True
+
+    def _contains(self, value: int) -> bool:
+        if self._nil is not None:
+            return self.tree.search_value(value) is not None
+        return self.tree.search(value) is not None
+
+    def _after(self, last: Optional[int], limit: int) -> List[int]:
+        """Up to ``limit`` values greater than ``last``, ascending."""
+        nil = self._nil
+        out: List[int] = []
+        stack = []
+        node = self.tree.root
+        while stack or node is not nil:
+            while node is not nil:
+                if last is not None and node.value <= last:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            if not stack:
+                break
+            node = stack.pop()
+            out.append(node.value)
+            if len(out) >= limit:
+                break
+            node = node.right
+        return out
+
+    # --------------------------------------------------
+    #  READS
+    # --------------------------------------------------
+    def __len__(self) -> int:
+        return self._size
+
+    def contains(self, value: int) -> bool:
+        # acquire/release by hand: a @contextmanager costs more than the lookup
+        lock = self.lock
+        lock.acquire_read()
+        try:
+            return self._contains(value)
+        finally:
+            lock.release_read()
+
+    __contains__ = contains
+
+    def contains_many(self, values: Iterable[int]) -> List[bool]:
+        """Many lookups under one read lock."""
+        with self.lock.read():
+            return [self._contains(value) for value in values]
+
+    def range(self, lo: int, hi: int) -> List[int]:
+        with self.lock.read():
+            return range_values(self.tree.root, lo, hi, self._nil)
+
+    def iter_sorted(self, strict: bool = False) -> Iterator[int]:
+        last: Optional[int] = None
+        while True:
+            with self.lock.read():
+                if strict:
+                    if last is None:
+                        seen = self.version
+                    elif self.version != seen:
+                        raise ConcurrentModificationError("tree changed during iteration")
+                values = self._after(last, self.chunk)
+            yield from values
+            if len(values) < self.chunk:
+                return
+            last = values[-1]
+
+    __iter__ = iter_sorted
+
+    # --------------------------------------------------
+    #  WRITES
+    # --------------------------------------------------
+    def insert(self, value: int) -> bool:
+        lock = self.lock
+        lock.acquire_write()
+        try:
+            return self._insert(value)
+        finally:
+            lock.release_write()
+
+    def delete(self, value: int) -> bool:
+        lock = self.lock
+        lock.acquire_write()
+        try:
+            return self._delete(value)
+        finally:
+            lock.release_write()
+
+    @contextmanager
+    def batch(self) -> Iterator[TreeWriter]:
+        """``with tree.batch() as w: w.insert(...)`` – one write lock for
+        the whole section; readers see all of it or none of it."""
+        with self.lock.write():
+            yield TreeWriter(self)
+
+    def insert_many(self, values: Iterable[int]) -> int:
+        with self.batch() as writer:
+            return sum(1 for value in values if writer.insert(value))
+
+    def delete_many(self, values: Iterable[int]) -> int:
+        with self.batch() as writer:
+            return sum(1 for value in values if writer.delete(value))
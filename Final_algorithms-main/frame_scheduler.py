@@ -0,0 +1,66 @@
+# frame_scheduler.py  –  coalesces redraw requests into at most one frame per tick
+
+import time
+import tkinter as tk
+from typing import Callable, Dict, List, Optional, Set
+
+
+class FrameScheduler:
+    """Named render passes that run at most once per frame.
+
+    Anything that changes what is on screen calls ``mark_dirty(name)``; the
+    scheduler arms a single ``after()`` for the next frame boundary and, when
+    it fires, runs every dirty pass once, in registration order.  Nothing is
+    scheduled while nothing is dirty, so an idle window costs no wakeups.
+    """
+
+    def __init__(self, widget: tk.Misc, fps: float = 30) -> None:
+        self.widget = widget
+        self.fps = fps
+        self._passes: List[str] = []
+        self._callbacks: Dict[str, Callable[[], None]] = {}
+        self._dirty: Set[str] = set()
+        self._after_id: Optional[str] = None
+        self._last_frame: float = 0.0
+        self.frames: int = 0
+
+    @property
+    def frame_interval(self) -> float:
+        return 1.0 / self.fps if self.fps > 0 else 0.0
+
+    def register(self, name: str, callback: Callable[[], None]) -> None:
+        if name not in self._callbacks:
+            self._passes.append(name)
+        self._callbacks[name] = callback
+
+    def mark_dirty(self, *names: str) -> None:
+        self._dirty.update(names or self._passes)
+        if self._after_id is None:
+            wait = self._last_frame + self.frame_interval - time.perf_counter()
+            self._after_id = self.widget.after(max(0, int(wait * 1000)), self._run_frame)
+
+    def is_dirty(self, name: str) -> bool:
+        return name in self._dirty
+
+    def flush(self) -> None:
+        """Render pending passes right away instead of at the next tick."""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+        self._run_frame()
+
+    def cancel(self) -> None:
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        self._dirty.clear()
+
+    def _run_frame(self) -> None:
+        self._after_id = None
+        self._last_frame = time.perf_counter()
+        dirty, self._dirty = self._dirty, set()
+        if not dirty:
+            return
+        self.frames += 1
+        for name in self._passes:
+            if name in dirty:
+                self._callbacks[name]()
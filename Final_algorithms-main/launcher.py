@@ -1,27 +1,86 @@
 #  launcher.py  —  pretty & robust
+import time
+_T0 = time.perf_counter()           # startup timing starts here
+
 import tkinter as tk
 from tkinter import ttk, messagebox, RIDGE
+import importlib
+import subprocess
 import sys
+import tempfile
+import threading
 import traceback
 import os
 
-# ---------- import your visualisers ----------
-try:
-    from bst_visualizer  import BSTVisualizer
-    from rbt_visualizer  import RedBlackTreeVisualizer
-except ImportError as e:
-    print("FATAL SETUP ERROR:", e)
-    messagebox.showerror(
-        "Missing file",
-        "Could not find bst_visualizer.py  or  rbt_visualizer.py\n"
-        "Please place them in the same folder as this launcher."
-    )
-    sys.exit(1)
+# ---------- your visualisers, imported on demand ----------
+# key -> (module, class, window name).  Nothing here is imported until the
+# user picks it, or until the likely pick is pre-warmed after first paint.
+VISUALISERS = {
+    "bst": ("bst_visualizer", "BSTVisualizer", "BST Visualiser"),
+    "rbt": ("rbt_visualizer", "RedBlackTreeVisualizer", "Red-Black Visualiser"),
+}
+# remembers the last pick, which is the one pre-warmed next time
+LAST_CHOICE_FILE = os.path.join(os.path.expanduser("~"), ".tree_algorithms_last")
+CHILD_POLL_MS = 500                 # how often running child processes are checked
+CHILD_QUIT_GRACE = 2.0              # seconds all children get to exit on quit
+
+
+class ChildVisualiser:
+    """One visualiser running in its own process (and its own Tk and GIL).
+
+    Its stderr goes to a log file so a crash can be reported after the fact
+    without a pipe that could fill up and stall the child.
+    """
+
+    def __init__(self, key, timing):
+        self.key = key
+        self.name = VISUALISERS[key][2]
+        self.log = tempfile.NamedTemporaryFile(prefix=f"tree-{key}-", suffix=".log", delete=False)
+        here = os.path.dirname(os.path.abspath(__file__))
+        args = [sys.executable, os.path.join(here, "launcher.py"), "--child", key]
+        if timing:
+            args.append("--startup-timing")
+        self.process = subprocess.Popen(args, cwd=here, stderr=self.log)
+        self.started = time.perf_counter()
+
+    def poll(self):
+        return self.process.poll()
+
+    def report(self):
+        """Closes the log and returns its text; clean logs are deleted."""
+        self.log.close()
+        with open(self.log.name, encoding="utf-8", errors="replace") as f:
+            text = f.read()
+        if not text.strip():
+            os.remove(self.log.name)
+        return text
+
+    def terminate(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+
+    def reap(self, timeout):
+        """Waits up to ``timeout`` for a terminated child, then kills it."""
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.report()
 
 
 class VisualizerLauncher(tk.Tk):
-    def __init__(self):
+    def __init__(self, timing=False, isolated=False):
         super().__init__()
+        self.timing = timing
+        self.timings = {"launcher imports": time.perf_counter() - _T0}
+        self._import_lock = threading.Lock()
+        # in-process (the default) opens fastest, from the pre-warmed import;
+        # a separate process costs a fresh interpreter and Tk per click but
+        # keeps a crash or a busy visualiser away from the others
+        self.isolated = tk.BooleanVar(self, value=isolated)
+        self._child_procs = []              # ChildVisualiser, while running
+        self._poll_id = None
         self.title("Tree-Algorithms ")
         self.resizable(False, False)
 
@@ -72,6 +131,13 @@ class VisualizerLauncher(tk.Tk):
                    command=self.launch_rbt,
                    style="Launch.TButton").pack(fill="x", pady=8)
 
+        ttk.Checkbutton(card,
+                        text="Open each visualiser in its own process",
+                        variable=self.isolated).pack(anchor="w", pady=(12, 0))
+        self.status = ttk.Label(card, text="", font=("Segoe UI", 9),
+                                foreground=self.TEXT, background=self.CARD)
+        self.status.pack(anchor="w")
+
         # subtle footer
         ttk.Label(card,
                   text="github.com/",
@@ -79,6 +145,10 @@ class VisualizerLauncher(tk.Tk):
                   foreground="#9ca3af",
                   background=self.CARD).pack(pady=(25, 0))
 
+        # once the window is on screen, import the likely pick in the background
+        self.bind("<Map>", self._on_first_paint)
+        self.protocol("WM_DELETE_WINDOW", self._on_quit)
+
     # ---------- window helpers ----------
     def _center_window(self, width, height):
         sw, sh = self.winfo_screenwidth(), self.winfo_screenheight()
@@ -86,40 +156,208 @@ class VisualizerLauncher(tk.Tk):
         y = (sh - height) // 2
         self.geometry(f"{width}x{height}+{x}+{y}")
 
+    # ---------- lazy imports ----------
+    def _on_first_paint(self, event):
+        if event.widget is not self:
+            return
+        self.unbind("<Map>")
+        # idle handlers queued before this one (the redraws) run first
+        self.after_idle(self._after_first_paint)
+
+    def _after_first_paint(self):
+        self.timings["first paint"] = time.perf_counter() - _T0
+        self._report("first paint")
+        # warmed even when isolation is on: the box can be unticked at any time
+        likely = self._likely_choice()
+        threading.Thread(target=self._prewarm, args=(likely,), name="prewarm", daemon=True).start()
+
+    def _likely_choice(self):
+        try:
+            with open(LAST_CHOICE_FILE, encoding="utf-8") as f:
+                key = f.read().strip()
+        except OSError:
+            key = ""
+        return key if key in VISUALISERS else "bst"
+
+    def _remember_choice(self, key):
+        try:
+            with open(LAST_CHOICE_FILE, "w", encoding="utf-8") as f:
+                f.write(key)
+        except OSError:
+            pass                              # read-only home: just don't pre-warm
+
+    def _prewarm(self, key):
+        # imports only, no widgets: Tk itself must stay on the main thread
+        try:
+            self._load(key, "pre-warm")
+        except Exception:
+            pass                              # reported properly if the user picks it
+
+    def _load(self, key, label):
+        module_name, class_name, _ = VISUALISERS[key]
+        with self._import_lock:
+            already = module_name in sys.modules
+            start = time.perf_counter()
+            module = importlib.import_module(module_name)
+            if not already:
+                self.timings[f"{label} import {module_name}"] = time.perf_counter() - start
+        return getattr(module, class_name)
+
     # ---------- launchers ----------
     def launch_bst(self):
-        self._run_visualiser("BST Visualiser", BSTVisualizer)
+        self._run_visualiser("bst")
 
     def launch_rbt(self):
-        self._run_visualiser("Red-Black Visualiser", RedBlackTreeVisualizer)
+        self._run_visualiser("rbt")
 
-    def _run_visualiser(self, name, visualiser_class):
+    def _run_visualiser(self, key):
+        self._remember_choice(key)
+        if self.isolated.get():
+            self._spawn_visualiser(key)
+            return
+        name = VISUALISERS[key][2]
+        clicked = time.perf_counter()
+        try:
+            visualiser_class = self._load(key, "on-demand")
+        except ImportError as e:
+            print("FATAL SETUP ERROR:", e)
+            messagebox.showerror(
+                "Missing file",
+                f"Could not import {VISUALISERS[key][0]}.py\n"
+                "Please place it in the same folder as this launcher."
+            )
+            return
         self.withdraw()
         window = tk.Toplevel(self)
         try:
             visualiser_class(window)          # instantiate your class
             window.protocol("WM_DELETE_WINDOW", lambda: self._on_close(window))
             window.focus_force()
+            if self.timing:
+                window.bind("<Map>", lambda event: self._on_visualiser_paint(event, window, name, clicked))
         except Exception as e:
-            self._handle_crash(e, name)
+            window.destroy()
+            self._report_crash(name, traceback.format_exc())
             self.deiconify()
 
+    # ---------- child processes ----------
+    def _spawn_visualiser(self, key):
+        try:
+            child = ChildVisualiser(key, self.timing)
+        except OSError as e:
+            self._report_crash(VISUALISERS[key][2], f"Could not start a new process: {e}\n")
+            return
+        self._child_procs.append(child)
+        self._update_status()
+        if self._poll_id is None:
+            self._poll_id = self.after(CHILD_POLL_MS, self._poll_children)
+
+    def _poll_children(self):
+        self._poll_id = None
+        running = []
+        for child in self._child_procs:
+            code = child.poll()
+            if code is None:
+                running.append(child)
+                continue
+            text = child.report()
+            if code != 0:
+                self._report_crash(child.name, text, code, child.log.name)
+            elif text.strip():
+                print(f"{child.name} logged errors while it ran:")
+                print(text)
+        self._child_procs = running
+        self._update_status()
+        if running:
+            self._poll_id = self.after(CHILD_POLL_MS, self._poll_children)
+
+    def _update_status(self):
+        count = len(self._child_procs)
+        self.status.configure(text=f"{count} visualiser process{'es' if count != 1 else ''} running"
+                              if count else "")
+
+    # ---------- startup timing ----------
+    def _on_visualiser_paint(self, event, window, name, clicked):
+        if event.widget is window:
+            window.unbind("<Map>")
+            window.after_idle(lambda: self._visualiser_painted(name, clicked))
+
+    def _visualiser_painted(self, name, clicked):
+        self.timings[f"{name} click to first paint"] = time.perf_counter() - clicked
+        self._report(name)
+
+    def _report(self, stage):
+        if not self.timing:
+            return
+        print(f"--- startup timing ({stage}) ---", file=sys.stderr)
+        for label, seconds in self.timings.items():
+            print(f"{label:>40}: {seconds * 1000:8.1f} ms", file=sys.stderr)
+
     # ---------- error / close ----------
-    def _handle_crash(self, error, name):
+    def _report_crash(self, name, details, code=None, log_path=None):
         print("-" * 60)
-        print(f"ERROR launching {name}")
-        traceback.print_exc()
+        print(f"ERROR in {name}" + (f" (exit code {code})" if code is not None else ""))
+        print(details.rstrip())
         print("-" * 60)
-        messagebox.showerror("Launch error",
-                             f"Could not start {name}.\n"
-                             f"See console for detailed traceback.")
+        lines = [line for line in details.strip().splitlines() if line.strip()]
+        summary = lines[-1] if lines else "no error output"
+        where = f"Full report: {log_path}" if log_path else "See console for detailed traceback."
+        messagebox.showerror("Visualiser crashed" if code is not None else "Launch error",
+                             f"{name} stopped unexpectedly.\n\n{summary}\n\n{where}")
 
     def _on_close(self, window):
         window.destroy()
         self.deiconify()
         self.focus_force()
 
+    def _on_quit(self):
+        if self._poll_id is not None:
+            self.after_cancel(self._poll_id)
+            self._poll_id = None
+        # signal every child first, then share one grace period between them
+        for child in self._child_procs:
+            child.terminate()
+        deadline = time.perf_counter() + CHILD_QUIT_GRACE
+        for child in self._child_procs:
+            child.reap(max(0.0, deadline - time.perf_counter()))
+        self._child_procs = []
+        self.destroy()
+
+
+# ---------- child process entry ----------
+def run_child(key, timing=False):
+    """Runs one visualiser as the whole program; the launcher reads the exit
+    code and stderr to spot crashes."""
+    module_name, class_name, name = VISUALISERS[key]
+    try:
+        visualiser_class = getattr(importlib.import_module(module_name), class_name)
+    except ImportError:
+        traceback.print_exc()
+        sys.exit(2)
+    imported = time.perf_counter() - _T0
+    root = tk.Tk()
+    root.title(name)
+    visualiser_class(root)
+    if timing:
+        def painted():
+            print(f"{name}: imports {imported * 1000:.1f} ms, "
+                  f"first paint {(time.perf_counter() - _T0) * 1000:.1f} ms")
+
+        def on_map(event):
+            if event.widget is root:
+                root.unbind("<Map>")
+                root.after_idle(painted)
+        root.bind("<Map>", on_map)
+    root.mainloop()
+
 
 # ---------- entry ----------
+# python launcher.py --startup-timing   prints import and first-paint times
+# python launcher.py --isolated         opens each visualiser in its own process
 if __name__ == "__main__":
-    VisualizerLauncher().mainloop()
\ No newline at end of file
+    argv = sys.argv[1:]
+    timing = "--startup-timing" in argv
+    if "--child" in argv:
+        run_child(argv[argv.index("--child") + 1], timing)
+    else:
+        VisualizerLauncher(timing=timing, isolated="--isolated" in argv).mainloop()
\ No newline at end of file
@@ -0,0 +1,96 @@
+# log_panel.py  –  bounded Text-widget log flushed once per frame
+
+import tkinter as tk
+from collections import deque
+from typing import Deque, Iterable, List, Sized
+
+from frame_scheduler import FrameScheduler
+
+
+def preview(values: Iterable, limit: int = 20) -> str:
+    """``str(list(values))`` for short inputs, the first ``limit`` items plus a
+    count otherwise, so logging a huge value list stays cheap."""
+    head: List = []
+    total = 0
+    for value in values:
+        if total < limit:
+            head.append(value)
+        total += 1
+        if total > limit and isinstance(values, Sized):
+            total = len(values)
+            break
+    if total <= limit:
+        return str(head)
+    return f"{str(head)[:-1]}, ... (+{total - limit} more)]"
+
+
+class BoundedLog:
+    """Keeps the last ``max_lines`` lines of a log in a Text widget.
+
+    ``append``/``extend`` only queue lines; the widget is touched by
+    ``flush``, which the scheduler runs at most once per frame: one
+    ``insert`` for everything pending, one ``delete`` to trim the oldest
+    lines, one ``see``.  Lines longer than ``max_line_chars`` are cut.
+    """
+
+    def __init__(self, text: tk.Text, scheduler: FrameScheduler, name: str = "log",
+                 max_lines: int = 1000, max_line_chars: int = 2000) -> None:
+        self.text = text
+        self.scheduler = scheduler
+        self.name = name
+        self.max_lines = max_lines
+        self.max_line_chars = max_line_chars
+        self._pending: Deque[str] = deque(maxlen=max_lines)
+        self._clear_pending = False
+        self._shown = 0          # lines currently in the widget
+        scheduler.register(name, self.flush)
+
+    def _clip(self, line: str) -> str:
+        if len(line) <= self.max_line_chars:
+            return line
+        return f"{line[:self.max_line_chars]}… (+{len(line) - self.max_line_chars} chars)"
+
+    def append(self, line: str) -> None:
+        self._queue(1)
+        self._pending.append(self._clip(line))
+
+    def extend(self, lines: Iterable[str]) -> None:
+        if not isinstance(lines, Sized):
+            lines = list(lines)
+        count = len(lines)
+        if count == 0:
+            return
+        if count >= self.max_lines:
+            # everything already shown or queued would be trimmed anyway
+            self.clear()
+            lines = list(lines)[-self.max_lines:]
+        self._queue(len(lines))
+        self._pending.extend(self._clip(line) for line in lines)
+
+    def _queue(self, count: int) -> None:
+        if len(self._pending) + count > self.max_lines:
+            # the deque drops queued lines; drop the shown ones too
+            self._clear_pending = True
+        self.scheduler.mark_dirty(self.name)
+
+    def clear(self) -> None:
+        self._pending.clear()
+        self._clear_pending = True
+        self.scheduler.mark_dirty(self.name)
+
+    def flush(self) -> None:
+        if self._clear_pending:
+            self.text.delete('1.0', tk.END)
+            self._shown = 0
+            self._clear_pending = False
+        if not self._pending:
+            return
+        count = len(self._pending)
+        self.text.insert(tk.END, "\n".join(self._pending) + "\n")
+        self._pending.clear()
+        self._shown += count
+        excess = self._shown - self.max_lines
+        if excess > 0:
+            self.text.delete('1.0', f"{excess + 1}.0")
+            self._shown -= excess
+        self.text.see(tk.END)
@@ -0,0 +1,59 @@
+# node_pool.py  –  capped free list of tree nodes for insert/delete churn
+
+from typing import Any, Dict, List, Optional
+
+
+class NodePool:
+    """Deleted nodes are kept here, up to ``capacity``, and handed back out
+    by the next inserts, so a tree whose size holds steady under churn
+    stops allocating.  The tree resets a node's fields when it takes one
+    back out.
+
+    Counters: ``allocated`` counts inserts that found the pool empty,
+    ``reused`` counts the ones served from it, ``recycled`` counts nodes
+    returned, and ``dropped`` counts nodes turned away because the pool
+    was full.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        self._free: List[Any] = []
+        self.allocated = 0
+        self.reused = 0
+        self.recycled = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._free)
+
+    def take(self) -> Optional[Any]:
+        """A recycled node, or None when the caller has to allocate one."""
+        if self._free:
+            self.reused += 1
+            return self._free.pop()
+        self.allocated += 1
+        return None
+
+    def give(self, node: Any) -> None:
+        if len(self._free) < self.capacity:
+            self._free.append(node)
+            self.recycled += 1
+        else:
+            self.dropped += 1
+
+    def clear(self) -> None:
+        self._free.clear()
+
+    def stats(self) -> Dict[str, float]:
+        requests = self.allocated + self.reused
+        return {
+            "capacity": self.capacity,
+            "free": len(self._free),
+            "allocated": self.allocated,
+            "reused": self.reused,
+            "recycled": self.recycled,
+            "dropped": self.dropped,
+            "reuse_rate": self.reused / requests if requests else 0.0,
+        }
@@ -0,0 +1,47 @@
+# op_trace.py  –  records visualizer operations as a tree_cli command stream
+
+import os
+import time
+from typing import IO, Iterable, Optional
+
+TRACE_ENV = "TREE_TRACE"
+VALUES_PER_LINE = 1000      # long inserts are split so lines stay readable
+
+
+class OpTrace:
+    """Appends each tree operation as one ``tree_cli`` command line.
+
+    Lines go through a buffered file and reach the disk in blocks, so
+    recording costs a visualizer next to nothing.  Replay a trace with
+    ``python tree_cli.py --tree bst|rbt <file>``.
+    """
+
+    def __init__(self, path: str, source: str) -> None:
+        self.path = path
+        self._file: Optional[IO[str]] = open(path, "a", encoding="utf-8", buffering=1 << 16)
+        self._file.write(f"# {source} trace, started {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+
+    @classmethod
+    def from_env(cls, source: str) -> Optional["OpTrace"]:
+        """A recorder when ``TREE_TRACE`` names a file, otherwise None.
+        ``{source}`` and ``{pid}`` in the name are filled in, so several
+        visualizer processes can trace side by side."""
+        template = os.environ.get(TRACE_ENV)
+        if not template:
+            return None
+        return cls(template.format(source=source, pid=os.getpid()), source)
+
+    def record(self, command: str, values: Iterable = ()) -> None:
+        if self._file is None:
+            return
+        values = [str(value) for value in values]
+        if not values:
+            self._file.write(command + "\n")
+            return
+        for i in range(0, len(values), VALUES_PER_LINE):
+            self._file.write(f"{command} {' '.join(values[i:i + VALUES_PER_LINE])}\n")
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
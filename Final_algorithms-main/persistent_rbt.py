@@ -0,0 +1,350 @@
+# persistent_rbt.py  –  path-copying Red-Black Tree with versions (no GUI)
+
+from __future__ import annotations
+import sys
+from collections import deque
+from typing import Deque, Iterator, List, Optional, Sequence, Tuple
+
+from rbt_logic import RedBlackTree, RedBlackTreeNode
+from tree_walks import range_values
+
+
+class PNode:
+    """Immutable node.  No parent pointer: a parent would tie a node to one
+    version, and sharing subtrees between versions is the whole point."""
+    __slots__ = ("red", "left", "value", "right")
+
+    def __init__(self, red: bool, left: Optional[PNode], value: int, right: Optional[PNode]) -> None:
+        self.red = red
+        self.left = left
+        self.value = value
+        self.right = right
+
+
+NODE_BYTES = sys.getsizeof(PNode(False, None, 0, None))
+
+
+def _red(node: Optional[PNode]) -> bool:
+    return node is not None and node.red
+
+
+class _PathCopier:
+    """Functional insert/delete (Okasaki's insert, Kahrs' delete).  Every
+    node on the search path is rebuilt and everything else is shared.
+    ``allocated`` counts the nodes built, for memory accounting."""
+
+    def __init__(self) -> None:
+        self.allocated = 0
+
+    def node(self, red: bool, left: Optional[PNode], value: int, right: Optional[PNode]) -> PNode:
+        self.allocated += 1
+        return PNode(red, left, value, right)
+
+    def balance(self, a: Optional[PNode], x: int, b: Optional[PNode]) -> PNode:
+        """A black node x over a and b, with any red-red pair below it
+        rotated away into a red node over two black ones."""
+        node = self.node
+        if _red(a) and _red(b):
+            return node(True, node(False, a.left, a.value, a.right), x,
+                        node(False, b.left, b.value, b.right))
+        if _red(a):
+            if _red(a.left):
+                return node(True, node(False, a.left.left, a.left.value, a.left.right), a.value,
+                            node(False, a.right, x, b))
+            if _red(a.right):
+                return node(True, node(False, a.left, a.value, a.right.left), a.right.value,
+                            node(False, a.right.right, x, b))
+        if _red(b):
+            if _red(b.right):
+                return node(True, node(False, a, x, b.left), b.value,
+                            node(False, b.right.left, b.right.value, b.right.right))
+            if _red(b.left):
+                return node(True, node(False, a, x, b.left.left), b.left.value,
+                            node(False, b.left.right, b.value, b.right))
+        return node(False, a, x, b)
+
+    # ---------------- insert ----------------
+    def insert(self, root: Optional[PNode], x: int) -> PNode:
+        new = self._ins(root, x)
+        return new if not new.red else self.node(False, new.left, new.value, new.right)
+
+    def _ins(self, n: Optional[PNode], x: int) -> PNode:
+        if n is None:
+            return self.node(True, None, x, None)
+        if x < n.value:
+            if n.red:
+                return self.node(True, self._ins(n.left, x), n.value, n.right)
+            return self.balance(self._ins(n.left, x), n.value, n.right)
+        # x > n.value: the caller checked that x is not in the tree
+        if n.red:
+            return self.node(True, n.left, n.value, self._ins(n.right, x))
+        return self.balance(n.left, n.value, self._ins(n.right, x))
+
+    # ---------------- delete ----------------
+    def delete(self, root: PNode, x: int) -> Optional[PNode]:
+        new = self._del(root, x)
+        if new is None or not new.red:
+            return new
+        return self.node(False, new.left, new.value, new.right)
+
+    def _del(self, n: Optional[PNode], x: int) -> Optional[PNode]:
+        if n is None:
+            return None
+        if x < n.value:
+            if n.left is not None and not n.left.red:
+                return self._balance_left(self._del(n.left, x), n.value, n.right)
+            return self.node(True, self._del(n.left, x), n.value, n.right)
+        if x > n.value:
+            if n.right is not None and not n.right.red:
+                return self._balance_right(n.left, n.value, self._del(n.right, x))
+            return self.node(True, n.left, n.value, self._del(n.right, x))
+        return self._append(n.left, n.right)
+
+    def _balance_left(self, left: Optional[PNode], x: int, right: Optional[PNode]) -> PNode:
+        # left lost one black level
+        node = self.node
+        if _red(left):
+            return node(True, node(False, left.left, left.value, left.right), x, right)
+        if right is not None and not right.red:
+            return self.balance(left, x, node(True, right.left, right.value, right.right))
+        if _red(right) and right.left is not None and not right.left.red:
+            rl = right.left
+            return node(True, node(False, left, x, rl.left), rl.value,
+                        self.balance(rl.right, right.value, self._redden(right.right)))
+        raise AssertionError("red-black invariant broken")
+
+    def _balance_right(self, left: Optional[PNode], x: int, right: Optional[PNode]) -> PNode:
+        # right lost one black level
+        node = self.node
+        if _red(right):
+            return node(True, left, x, node(False, right.left, right.value, right.right))
+        if left is not None and not left.red:
+            return self.balance(node(True, left.left, left.value, left.right), x, right)
+        if _red(left) and left.right is not None and not left.right.red:
+            lr = left.right
+            return node(True, self.balance(self._redden(left.left), left.value, lr.left), lr.value,
+                        node(False, lr.right, x, right))
+        raise AssertionError("red-black invariant broken")
+
+    def _redden(self, n: Optional[PNode]) -> PNode:
+        if n is None or n.red:
+            raise AssertionError("red-black invariant broken")
+        return self.node(True, n.left, n.value, n.right)
+
+    def _append(self, a: Optional[PNode], b: Optional[PNode]) -> Optional[PNode]:
+        """Joins the two subtrees of a removed node."""
+        node = self.node
+        if a is None:
+            return b
+        if b is None:
+            return a
+        if a.red and b.red:
+            mid = self._append(a.right, b.left)
+            if _red(mid):
+                return node(True, node(True, a.left, a.value, mid.left), mid.value,
+                            node(True, mid.right, b.value, b.right))
+            return node(True, a.left, a.value, node(True, mid, b.value, b.right))
+        if not a.red and not b.red:
+            mid = self._append(a.right, b.left)
+            if _red(mid):
+                return node(True, node(False, a.left, a.value, mid.left), mid.value,
+                            node(False, mid.right, b.value, b.right))
+            return self._balance_left(a.left, a.value, node(False, mid, b.value, b.right))
+        if b.red:
+            return node(True, self._append(a, b.left), b.value, b.right)
+        return node(True, a.left, a.value, self._append(a.right, b))
+
+
+# --------------------------------------------------
+#  VERSIONS
+# --------------------------------------------------
+class Version:
+    """One immutable state of the tree.  Holding on to it is the snapshot:
+    later updates build new paths and never touch these nodes."""
+    __slots__ = ("number", "root", "size", "allocated", "label")
+
+    def __init__(self, number: int, root: Optional[PNode], size: int, allocated: int, label: str) -> None:
+        self.number = number
+        self.root = root
+        self.size = size
+        self.allocated = allocated       # nodes this update had to build
+        self.label = label
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, value: int) -> bool:
+        node = self.root
+        while node is not None:
+            if value == node.value:
+                return True
+            node = node.left if value < node.value else node.right
+        return False
+
+    def __iter__(self) -> Iterator[int]:
+        stack: List[PNode] = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.value
+            node = node.right
+
+    def range(self, lo: int, hi: int) -> List[int]:
+        return range_values(self.root, lo, hi)
+
+    def to_tree(self) -> RedBlackTree:
+        """A mutable RedBlackTree with the same shape and colours, e.g. for
+        the visualizer to draw."""
+        tree = RedBlackTree()
+
+        def copy(n: Optional[PNode], parent: Optional[RedBlackTreeNode]) -> RedBlackTreeNode:
+            if n is None:
+                return tree.nil
+            node = RedBlackTreeNode(n.value, "red" if n.red else "black")
+            node.parent = parent
+            node.left = copy(n.left, node)
+            node.right = copy(n.right, node)
+            return node
+
+        tree.root = copy(self.root, None)
+        return tree
+
+
+class PersistentRedBlackTree:
+    """A Red-Black tree whose updates produce new versions instead of
+    changing nodes in place.
+
+    An insert or delete copies only the O(log n) search path; the rest is
+    shared with the previous version.  ``snapshot()`` is O(1).  The last
+    ``max_versions`` versions are kept for ``undo``/``redo`` and
+    ``version(n)``.  Older ones are dropped, and the garbage collector
+    frees the nodes only they used.  ``memory()`` reports what each retained
+    version costs on top of the ones before it.
+    """
+
+    def __init__(self, max_versions: int = 100) -> None:
+        if max_versions < 1:
+            raise ValueError("max_versions must be >= 1")
+        self.max_versions = max_versions
+        self._history: Deque[Version] = deque([Version(0, None, 0, 0, "empty")])
+        self._cursor = 0                  # index of the current version in _history
+        self._next_number = 1
+
+    @classmethod
+    def from_sorted(cls, values: Sequence[int], max_versions: int = 100) -> PersistentRedBlackTree:
+        """Version 1 holds strictly increasing ``values``, built in O(n)
+        like RedBlackTree.from_sorted."""
+        full = (len(values) + 1).bit_length() - 1
+
+        def build(lo: int, hi: int, depth: int) -> Optional[PNode]:
+            if lo >= hi:
+                return None
+            mid = (lo + hi) // 2
+            return PNode(depth == full, build(lo, mid, depth + 1), values[mid], build(mid + 1, hi, depth + 1))
+
+        tree = cls(max_versions)
+        tree._push(build(0, len(values), 0), len(values), len(values), f"load {len(values)}")
+        return tree
+
+    # --------------------------------------------------
+    #  CURRENT VERSION
+    # --------------------------------------------------
+    @property
+    def current(self) -> Version:
+        return self._history[self._cursor]
+
+    def snapshot(self) -> Version:
+        return self.current
+
+    def __len__(self) -> int:
+        return self.current.size
+
+    def __contains__(self, value: int) -> bool:
+        return value in self.current
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.current)
+
+    # --------------------------------------------------
+    #  UPDATES
+    # --------------------------------------------------
+    def _push(self, root: Optional[PNode], size: int, allocated: int, label: str) -> Version:
+        # a new update discards the redo tail, then the oldest beyond the cap
+        while len(self._history) > self._cursor + 1:
+            self._history.pop()
+        version = Version(self._next_number, root, size, allocated, label)
+        self._next_number += 1
+        self._history.append(version)
+        while len(self._history) > self.max_versions:
+            self._history.popleft()
+        self._cursor = len(self._history) - 1
+        return version
+
+    def insert(self, value: int) -> bool:
+        current = self.current
+        if value in current:
+            return False
+        copier = _PathCopier()
+        root = copier.insert(current.root, value)
+        self._push(root, current.size + 1, copier.allocated, f"insert {value}")
+        return True
+
+    def delete(self, value: int) -> bool:
+        current = self.current
+        if value not in current:
+            return False
+        copier = _PathCopier()
+        root = copier.delete(current.root, value)
+        self._push(root, current.size - 1, copier.allocated, f"delete {value}")
+        return True
+
+    # --------------------------------------------------
+    #  HISTORY
+    # --------------------------------------------------
+    def undo(self) -> Optional[Version]:
+        """Steps back one version; None when the oldest retained one is current."""
+        if self._cursor == 0:
+            return None
+        self._cursor -= 1
+        return self.current
+
+    def redo(self) -> Optional[Version]:
+        if self._cursor == len(self._history) - 1:
+            return None
+        self._cursor += 1
+        return self.current
+
+    def versions(self) -> List[Version]:
+        return list(self._history)
+
+    def version(self, number: int) -> Version:
+        for version in self._history:
+            if version.number == number:
+                return version
+        raise KeyError(f"version {number} is not retained")
+
+    def memory(self) -> Tuple[int, List[Tuple[int, int, int]]]:
+        """``(total_bytes, [(number, nodes, bytes), ...])``: for each retained
+        version, the nodes it keeps alive that no older retained version
+        already does.  One walk over the unique nodes.  A subtree already
+        seen is skipped whole, because nodes never change."""
+        seen = set()
+        per_version = []
+        for version in self._history:
+            fresh = 0
+            stack = [version.root] if version.root is not None else []
+            while stack:
+                node = stack.pop()
+                if id(node) in seen:
+                    continue
+                seen.add(id(node))
+                fresh += 1
+                if node.left is not None:
+                    stack.append(node.left)
+                if node.right is not None:
+                    stack.append(node.right)
+            per_version.append((version.number, fresh, fresh * NODE_BYTES))
+        return len(seen) * NODE_BYTES, per_version
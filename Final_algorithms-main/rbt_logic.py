@@ -1,7 +1,9 @@
 # rbt_logic.py  –  pure Red-Black-Tree algorithms (no GUI)
 
 from __future__ import annotations
-from typing import Optional, List, Tuple, Dict
+from typing import Optional, List, Sequence, Set, Tuple, Dict
+
+from node_pool import NodePool
 
 
 class RedBlackTreeNode:
@@ -11,62 +13,100 @@ class RedBlackTreeNode:
         self.left: Optional[RedBlackTreeNode] = None
         self.right: Optional[RedBlackTreeNode] = None
         self.parent: Optional[RedBlackTreeNode] = None
+        self.payload: object = None          # value in map mode, count in multiset mode
+        self.pending: bool = False           # queued in RedBlackTree.pending_nodes
 
 
 class RedBlackTree:
-    def __init__(self, color_only: bool = False) -> None:
+    def __init__(self, color_only: bool = False, pool_size: int = 0) -> None:
         self.nil = RedBlackTreeNode(None, color="black")
         self.root: RedBlackTreeNode = self.nil
         self.steps: List[str] = []
         self.pending_nodes: List[RedBlackTreeNode] = []
         self.color_only: bool = color_only
+        # nodes whose children changed since the owner last emptied it; None
+        # skips the bookkeeping (the visualizer turns it on to update its
+        # layout without walking the whole tree)
+        self.reshaped: Optional[Set[RedBlackTreeNode]] = None
+        # opt-in: deleted nodes are reused by later inserts, so callers must
+        # not keep a reference to a node after deleting its value
+        self.pool: Optional[NodePool] = NodePool(pool_size) if pool_size else None
 
     # --------------------------------------------------
     #  INSERTION
     # --------------------------------------------------
-    def insert(self, value: int) -> None:
-        if self.search_value(value) is not None:
+    def insert(self, value: int) -> bool:
+        """Adds a red node, queued for fix-up; False if the value exists."""
+        if not self.find_or_insert(value)[1]:
             self.steps.append(f"Value {value} already exists, skipping.")
-            return
-        new_node = RedBlackTreeNode(value)
-        new_node.left = self.nil
-        new_node.right = self.nil
-        self._bst_insert(new_node)
-        self.steps.append(f"Inserted node {value} (red).")
-        self.pending_nodes.append(new_node)
+            return False
+        return True
 
-    def _bst_insert(self, node: RedBlackTreeNode) -> None:
+    def find_or_insert(self, value: int) -> Tuple[RedBlackTreeNode, bool]:
+        """One descent: ``(node, False)`` if ``value`` is present, otherwise
+        a new red node, queued for fix-up, and True.  Map and multiset modes
+        keep their payload on the returned node."""
+        nil = self.nil
         parent = None
         curr = self.root
-        while curr != self.nil:
+        while curr is not nil:
+            if value == curr.value:
+                return curr, False
             parent = curr
-            if node.value < curr.value:  # type: ignore
-                curr = curr.left
-            else:
-                curr = curr.right
+            curr = curr.left if value < curr.value else curr.right  # type: ignore
+        node = self._new_node(value)
         node.parent = parent
         if parent is None:
             self.root = node
-            self.root.color = "black"
-            return
-        if node.value < parent.value:  # type: ignore
+            node.color = "black"
+        elif value < parent.value:  # type: ignore
             parent.left = node
         else:
             parent.right = node
+        if self.reshaped is not None:
+            self.reshaped.add(node)
+        self.steps.append(f"Inserted node {value} (red).")
+        self.pending_nodes.append(node)
+        node.pending = True
+        return node, True
+
+    def _new_node(self, value: int) -> RedBlackTreeNode:
+        node = self.pool.take() if self.pool is not None else None
+        if node is None:
+            node = RedBlackTreeNode(value)
+        else:
+            node.value = value
+            node.color = "red"
+            node.payload = None
+        node.left = self.nil
+        node.right = self.nil
+        return node
 
     def rebalance_step(self) -> None:
         if not self.pending_nodes:
             self.steps.append("No pending nodes to rebalance.")
             return
         node = self.pending_nodes.pop(0)
+        node.pending = False
         if self.color_only:
             self.insert_rebalance_color_only(node)
         else:
             self.insert_rebalance_full(node)
 
+    def rebalance_batch(self, count: int) -> int:
+        """Fixes up to ``count`` pending nodes, oldest first; returns how many.
+        Takes the batch off the front in one slice instead of a pop(0) each."""
+        batch = self.pending_nodes[:count]
+        del self.pending_nodes[:count]
+        fixup = self.insert_rebalance_color_only if self.color_only else self.insert_rebalance_full
+        for node in batch:
+            node.pending = False
+            fixup(node)
+        return len(batch)
+
     def rebalance_all(self) -> None:
         while self.pending_nodes:
-            self.rebalance_step()
+            self.rebalance_batch(4096)
 
     def insert_rebalance_full(self, node: RedBlackTreeNode) -> None:
         while node.parent is not None and node.parent.color == "red":
@@ -83,8 +123,8 @@ class RedBlackTree:
                     node = grandparent
                 else:
                     if node == node.parent.right:
-                        self._rotate_left(node.parent)
                         node = node.parent
+                        self._rotate_left(node)
                     if node.parent:
                         node.parent.color = "black"
                     grandparent.color = "red"
@@ -99,8 +139,8 @@ class RedBlackTree:
                     node = grandparent
                 else:
                     if node == node.parent.left:
-                        self._rotate_right(node.parent)
                         node = node.parent
+                        self._rotate_right(node)
                     if node.parent:
                         node.parent.color = "black"
                     grandparent.color = "red"
@@ -127,6 +167,29 @@ class RedBlackTree:
                 break
         self.root.color = "black"
 
+    @classmethod
+    def from_sorted(cls, values: Sequence[int], color_only: bool = False) -> RedBlackTree:
+        """Builds a balanced tree from strictly increasing values in O(n),
+        without rotations.  Midpoint splits leave every nil at depth h or
+        h + 1, so colouring the last, partly filled level red keeps every
+        black height equal."""
+        tree = cls(color_only=color_only)
+        nil = tree.nil
+        full = (len(values) + 1).bit_length() - 1      # completely filled levels
+
+        def build(lo: int, hi: int, depth: int, parent: Optional[RedBlackTreeNode]) -> RedBlackTreeNode:
+            if lo >= hi:
+                return nil
+            mid = (lo + hi) // 2
+            node = RedBlackTreeNode(values[mid], "red" if depth == full else "black")
+            node.parent = parent
+            node.left = build(lo, mid, depth + 1, node)
+            node.right = build(mid + 1, hi, depth + 1, node)
+            return node
+
+        tree.root = build(0, len(values), 0, None)
+        return tree
+
     # --------------------------------------------------
     #  ROTATIONS
     # --------------------------------------------------
@@ -144,6 +207,8 @@ class RedBlackTree:
             node.parent.right = right_child
         right_child.left = node
         node.parent = right_child
+        if self.reshaped is not None:
+            self.reshaped.add(node)
         self.steps.append(f"Left rotation at node {node.value}.")
 
     def _rotate_right(self, node: RedBlackTreeNode) -> None:
@@ -160,17 +225,20 @@ class RedBlackTree:
             node.parent.left = left_child
         left_child.right = node
         node.parent = left_child
+        if self.reshaped is not None:
+            self.reshaped.add(node)
         self.steps.append(f"Right rotation at node {node.value}.")
 
     # --------------------------------------------------
     #  DELETION
     # --------------------------------------------------
-    def delete(self, value: int) -> None:
+    def delete(self, value: int) -> bool:
         node_to_delete = self.search_value(value)
         if node_to_delete is None:
             self.steps.append(f"Value {value} not found for deletion.")
-            return
+            return False
         self._delete_node(node_to_delete)
+        return True
 
     def _delete_node(self, z: RedBlackTreeNode) -> None:
         y = z
@@ -195,9 +263,15 @@ class RedBlackTree:
             y.left = z.left
             y.left.parent = y
             y.color = z.color
+            if self.reshaped is not None:
+                self.reshaped.add(y)
         self.steps.append(f"Deleted node {z.value}.")
         if y_original_color == "black":
             self._delete_fixup(x)
+        # a node still queued for fix-up is referenced elsewhere; let it go
+        if self.pool is not None and not z.pending:
+            z.left = z.right = z.parent = None
+            self.pool.give(z)
 
     def _tree_minimum(self, node: RedBlackTreeNode) -> RedBlackTreeNode:
         while node.left != self.nil:
@@ -205,6 +279,10 @@ class RedBlackTree:
         return node
 
     def _rb_transplant(self, u: RedBlackTreeNode, v: RedBlackTreeNode) -> None:
+        if self.reshaped is not None:
+            self.reshaped.add(u)
+            if u.parent is not None:
+                self.reshaped.add(u.parent)
         if u.parent is None:
             self.root = v
         elif u == u.parent.left:
@@ -317,5 +395,7 @@ class RedBlackTree:
 
     def clear(self) -> None:
         self.root = self.nil
+        for node in self.pending_nodes:
+            node.pending = False
         self.pending_nodes.clear()
         self.steps.append("Cleared the entire tree.")
\ No newline at end of file
@@ -5,22 +5,49 @@ from tkinter import filedialog, messagebox, ttk
 import random
 import os
 import asyncio
-from typing import Optional, List, Tuple, Dict
+import time
+from typing import Any, Optional, List, Set, Tuple, Dict
 
 # import the separated logic
 from rbt_logic import RedBlackTree, RedBlackTreeNode
+from canvas_items import CanvasItemCache
+from frame_scheduler import FrameScheduler
+from log_panel import BoundedLog, preview
+from op_trace import OpTrace
+from tk_asyncio import TkAsyncioBridge
+from tree_worker import Job, TreeWorker
+from tree_viewport import cull, min_columns_for, subtree_stats, visible_region
 
 
 class RedBlackTreeVisualizer:
-    def __init__(self, master: tk.Tk) -> None:
+    def __init__(self, master: tk.Tk, fps: float = 30, log_lines: int = 1000) -> None:
         self.master: tk.Tk = master
         self.master.title("Red-Black Tree Visualizer")
+        # every redraw request is coalesced into at most one frame per 1/fps s
+        self.scheduler: FrameScheduler = FrameScheduler(master, fps=fps)
+        self.scheduler.register("layout", self._layout_tree)
+        self.scheduler.register("view", self._render_frame)
 
         self.color_only_mode: tk.BooleanVar = tk.BooleanVar(value=False)
         self.tree: RedBlackTree = RedBlackTree(color_only=self.color_only_mode.get())
 
         self.search_path_edges: List[Tuple[RedBlackTreeNode, RedBlackTreeNode]] = []
-        self.node_positions: Dict[RedBlackTreeNode, Tuple[int, int, int, int]] = {}
+        # spatial index for hit-testing: (in-order column, depth) -> node, for
+        # the nodes the last frame drew.  Every node owns exactly one grid
+        # cell; NIL leaves sit on half columns and are never hit.
+        self.cell_index: Dict[Tuple[int, int], RedBlackTreeNode] = {}
+        self.view_geometry: Optional[Tuple[int, int, int, int, int, int, int]] = None
+        self.hover_node: Optional[RedBlackTreeNode] = None
+        # layout cache: node -> (subtree size, height), kept up to date from
+        # tree.reshaped.  Column, depth and black height follow from it and
+        # are derived per frame, only for the nodes that frame looks at.
+        self.layout_stats: Dict[RedBlackTreeNode, Tuple[int, int]] = {}
+        self.layout_tree: Optional[RedBlackTree] = None
+        # node -> (in-order column, depth, black height passed down), last frame
+        self.layout_cells: Dict[RedBlackTreeNode, Tuple[int, int, int]] = {}
+        self.highlight_node: Optional[RedBlackTreeNode] = None
+        # subtrees narrower than this many pixels are drawn as one summary glyph
+        self.lod_px: int = 24
         self.tooltip_label: Optional[tk.Label] = None
 
         self.hide_nil_var: tk.BooleanVar = tk.BooleanVar(value=False)
@@ -92,10 +119,10 @@ class RedBlackTreeVisualizer:
         settings_frame = tk.Frame(master, bd=2, relief=tk.GROOVE)
         settings_frame.pack(side=tk.TOP, fill=tk.X, padx=10, pady=5)
         tk.Checkbutton(settings_frame, text="Hide NIL Nodes", variable=self.hide_nil_var,
-                       command=self.draw_tree).pack(side=tk.LEFT, padx=10)
+                       command=self.render_view).pack(side=tk.LEFT, padx=10)
         tk.Label(settings_frame, text="Zoom:").pack(side=tk.LEFT)
-        tk.Scale(settings_frame, from_=0.5, to=2.0, resolution=0.1, orient=tk.HORIZONTAL,
-                 variable=self.zoom_var, command=lambda _: self.draw_tree()).pack(side=tk.LEFT, padx=5)
+        tk.Scale(settings_frame, from_=0.1, to=2.0, resolution=0.1, orient=tk.HORIZONTAL,
+                 variable=self.zoom_var, command=lambda _: self.render_view()).pack(side=tk.LEFT, padx=5)
         tk.Label(settings_frame, text="Theme:").pack(side=tk.LEFT)
         self.theme_combo = ttk.Combobox(settings_frame, textvariable=self.theme_var,
                                         values=list(self.themes.keys()), state="readonly")
@@ -115,6 +142,14 @@ class RedBlackTreeVisualizer:
         tk.Button(manual_frame, text="Save to File", command=self.save_to_file, **self.button_style).pack(side=tk.LEFT, padx=3)
         tk.Button(manual_frame, text="Load from File", command=self.load_from_file, **self.button_style).pack(side=tk.LEFT, padx=3)
 
+        # progress of background jobs (large loads, random trees, rebalance all)
+        self.progress_bar = ttk.Progressbar(manual_frame, length=160, mode="determinate", maximum=1.0)
+        self.progress_bar.pack(side=tk.LEFT, padx=(10, 3))
+        self.progress_label = tk.Label(manual_frame, text="")
+        self.progress_label.pack(side=tk.LEFT, padx=3)
+        self.cancel_button = tk.Button(manual_frame, text="Cancel", state=tk.DISABLED, command=self.cancel_job)
+        self.cancel_button.pack(side=tk.LEFT, padx=3)
+
         # -------------------- LOG --------------------
         self.log_frame = tk.Frame(master)
         self.log_frame.pack(side=tk.BOTTOM, fill=tk.BOTH, expand=True)
@@ -124,69 +159,229 @@ class RedBlackTreeVisualizer:
         self.log_scroll = tk.Scrollbar(self.log_frame, command=self.log_text.yview)
         self.log_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         self.log_text['yscrollcommand'] = self.log_scroll.set
+        # only the newest log_lines lines are kept; writes land once per frame
+        self.log_panel: BoundedLog = BoundedLog(self.log_text, self.scheduler, max_lines=log_lines)
 
         # -------------------- CANVAS --------------------
-        self.canvas = tk.Canvas(master, bg="white", width=800, height=600)
-        self.canvas.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        canvas_frame = tk.Frame(master)
+        canvas_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.canvas = tk.Canvas(canvas_frame, bg="white", width=800, height=600)
+        self.v_scroll = tk.Scrollbar(canvas_frame, orient=tk.VERTICAL, command=self._yview)
+        self.v_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.h_scroll = tk.Scrollbar(canvas_frame, orient=tk.HORIZONTAL, command=self._xview)
+        self.h_scroll.pack(side=tk.BOTTOM, fill=tk.X)
+        self.canvas.configure(xscrollcommand=self.h_scroll.set, yscrollcommand=self.v_scroll.set)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         self.canvas.bind("<Motion>", self.on_mouse_move)
         self.canvas.bind("<Button-1>", self.on_mouse_click)
+        self.canvas.bind("<Configure>", lambda _: self.render_view())
+        # canvas items survive between frames; draw_tree only patches what changed
+        self.items: CanvasItemCache = CanvasItemCache(self.canvas)
+
+        # animations are asyncio tasks driven by Tk's own event loop
+        self.async_bridge: TkAsyncioBridge = TkAsyncioBridge(master)
+        # insert animations step the displayed tree between sleeps; a live job
+        # or a new tree cancels them.  build_task (Generate Balanced) owns the
+        # tree until it finishes, like a job.
+        self.animations: Set["asyncio.Task[None]"] = set()
+        self.build_task: Optional["asyncio.Task[None]"] = None
+        # heavy mutations run on a worker thread; while one is working on the
+        # displayed tree (live_job) the tree is neither laid out nor redrawn
+        self.worker: TreeWorker = TreeWorker(master)
+        self.job: Optional[Job] = None
+        self.live_job: bool = False
+        # with TREE_TRACE set, operations are recorded for tree_cli.py to replay
+        self.trace: Optional[OpTrace] = OpTrace.from_env("rbt")
+        self.master.bind("<Destroy>", self._on_destroy, add="+")
 
         self.draw_tree()
-        self._start_async_poll()
 
     # --------------------------------------------------
-    #  ASYNC LOOP POLLING
+    #  ASYNC / LIFECYCLE
+    # --------------------------------------------------
+    def _on_destroy(self, event: tk.Event) -> None:
+        if event.widget is self.master:
+            self.scheduler.cancel()
+            self.async_bridge.close()
+            self.worker.close()
+            if self.trace is not None:
+                self.trace.close()
+
+    def _record(self, command: str, values=()) -> None:
+        if self.trace is not None:
+            self.trace.record(command, values)
+
+    # --------------------------------------------------
+    #  BACKGROUND JOBS
     # --------------------------------------------------
-    def _start_async_poll(self) -> None:
-        def poll():
-            try:
-                loop = asyncio.get_event_loop()
-                loop.stop()
-                loop.run_forever()
-            except RuntimeError:
-                pass
-            self.master.after(50, poll)
-        poll()
+    def _busy(self, reading: bool = False) -> bool:
+        """True (and says so in the log) while a background job or the
+        balanced build is running.  reading=True only refuses while a live
+        job is rewriting the displayed tree on the worker thread."""
+        if reading:
+            name = self.job.name if self.job is not None and self.live_job else None
+        elif self.job is not None:
+            name = self.job.name
+        else:
+            name = "balanced tree" if self.build_task is not None else None
+        if name is None:
+            return False
+        # straight to the panel: tree.steps may belong to the worker right now
+        self.log_panel.append(f"Busy with {name}; wait for it or press Cancel.")
+        return True
+
+    def _animate(self, coro) -> None:
+        task = self.async_bridge.create_task(coro)
+        self.animations.add(task)
+        task.add_done_callback(self.animations.discard)
+
+    def _stop_animations(self) -> None:
+        # tasks only run inside a bridge tick on this thread, so a cancelled
+        # one never touches the tree again
+        for task in list(self.animations):
+            task.cancel()
+        self.animations.clear()
+
+    def run_job(self, name: str, fn, *args: Any, live: bool = False, on_done=None, on_cancel=None) -> None:
+        """Runs fn(job, *args) on the worker thread with progress in the
+        toolbar.  live=True means fn mutates the displayed tree."""
+        def finish() -> None:
+            self.job = None
+            self.live_job = False
+            self.progress_bar["value"] = 0
+            self.progress_label.config(text="")
+            self.cancel_button.config(state=tk.DISABLED)
+
+        def done(result: Any) -> None:
+            finish()
+            if on_done is not None:
+                on_done(result)
+
+        def cancelled() -> None:
+            finish()
+            self.log(f"Cancelled {name}.")
+            if on_cancel is not None:
+                on_cancel()
+
+        def failed(error: BaseException) -> None:
+            finish()
+            messagebox.showerror("Error", f"{name} failed:\n{error}")
+            self.draw_tree()
+
+        if live:
+            self._stop_animations()
+        self.live_job = live
+        self.cancel_button.config(state=tk.NORMAL)
+        self.progress_label.config(text=f"{name}…")
+        self.job = self.worker.submit(name, fn, *args, on_progress=self._on_progress,
+                                      on_done=done, on_cancel=cancelled, on_error=failed)
+
+    def _on_progress(self, done: int, total: int, snapshot: Any) -> None:
+        self.progress_bar["value"] = done / total if total else 0
+        self.progress_label.config(text=f"{self.job.name if self.job else ''} {done:,}/{total:,}")
+
+    def cancel_job(self) -> None:
+        if self.job is not None:
+            self.job.cancel()
+        elif self.build_task is not None:
+            self.build_task.cancel()
+
+    def _trim_steps(self, tree: RedBlackTree) -> None:
+        # only the newest lines reach the bounded log; don't hoard the rest
+        keep = self.log_panel.max_lines
+        if len(tree.steps) > 2 * keep:
+            del tree.steps[:-keep]
+
+    def _build_tree_job(self, job: Job, values: List[int], color_only: bool):
+        """Worker side: a fresh tree from values plus its finished layout."""
+        tree = RedBlackTree(color_only=color_only)
+        total = len(values)
+        for i, value in enumerate(values):
+            tree.insert(value)
+            if not i & 1023:
+                job.check()
+                job.report(i, total)
+                self._trim_steps(tree)
+        job.report(total, total)
+        self._trim_steps(tree)
+        return tree, self._compute_layout(tree)
+
+    def _rebalance_job(self, job: Job, tree: RedBlackTree):
+        total = len(tree.pending_nodes)
+        done = 0
+        while tree.pending_nodes:
+            job.check()
+            done += tree.rebalance_batch(1024)
+            job.report(done, total)
+            self._trim_steps(tree)
+        return tree, self._compute_layout(tree)
+
+    def _install_tree(self, tree: RedBlackTree, layout) -> None:
+        """Shows a tree whose layout was already computed on the worker."""
+        self._stop_animations()
+        self.tree = tree
+        self._set_layout(tree, layout)
+        self.highlight_node = None
+        self.hover_node = None
+        self.hide_tooltip()
+        self.log_panel.clear()
+        self.log_panel.extend(self.tree.steps)
+        self.tree.steps.clear()
+        self.render_view()
 
     # --------------------------------------------------
     #  COMMANDS
     # --------------------------------------------------
     def toggle_color_mode(self) -> None:
+        if self._busy():
+            # the checkbox has already flipped; put it back
+            self.color_only_mode.set(self.tree.color_only)
+            return
         self.tree.color_only = self.color_only_mode.get()
         self.log(f"Switched to {'COLOR-ONLY' if self.color_only_mode.get() else 'FULL'} rebalancing mode.")
 
     def insert_value(self) -> None:
+        if self._busy():
+            return
         val_str = self.value_entry.get()
         if not val_str.isdigit():
             messagebox.showwarning("Warning", "Please enter a valid integer.")
             return
         val = int(val_str)
+        self._record("insert", [val])
         self.tree.insert(val)
         self.update_log_and_tree() # Draw the newly inserted red node
-        asyncio.ensure_future(self.animate_rebalance())
+        self._animate(self.animate_rebalance())
 
     async def animate_rebalance(self) -> None:
         """Automatically performs rebalance steps with a delay for animation."""
-        while self.tree.pending_nodes:
-            self.tree.rebalance_step()
+        tree = self.tree
+        while tree.pending_nodes and tree is self.tree:
+            tree.rebalance_step()
             self.update_log_and_tree(without_delete=True)
             await asyncio.sleep(0.5) # Animation delay
 
     def delete_value(self) -> None:
+        if self._busy():
+            return
         val_str = self.value_entry.get()
         if not val_str.isdigit():
             messagebox.showwarning("Warning", "Please enter a valid integer.")
             return
         val = int(val_str)
+        self._record("delete", [val])
         self.tree.delete(val)
         self.update_log_and_tree()
 
     def search_value(self) -> None:
+        if self._busy(reading=True):
+            return
         val_str = self.value_entry.get()
         if not val_str.isdigit():
             messagebox.showwarning("Warning", "Please enter a valid integer.")
             return
         val = int(val_str)
+        self._record("search", [val])
         self.search_path_edges.clear()
         node = self.tree.root
         prev: Optional[RedBlackTreeNode] = None
@@ -210,12 +405,18 @@ class RedBlackTreeVisualizer:
         self.draw_tree()
 
     def rebalance_step(self) -> None:
+        if self._busy():
+            return
         self.tree.rebalance_step()
         self.update_log_and_tree()
 
     def rebalance_all(self) -> None:
-        self.tree.rebalance_all()
-        self.update_log_and_tree()
+        if self._busy():
+            return
+        tree = self.tree
+        self.run_job("rebalance all", self._rebalance_job, tree, live=True,
+                     on_done=lambda result: self._install_tree(*result),
+                     on_cancel=self.update_log_and_tree)
 
     def generate_random_tree(self) -> None:
         count_str = self.random_count_entry.get()
@@ -226,44 +427,74 @@ class RedBlackTreeVisualizer:
         if count < 1:
             messagebox.showwarning("Warning", "Random count must be >= 1.")
             return
-        self.tree = RedBlackTree(color_only=self.color_only_mode.get())
-        self.log_text.delete('1.0', tk.END)
-        values = random.sample(range(1, 200), count)
-        for v in values:
-            self.tree.insert(v)
-        self.log(f"Generated random tree with {count} nodes: {values}")
-        self.update_log_and_tree()
+        if self._busy():
+            return
+        values = random.sample(range(1, max(200, count * 10)), count)
 
-    def on_balanced_click(self) -> None:
-        asyncio.ensure_future(self.generate_balanced_tree())
+        def done(result) -> None:
+            self._install_tree(*result)
+            self._record("clear")
+            self._record("insert", values)
+            self.log(f"Generated random tree with {count} nodes: {preview(values)}")
+
+        self.run_job("random tree", self._build_tree_job, values, self.color_only_mode.get(), on_done=done)
 
-    async def generate_balanced_tree(self) -> None:
+    def on_balanced_click(self) -> None:
+        if self._busy():
+            return
         count_str = self.random_count_entry.get()
         if not count_str.isdigit() or int(count_str) < 1:
             messagebox.showwarning("Warning", "Please enter a valid integer >=1 for balanced count.")
             return
-        count = int(count_str)
+        self._stop_animations()
+        self.build_task = self.async_bridge.create_task(self.generate_balanced_tree(int(count_str)))
+        self.cancel_button.config(state=tk.NORMAL)
+
+        def finished(task: "asyncio.Task[None]") -> None:
+            self.build_task = None
+            if not self.async_bridge.closed:
+                self.cancel_button.config(state=tk.DISABLED)
+                if task.cancelled():
+                    self.log("Cancelled balanced tree.")
+        self.build_task.add_done_callback(finished)
+
+    async def generate_balanced_tree(self, count: int) -> None:
         seed = random.randint(0, 2 ** 31)
         random.seed(seed)
         values = [random.randint(1, 2 ** 10) for _ in range(count)]
         mid = sorted(values)[count // 2]
-        new_tree = RedBlackTree(color_only=False)
-        new_tree.insert(mid)
+        # a local reference: this task only ever writes to the tree it built
+        tree = RedBlackTree(color_only=False)
+        tree.insert(mid)
         values.remove(mid)
-        self.tree = new_tree
+        self.tree = tree
+        self._record("clear")
+        self._record("insert", [mid] + values)
+        # insert at full speed, handing control back to Tk once per frame so
+        # the scheduler can show progress without a redraw per insert
+        frame_end = time.perf_counter() + self.scheduler.frame_interval
         for value in values:
-            self.tree.insert(value)
-            self.tree.rebalance_all()
-            self.update_log_and_tree(without_delete=True)
-            await asyncio.sleep(0.1 / count)
+            tree.insert(value)
+            tree.rebalance_all()
+            if time.perf_counter() >= frame_end:
+                self.update_log_and_tree(without_delete=True)
+                await asyncio.sleep(0)
+                frame_end = time.perf_counter() + self.scheduler.frame_interval
+        self.update_log_and_tree(without_delete=True)
         self.log(f"Generated pseudo-balanced BST of size {count} with seed {seed}.")
         self.draw_tree()
 
     def clear_tree(self) -> None:
+        if self._busy():
+            return
+        self._record("clear")
         self.tree.clear()
+        self.layout_tree = None     # nothing to keep: lay out from scratch
         self.update_log_and_tree()
 
     def save_to_file(self) -> None:
+        if self._busy(reading=True):
+            return
         file_path = filedialog.asksaveasfilename(defaultextension=".txt",
                                                  filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")])
         if not file_path:
@@ -278,42 +509,65 @@ class RedBlackTreeVisualizer:
             messagebox.showerror("Error", f"Could not save file:\n{e}")
 
     def load_from_file(self) -> None:
+        if self._busy():
+            return
         file_path = filedialog.askopenfilename(filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")])
         if not file_path:
             return
         try:
             with open(file_path, "r", encoding="utf-8") as f:
                 content = f.read().strip()
-            if not content:
-                messagebox.showwarning("Warning", "File is empty.")
-                return
-            parts = content.split()
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not load file:\n{e}")
+            return
+        if not content:
+            messagebox.showwarning("Warning", "File is empty.")
+            return
+        name = os.path.basename(file_path)
+
+        def load(job: Job, text: str, color_only: bool):
             values: List[int] = []
-            for p in parts:
+            skipped: List[str] = []
+            for p in text.split():
                 if p.isdigit():
                     values.append(int(p))
                 else:
-                    self.log(f"Skipping non-integer token '{p}'.")
-            self.tree = RedBlackTree(color_only=self.color_only_mode.get())
-            self.log_text.delete('1.0', tk.END)
-            for v in values:
-                self.tree.insert(v)
-            self.log(f"Loaded {len(values)} nodes from file: {os.path.basename(file_path)}")
-            self.update_log_and_tree()
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not load file:\n{e}")
-        finally:
-            self.draw_tree()
+                    skipped.append(p)
+            tree, layout = self._build_tree_job(job, values, color_only)
+            return tree, layout, values, skipped
+
+        def done(result) -> None:
+            tree, layout, values, skipped = result
+            count = len(values)
+            self._install_tree(tree, layout)
+            self._record("clear")
+            self._record("insert", values)
+            for p in skipped[:20]:
+                self.log(f"Skipping non-integer token '{p}'.")
+            if len(skipped) > 20:
+                self.log(f"Skipped {len(skipped) - 20} more non-integer tokens.")
+            self.log(f"Loaded {count} nodes from file: {name}")
+
+        self.run_job(f"loading {name}", load, content, self.color_only_mode.get(), on_done=done)
 
     def show_inorder(self) -> None:
+        if self._busy(reading=True):
+            return
+        self._record("dump", ["inorder"])
         traversal = self.tree.inorder()
         self.log(f"Inorder: {[(val, color) for (val, color) in traversal]}")
 
     def show_preorder(self) -> None:
+        if self._busy(reading=True):
+            return
+        self._record("dump", ["preorder"])
         traversal = self.tree.preorder()
         self.log(f"Preorder: {[(val, color) for (val, color) in traversal]}")
 
     def show_postorder(self) -> None:
+        if self._busy(reading=True):
+            return
+        self._record("dump", ["postorder"])
         traversal = self.tree.postorder()
         self.log(f"Postorder: {[(val, color) for (val, color) in traversal]}")
 
@@ -324,80 +578,226 @@ class RedBlackTreeVisualizer:
         choice = self.theme_var.get()
         if choice in self.themes:
             self.current_theme = self.themes[choice]
-        self.draw_tree()
+        self.render_view()
 
     def update_log_and_tree(self, without_delete: bool = False) -> None:
         if not without_delete:
-            self.log_text.delete('1.0', tk.END)
-        for step in self.tree.steps:
-            self.log_text.insert(tk.END, step + "\n")
+            self.log_panel.clear()
+        self.log_panel.extend(self.tree.steps)
         self.draw_tree()
         self.tree.steps.clear()
 
     def draw_tree(self, highlight: Optional[RedBlackTreeNode] = None) -> None:
-        self.canvas.delete("all")
-        self.node_positions.clear()
-        self.canvas.config(bg=self.current_theme["bg"])
-        if self.tree.root == self.tree.nil:
+        """Marks the tree as changed; it is laid out and rendered at the next frame."""
+        self.highlight_node = highlight
+        # the hovered node may have changed or gone; the next move re-shows it
+        self.hover_node = None
+        self.hide_tooltip()
+        self.scheduler.mark_dirty("layout", "view")
+
+    def render_view(self) -> None:
+        """Marks the viewport as stale (scroll, zoom, theme) without re-layout."""
+        self.scheduler.mark_dirty("view")
+
+    def _layout_tree(self) -> None:
+        if self.live_job:
+            return      # the worker owns the tree; keep showing the last layout
+        tree = self.tree
+        if tree is not self.layout_tree or tree.reshaped is None:
+            self._set_layout(tree, self._compute_layout(tree))
+        elif tree.reshaped:
+            self._refresh_layout(tree)
+
+    def _set_layout(self, tree: RedBlackTree, stats: Dict[RedBlackTreeNode, Tuple[int, int]]) -> None:
+        """Adopts a full layout of tree and starts tracking its changes."""
+        self.layout_stats = stats
+        self.layout_tree = tree
+        self.layout_cells = {}
+        self.cell_index = {}
+        tree.reshaped = set()
+
+    @staticmethod
+    def _compute_layout(tree: RedBlackTree) -> Dict[RedBlackTreeNode, Tuple[int, int]]:
+        """node -> (subtree size, height) for all of tree.  Reads nothing but
+        the tree, so a worker can run it on a tree not yet displayed."""
+        nil = tree.nil
+        if tree.root == nil:
+            return {}
+        return subtree_stats(tree.root, lambda n: (n.left if n.left is not nil else None,
+                                                   n.right if n.right is not nil else None))
+
+    def _refresh_layout(self, tree: RedBlackTree) -> None:
+        """Recomputes layout_stats for the nodes in tree.reshaped and their
+        ancestors, deepest first.  Every other subtree kept its shape, so the
+        cost follows the change, not the size of the tree."""
+        nil = tree.nil
+        stats = self.layout_stats
+        reshaped, tree.reshaped = tree.reshaped, set()
+        if tree.root == nil:
+            stats.clear()
+            return
+        depths: Dict[RedBlackTreeNode, int] = {}
+        for node in reshaped:
+            path: List[RedBlackTreeNode] = []
+            attached = True
+            while node not in depths and node is not tree.root:
+                parent = node.parent
+                if parent is None or (node is not parent.left and node is not parent.right):
+                    attached = False
+                    break
+                path.append(node)
+                node = parent
+            if not attached:
+                # deleted: so is anything hanging under it on this path
+                for gone in path + [node]:
+                    stats.pop(gone, None)
+                continue
+            depth = depths.setdefault(node, 0)     # only the root is new here
+            for child in reversed(path):
+                depth += 1
+                depths[child] = depth
+        for node in sorted(depths, key=depths.__getitem__, reverse=True):
+            size, height = 1, 1
+            for child in (node.left, node.right):
+                if child is not nil:
+                    child_size, child_height = stats[child]
+                    size += child_size
+                    height = max(height, child_height + 1)
+            stats[node] = (size, height)
+
+    def _cell(self, node: RedBlackTreeNode) -> Tuple[int, int, int]:
+        """(in-order column, depth, black height passed down) for node, worked
+        out from the nearest ancestor this frame has already placed."""
+        cells = self.layout_cells
+        cell = cells.get(node)
+        if cell is not None:
+            return cell
+        nil = self.tree.nil
+        stats = self.layout_stats
+        path: List[RedBlackTreeNode] = []
+        while node not in cells:
+            path.append(node)
+            node = node.parent
+        column, depth, bh = cells[node]
+        for child in reversed(path):
+            parent = child.parent
+            bh += 1 if parent.color == "black" else 0
+            if child is parent.left:
+                column -= 1 + (stats[child.right][0] if child.right is not nil else 0)
+            else:
+                column += 1 + (stats[child.left][0] if child.left is not nil else 0)
+            depth += 1
+            cells[child] = (column, depth, bh)
+        return cells[path[0]]
+
+    def _children(self, node: RedBlackTreeNode) -> Tuple[Optional[RedBlackTreeNode], Optional[RedBlackTreeNode]]:
+        nil = self.tree.nil
+        return (node.left if node.left is not nil else None,
+                node.right if node.right is not nil else None)
+
+    def _xview(self, *args) -> None:
+        self.canvas.xview(*args)
+        self.render_view()
+
+    def _yview(self, *args) -> None:
+        self.canvas.yview(*args)
+        self.render_view()
+
+    def _render_frame(self) -> None:
+        """Draws only what intersects the scrolled-in region from the cached layout."""
+        if self.live_job:
+            return      # tree is being rewritten off-thread; keep the last frame
+        self.view_geometry = None
+        if self.canvas.cget("bg") != self.current_theme["bg"]:
+            self.canvas.config(bg=self.current_theme["bg"])
+        self.items.begin()
+        root = self.tree.root
+        if root == self.tree.nil or root not in self.layout_stats:
+            self.items.end()
             return
+        left_size = self.layout_stats[root.left][0] if root.left != self.tree.nil else 0
+        self.layout_cells = {root: (left_size, 0, 1 if root.color == "black" else 0)}
 
-        positions: Dict[RedBlackTreeNode, Tuple[int, int]] = {}
-        self._compute_positions(self.tree.root, 0, 0, positions)
-        xs = [pos[0] for pos in positions.values()]
-        min_x = min(xs) if xs else 0
-        max_x = max(xs) if xs else 0
-        width_in_order = max_x - min_x if max_x != min_x else 1
+        count, height = self.layout_stats[root]
+        width_in_order = count - 1 if count > 1 else 1
 
         zoom = self.zoom_var.get()
-        node_gap_x = int(60 * zoom)
-        node_gap_y = int(80 * zoom)
+        node_gap_x = max(1, int(60 * zoom))
+        node_gap_y = max(1, int(80 * zoom))
         margin_x = 40
         margin_y = 40
         c_width = self.canvas.winfo_width() if self.canvas.winfo_width() > 50 else 800
         total_tree_width = width_in_order * node_gap_x
-        offset_x = (c_width - total_tree_width) // 2
-
-        pixel_coords: Dict[RedBlackTreeNode, Tuple[int, int]] = {}
-        for node, (x_index, depth) in positions.items():
-            px = offset_x + margin_x + (x_index - min_x) * node_gap_x
-            py = margin_y + depth * node_gap_y
-            pixel_coords[node] = (px, py)
-
-        def draw_node(node: RedBlackTreeNode, px: int, py: int, current_bh: int) -> None:
-            if node == self.tree.nil:
-                r = int(15 * zoom)
-                self.canvas.create_oval(px - r, py - r, px + r, py + r, fill="black", outline="white", width=2)
-                self.canvas.create_text(px, py - r + r * 40 // 15, text=f"BH={current_bh}", fill="black")
-                return
-            if node.left and node.left in pixel_coords:
-                lx, ly = pixel_coords[node.left]
-                line_color, line_width = self._edge_color(node, node.left)
-                self.canvas.create_line(px, py, lx, ly, width=line_width, fill=line_color)
-            if node.right and node.right in pixel_coords:
-                rx, ry = pixel_coords[node.right]
-                line_color, line_width = self._edge_color(node, node.right)
-                self.canvas.create_line(px, py, rx, ry, width=line_width, fill=line_color)
-
+        offset_x = max(0, (c_width - total_tree_width) // 2)
+        # centring moves every item at once; node coords below are offset-free
+        self.items.set_offset(offset_x, 0)
+        hide_nil = self.hide_nil_var.get()
+        r = int(15 * zoom)
+        self.canvas.configure(scrollregion=(0, 0, offset_x + total_tree_width + 2 * margin_x,
+                                            2 * margin_y + (height + 1) * node_gap_y))
+
+        x0, y0, x1, y1 = visible_region(self.canvas, pad=node_gap_x)
+        columns = ((x0 - offset_x - margin_x) / node_gap_x, (x1 - offset_x - margin_x) / node_gap_x)
+        rows = ((y0 - margin_y) / node_gap_y - 1, (y1 - margin_y) / node_gap_y)
+        cell = self._cell
+        min_columns = min_columns_for(node_gap_x, self.lod_px)
+        view = cull(root, self._children, lambda n: cell(n)[:2], self.layout_stats,
+                    columns, rows, min_columns)
+        cells = self.layout_cells
+        self.cell_index = {cells[n][:2]: n for n in view.nodes}
+        self.view_geometry = (offset_x, margin_x, margin_y, node_gap_x, node_gap_y, r, min_columns)
+
+        def pixel(node: RedBlackTreeNode) -> Tuple[int, int]:
+            x_index, depth, _ = cells[node]
+            return margin_x + x_index * node_gap_x, margin_y + depth * node_gap_y
+
+        for parent, child in view.edges:
+            px, py = pixel(parent)
+            cx, cy = pixel(child)
+            side = "L" if child is parent.left else "R"
+            line_color, line_width = self._edge_color(parent, child)
+            self.items.sync(("edge", parent, side), "line", (px, py, cx, cy),
+                            width=line_width, fill=line_color, tags=("edge",))
+
+        for node in view.nodes:
+            px, py = pixel(node)
             node_color = self.current_theme["black_node"] if node.color == "black" else self.current_theme["red_node"]
-            fill_color = "blue" if node == highlight else node_color
-            r = int(15 * zoom)
-            self.canvas.create_oval(px - r, py - r, px + r, py + r, fill=fill_color, outline="black", width=2)
-            self.canvas.create_text(px, py, text=str(node.value), fill=self.current_theme["text_color"])
-            self.node_positions[node] = (px - r, py - r, px + r, py + r)
-
-            new_bh = current_bh + (1 if node.color == "black" else 0)
-            if node.left and node.left in pixel_coords:
-                draw_node(node.left, pixel_coords[node.left][0], pixel_coords[node.left][1], new_bh)
-            else:
-                draw_node(self.tree.nil, px - node_gap_x // 2, py + node_gap_y, new_bh)
-            if node.right and node.right in pixel_coords:
-                draw_node(node.right, pixel_coords[node.right][0], pixel_coords[node.right][1], new_bh)
-            else:
-                draw_node(self.tree.nil, px + node_gap_x // 2, py + node_gap_y, new_bh)
-
-        root_px, root_py = pixel_coords[self.tree.root]
-        initial_bh = 1 if self.tree.root.color == "black" else 0
-        draw_node(self.tree.root, root_px, root_py, initial_bh)
+            fill_color = "blue" if node == self.highlight_node else node_color
+            self.items.sync(("oval", node), "oval", (px - r, py - r, px + r, py + r),
+                            fill=fill_color, outline="black", width=2, tags=("node",))
+            self.items.sync(("text", node), "text", (px, py),
+                            text=str(node.value), fill=self.current_theme["text_color"], tags=("node",))
+
+            if hide_nil:
+                continue
+            # NIL leaves are keyed by (parent, side): the sentinel itself is shared
+            new_bh = cells[node][2] + (1 if node.color == "black" else 0)
+            for side, child, nx in (("L", node.left, px - node_gap_x // 2), ("R", node.right, px + node_gap_x // 2)):
+                if child != self.tree.nil:
+                    continue
+                ny = py + node_gap_y
+                self.items.sync(("nil", node, side), "oval", (nx - r, ny - r, nx + r, ny + r),
+                                fill="black", outline="white", width=2, tags=("nil",))
+                self.items.sync(("bh", node, side), "text", (nx, ny - r + r * 40 // 15),
+                                text=f"BH={new_bh}", fill="black", tags=("nil",))
+
+        for node in view.collapsed:
+            # summary glyph: a triangle spanning the subtree's columns
+            px, py = pixel(node)
+            size, sub_height = self.layout_stats[node]
+            left, right = self._children(node)
+            lo = px - (self.layout_stats[left][0] if left else 0) * node_gap_x
+            hi = px + (self.layout_stats[right][0] if right else 0) * node_gap_x
+            bottom = py + max(1, sub_height - 1) * node_gap_y
+            self.items.sync(("glyph", node), "polygon", (px, py, lo, bottom, hi, bottom),
+                            fill=self.current_theme["black_node"], outline=self.current_theme["bg"], tags=("glyph",))
+            self.items.sync(("glyph_text", node), "text", (px, bottom + 8),
+                            text=f"{size} / h{sub_height}", fill="black", font=("Segoe UI", 7), tags=("glyph",))
+
+        self.items.end()
+        if self.items.created:
+            # items created this frame land on top; keep edges underneath nodes
+            self.canvas.tag_lower("edge")
 
     def on_value_change(self, *args) -> None:
         self.search_path_edges.clear()
@@ -409,29 +809,37 @@ class RedBlackTreeVisualizer:
                 return "purple", 5
         return "black", 2
 
-    def _compute_positions(self, node: RedBlackTreeNode, depth: int, x_index: int, positions: dict) -> int:
-        if node == self.tree.nil:
-            return x_index
-        x_index = self._compute_positions(node.left, depth + 1, x_index, positions)
-        positions[node] = (x_index, depth)
-        x_index += 1
-        x_index = self._compute_positions(node.right, depth + 1, x_index, positions)
-        return x_index
-
     # --------------------------------------------------
     #  TOOLTIP
     # --------------------------------------------------
+    def node_at(self, event: tk.Event) -> Optional[RedBlackTreeNode]:
+        """O(1) hit test: snap the pointer to the nearest layout cell and check
+        it against that cell's node box."""
+        if self.view_geometry is None:
+            return None
+        offset_x, margin_x, margin_y, gap_x, gap_y, r, min_columns = self.view_geometry
+        x = self.canvas.canvasx(event.x) - offset_x - margin_x
+        y = self.canvas.canvasy(event.y) - margin_y
+        column, row = round(x / gap_x), round(y / gap_y)
+        node = self.cell_index.get((column, row))
+        if node is None or self.layout_stats[node][0] < min_columns:
+            return None  # empty cell, or folded into a summary glyph
+        if abs(x - column * gap_x) > r or abs(y - row * gap_y) > r:
+            return None
+        return node
+
     def on_mouse_move(self, event: tk.Event) -> None:
-        found_node: Optional[RedBlackTreeNode] = None
-        for node, (left, top, right, bottom) in self.node_positions.items():
-            if left <= event.x <= right and top <= event.y <= bottom:
-                found_node = node
-                break
-        if found_node and found_node != self.tree.nil:
+        found_node = self.node_at(event)
+        if found_node is None:
+            self.hover_node = None
+            self.hide_tooltip()
+        elif found_node is self.hover_node and self.tooltip_label is not None:
+            # same node: only follow the pointer, the text is unchanged
+            self.tooltip_label.place(x=event.x + 10, y=event.y + 10)
+        else:
+            self.hover_node = found_node
             tip = f"Value: {found_node.value}\nColor: {found_node.color}"
             self.show_tooltip(event.x + 10, event.y + 10, tip)
-        else:
-            self.hide_tooltip()
 
     def show_tooltip(self, x: int, y: int, text: str) -> None:
         if self.tooltip_label is None:
@@ -451,29 +859,28 @@ class RedBlackTreeVisualizer:
     # --------------------------------------------------
     def log(self, message: str) -> None:
         self.tree.steps.append(message)
-        self.log_text.insert(tk.END, message + "\n")
-        self.log_text.see(tk.END)
+        self.log_panel.append(message)
 
     def _toggle_manual_coloring(self) -> None:
         self.log("Manual coloring mode " + ("ENABLED" if self.manual_coloring_var.get() else "DISABLED") + ".")
 
     def on_mouse_click(self, event: tk.Event) -> None:
-        if not self.manual_coloring_var.get():
+        if not self.manual_coloring_var.get() or self._busy():
             return
-        for node, (left, top, right, bottom) in self.node_positions.items():
-            if left <= event.x <= right and top <= event.y <= bottom:
-                if node == self.tree.nil:
-                    return
-                old = node.color
-                node.color = "black" if node.color == "red" else "red"
-                self.log(f"Toggled node {node.value} from {old} to {node.color}.")
-                self.draw_tree()
-                return
+        node = self.node_at(event)
+        if node is None:
+            return
+        old = node.color
+        node.color = "black" if node.color == "red" else "red"
+        self.log(f"Toggled node {node.value} from {old} to {node.color}.")
+        self.draw_tree()
 
     # --------------------------------------------------
     #  RB PROPERTY CHECK
     # --------------------------------------------------
     def check_rb_properties(self) -> None:
+        if self._busy(reading=True):
+            return
         errors: List[str] = []
 
         if self.tree.root != self.tree.nil and self.tree.root.color != "black":
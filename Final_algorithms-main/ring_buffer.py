@@ -0,0 +1,325 @@
+#RING BUFFER LOGIC
+#Fixed capacity circular queue over a typed array, with no Tk state.
+#front/rear follow the visualizer's convention: both are -1 while empty.
+#BlockingRingBuffer and AsyncRingBuffer add producer/consumer hand-off on top.
+import asyncio
+import queue
+import threading
+import time
+from array import array
+from collections import deque
+
+
+class RingBuffer:
+    def __init__(self, capacity=10, typecode='q'):
+        if capacity < 1:
+            raise ValueError("RingBuffer capacity must be >= 1")
+        self.capacity = capacity
+        self.typecode = typecode
+        if typecode is None:  #Plain Python objects, for hand-off queues between stages
+            self._data = [None] * capacity
+        else:
+            self._data = array(typecode, bytes(capacity * array(typecode).itemsize))
+        self._head = 0  #Slot of the front element
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def is_empty(self):
+        return self._size == 0
+
+    def is_full(self):
+        return self._size == self.capacity
+
+    @property
+    def front_index(self):
+        return self._head if self._size else -1
+
+    @property
+    def rear_index(self):
+        if not self._size:
+            return -1
+        return (self._head + self._size - 1) % self.capacity
+
+    def enqueue(self, value):
+        if self._size == self.capacity:
+            return False  #Overflow
+        self._data[(self._head + self._size) % self.capacity] = value
+        self._size += 1
+        return True
+
+    def dequeue(self):
+        if not self._size:
+            return None  #Underflow
+        value = self._data[self._head]
+        if self.typecode is None:
+            self._data[self._head] = None  #Don't keep dequeued objects alive
+        self._head = (self._head + 1) % self.capacity
+        self._size -= 1
+        if not self._size:
+            self._head = 0
+        return value
+
+    def peek(self):
+        return self._data[self._head] if self._size else None
+
+    def extend(self, values):
+        #Copies as many values as fit with at most two slice assignments and
+        #returns how many were taken
+        if self.typecode is None:
+            if not isinstance(values, list):
+                values = list(values)
+        elif not isinstance(values, array) or values.typecode != self.typecode:
+            values = array(self.typecode, values)
+        count = min(len(values), self.capacity - self._size)
+        if count <= 0:
+            return 0
+        start = (self._head + self._size) % self.capacity
+        first = min(count, self.capacity - start)
+        self._data[start:start + first] = values[:first]
+        if count > first:
+            self._data[:count - first] = values[first:count]
+        self._size += count
+        return count
+
+    def drain(self, count=None):
+        #Removes up to count values from the front and returns them as one
+        #array (a list for object storage), built from at most two block
+        #copies of the storage
+        if count is None or count > self._size:
+            count = self._size
+        if count <= 0:
+            return [] if self.typecode is None else array(self.typecode)
+        first, second = self._segments(count)
+        out = self._data[first[0]:first[1]]
+        if second is not None:
+            out += self._data[second[0]:second[1]]
+        if self.typecode is None:
+            for start, end in (first, second or (0, 0)):
+                self._data[start:end] = [None] * (end - start)
+        self._head = (self._head + count) % self.capacity
+        self._size -= count
+        if not self._size:
+            self._head = 0
+        return out
+
+    def segments(self):
+        #Zero-copy views of the live contents, front to rear (one or two);
+        #object storage has no buffer, so it gets list slices instead
+        if not self._size:
+            return []
+        view = self._data if self.typecode is None else memoryview(self._data)
+        first, second = self._segments(self._size)
+        if second is None:
+            return [view[first[0]:first[1]]]
+        return [view[first[0]:first[1]], view[second[0]:second[1]]]
+
+    def _segments(self, count):
+        end = self._head + count
+        if end <= self.capacity:
+            return (self._head, end), None
+        return (self._head, self.capacity), (0, end - self.capacity)
+
+    def slot(self, index):
+        #Value stored in a physical slot, or None when that slot is free
+        offset = (index - self._head) % self.capacity
+        return self._data[index] if offset < self._size else None
+
+    def clear(self):
+        if self.typecode is None:
+            self._data[:] = [None] * self.capacity
+        self._head = 0
+        self._size = 0
+
+    def __iter__(self):
+        for segment in self.segments():
+            yield from segment
+
+    def __getitem__(self, position):
+        #position-th element counted from the front
+        if position < 0:
+            position += self._size
+        if not 0 <= position < self._size:
+            raise IndexError("RingBuffer index out of range")
+        return self._data[(self._head + position) % self.capacity]
+
+
+#BLOCKING VARIANT
+#Same wraparound storage guarded by one lock and two conditions, like
+#queue.Queue, and raising queue.Full / queue.Empty on timeout so it can be
+#dropped in where a queue.Queue was used.
+class BlockingRingBuffer:
+    def __init__(self, capacity=10, typecode=None):
+        self._ring = RingBuffer(capacity, typecode)
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    @property
+    def capacity(self):
+        return self._ring.capacity
+
+    def __len__(self):
+        with self._lock:
+            return len(self._ring)
+
+    qsize = __len__
+
+    def _wait(self, condition, ready, block, timeout, error):
+        #Waits on condition (lock held) until ready(); raises error on timeout
+        if ready():
+            return
+        if not block:
+            raise error
+        if timeout is None:
+            while not ready():
+                condition.wait()
+            return
+        deadline = time.monotonic() + timeout
+        while not ready():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise error
+            condition.wait(remaining)
+
+    def put(self, item, block=True, timeout=None):
+        with self._not_full:
+            if not self._ring.enqueue(item):
+                self._wait(self._not_full, lambda: not self._ring.is_full(), block, timeout, queue.Full)
+                self._ring.enqueue(item)
+            self._not_empty.notify()
+
+    def get(self, block=True, timeout=None):
+        with self._not_empty:
+            if self._ring.is_empty():
+                self._wait(self._not_empty, lambda: not self._ring.is_empty(), block, timeout, queue.Empty)
+            item = self._ring.dequeue()
+            self._not_full.notify()
+            return item
+
+    def put_many(self, items, block=True, timeout=None):
+        #Backpressure: copies as much as fits, then waits for room for the
+        #rest.  On timeout queue.Full is raised and the items already placed
+        #stay queued; its args[0] is how many that was.
+        items = items if isinstance(items, (list, array)) else list(items)
+        placed = 0
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._not_full:
+            while placed < len(items):
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    self._wait(self._not_full, lambda: not self._ring.is_full(), block, remaining, queue.Full)
+                except queue.Full:
+                    raise queue.Full(placed) from None
+                #slice only what fits, not the whole remainder per wake-up
+                free = self._ring.capacity - len(self._ring)
+                taken = self._ring.extend(items[placed:placed + free])
+                placed += taken
+                self._not_empty.notify(taken)
+        return placed
+
+    def get_many(self, max_items=None, block=True, timeout=None):
+        #Waits for at least one item, then takes up to max_items in one drain
+        with self._not_empty:
+            self._wait(self._not_empty, lambda: not self._ring.is_empty(), block, timeout, queue.Empty)
+            items = self._ring.drain(max_items)
+            self._not_full.notify(len(items))
+            return items
+
+
+#ASYNCIO VARIANT
+#For producers and consumers that are coroutines on one event loop.  Not
+#thread-safe, like asyncio.Queue; waiters park on futures that are resolved
+#in FIFO order as room or items appear.
+class AsyncRingBuffer:
+    def __init__(self, capacity=10, typecode=None):
+        self._ring = RingBuffer(capacity, typecode)
+        self._getters = deque()
+        self._putters = deque()
+
+    @property
+    def capacity(self):
+        return self._ring.capacity
+
+    def __len__(self):
+        return len(self._ring)
+
+    qsize = __len__
+
+    @staticmethod
+    def _wakeup(waiters, count=1):
+        while waiters and count > 0:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                count -= 1
+
+    async def _wait(self, waiters, ready, deadline):
+        #Parks until ready(); deadline is a loop.time() or None
+        loop = asyncio.get_running_loop()
+        while not ready():
+            waiter = loop.create_future()
+            waiters.append(waiter)
+            try:
+                if deadline is None:
+                    await waiter
+                else:
+                    await asyncio.wait_for(waiter, max(0.0, deadline - loop.time()))
+            except BaseException:
+                waiter.cancel()
+                try:
+                    waiters.remove(waiter)
+                except ValueError:
+                    pass
+                #A wakeup meant for us goes to the next waiter instead
+                if ready():
+                    self._wakeup(waiters)
+                raise
+
+    @staticmethod
+    def _deadline(timeout):
+        return None if timeout is None else asyncio.get_running_loop().time() + timeout
+
+    def put_nowait(self, item):
+        if not self._ring.enqueue(item):
+            raise asyncio.QueueFull
+        self._wakeup(self._getters)
+
+    def get_nowait(self):
+        if self._ring.is_empty():
+            raise asyncio.QueueEmpty
+        item = self._ring.dequeue()
+        self._wakeup(self._putters)
+        return item
+
+    async def put(self, item, timeout=None):
+        if self._ring.is_full():
+            await self._wait(self._putters, lambda: not self._ring.is_full(), self._deadline(timeout))
+        self.put_nowait(item)
+
+    async def get(self, timeout=None):
+        if self._ring.is_empty():
+            await self._wait(self._getters, lambda: not self._ring.is_empty(), self._deadline(timeout))
+        return self.get_nowait()
+
+    async def put_many(self, items, timeout=None):
+        #Backpressure as in BlockingRingBuffer.put_many; raises
+        #asyncio.TimeoutError if the deadline passes before all are placed
+        items = items if isinstance(items, (list, array)) else list(items)
+        placed = 0
+        deadline = self._deadline(timeout)
+        while placed < len(items):
+            await self._wait(self._putters, lambda: not self._ring.is_full(), deadline)
+            free = self._ring.capacity - len(self._ring)
+            taken = self._ring.extend(items[placed:placed + free])
+            placed += taken
+            self._wakeup(self._getters, taken)
+        return placed
+
+    async def get_many(self, max_items=None, timeout=None):
+        #Waits for at least one item, then takes up to max_items in one drain
+        await self._wait(self._getters, lambda: not self._ring.is_empty(), self._deadline(timeout))
+        items = self._ring.drain(max_items)
+        self._wakeup(self._putters, len(items))
+        return items
@@ -0,0 +1,79 @@
+import time
+from collections import deque
+import matplotlib.pyplot as plt
+from ring_buffer import RingBuffer
+
+
+def measure_list(n):
+    """The visualizer's old storage: append on insert, pop(0) on delete."""
+    store = []
+    start = time.perf_counter()
+    for value in range(n):
+        store.append(value)
+    while store:
+        store.pop(0)
+    return time.perf_counter() - start
+
+
+def measure_deque(n):
+    store = deque(maxlen=n)
+    start = time.perf_counter()
+    for value in range(n):
+        store.append(value)
+    while store:
+        store.popleft()
+    return time.perf_counter() - start
+
+
+def measure_ring(n):
+    """One enqueue and one dequeue per value, wrapping around a half-size buffer."""
+    ring = RingBuffer(n // 2)
+    start = time.perf_counter()
+    for value in range(n):
+        if not ring.enqueue(value):
+            ring.dequeue()
+            ring.enqueue(value)
+    while not ring.is_empty():
+        ring.dequeue()
+    return time.perf_counter() - start
+
+
+def measure_ring_bulk(n, batch=1000):
+    """extend/drain in batches: two slice copies per call instead of one call per value."""
+    ring = RingBuffer(n // 2)
+    values = list(range(n))
+    start = time.perf_counter()
+    for i in range(0, n, batch):
+        chunk = values[i:i + batch]
+        taken = ring.extend(chunk)
+        if taken < len(chunk):
+            ring.drain(batch)
+            ring.extend(chunk[taken:])
+    ring.drain()
+    return time.perf_counter() - start
+
+
+sizes = [10000, 20000, 30000, 50000, 60000]
+runs = {"list pop(0)": measure_list, "deque": measure_deque,
+        "RingBuffer": measure_ring, "RingBuffer extend/drain": measure_ring_bulk}
+
+results = {name: [] for name in runs}
+for n in sizes:
+    for name, measure in runs.items():
+        t = measure(n)
+        results[name].append(t)
+        print(f"{name:>24}: {n} values → {t:.6f} seconds")
+
+# --- plot the line chart ---
+plt.figure()
+for name, times in results.items():
+    plt.plot(sizes, times, marker='o', label=name)
+plt.title("Circular Queue Enqueue + Dequeue Line Chart")
+plt.xlabel("Total Values")
+plt.ylabel("Total Time (seconds)")
+plt.legend()
+plt.grid(True)
+plt.tight_layout()
+
+plt.savefig("ring_buffer_chart.png")
+plt.show()
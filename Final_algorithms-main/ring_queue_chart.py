@@ -0,0 +1,108 @@
+import asyncio
+import queue
+import threading
+import time
+import matplotlib.pyplot as plt
+from ring_buffer import AsyncRingBuffer, BlockingRingBuffer
+
+TOTAL = 200000      # items handed off per run
+CAPACITY = 1024
+BATCH = 256
+
+
+def run_threads(make_queue, producers, batched):
+    """Throughput (items/sec) of `producers` threads feeding one consumer thread."""
+    q = make_queue()
+    share = TOTAL // producers
+
+    def produce():
+        if batched:
+            for i in range(0, share, BATCH):
+                q.put_many(list(range(i, min(i + BATCH, share))))
+        else:
+            for i in range(share):
+                q.put(i)
+
+    def consume():
+        received = 0
+        while received < share * producers:
+            if batched:
+                received += len(q.get_many(BATCH))
+            else:
+                q.get()
+                received += 1
+
+    threads = [threading.Thread(target=produce) for _ in range(producers)]
+    consumer = threading.Thread(target=consume)
+    start = time.perf_counter()
+    consumer.start()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    consumer.join()
+    return share * producers / (time.perf_counter() - start)
+
+
+def run_tasks(make_queue, producers, batched):
+    """Same hand-off with coroutines on one event loop."""
+    share = TOTAL // producers
+
+    async def main():
+        q = make_queue()
+
+        async def produce():
+            if batched:
+                for i in range(0, share, BATCH):
+                    await q.put_many(list(range(i, min(i + BATCH, share))))
+            else:
+                for i in range(share):
+                    await q.put(i)
+
+        async def consume():
+            received = 0
+            while received < share * producers:
+                if batched:
+                    received += len(await q.get_many(BATCH))
+                else:
+                    await q.get()
+                    received += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(consume(), *(produce() for _ in range(producers)))
+        return share * producers / (time.perf_counter() - start)
+
+    return asyncio.run(main())
+
+
+producer_counts = [1, 2, 4, 8]
+runs = {
+    "queue.Queue":                  lambda p: run_threads(lambda: queue.Queue(CAPACITY), p, False),
+    "BlockingRingBuffer":           lambda p: run_threads(lambda: BlockingRingBuffer(CAPACITY), p, False),
+    "BlockingRingBuffer (batched)": lambda p: run_threads(lambda: BlockingRingBuffer(CAPACITY), p, True),
+    "asyncio.Queue":                lambda p: run_tasks(lambda: asyncio.Queue(CAPACITY), p, False),
+    "AsyncRingBuffer":              lambda p: run_tasks(lambda: AsyncRingBuffer(CAPACITY), p, False),
+    "AsyncRingBuffer (batched)":    lambda p: run_tasks(lambda: AsyncRingBuffer(CAPACITY), p, True),
+}
+
+results = {name: [] for name in runs}
+for p in producer_counts:
+    for name, run in runs.items():
+        rate = run(p)
+        results[name].append(rate)
+        print(f"{name:>28}: {p} producers → {rate:,.0f} items/sec")
+
+# --- plot the line chart ---
+plt.figure()
+for name, rates in results.items():
+    plt.plot(producer_counts, rates, marker='o', label=name)
+plt.title("Bounded Queue Hand-off Throughput")
+plt.xlabel("Producers")
+plt.ylabel("Items per second")
+plt.yscale("log")
+plt.legend()
+plt.grid(True)
+plt.tight_layout()
+
+plt.savefig("ring_queue_chart.png")
+plt.show()
@@ -0,0 +1,60 @@
+import multiprocessing
+import random
+import time
+import matplotlib.pyplot as plt
+from rbt_logic import RedBlackTree
+from sharded_tree import ShardedTree
+
+N = 2_000_000       # keys ingested per run
+
+
+def single_process(nums):
+    """Baseline: the plain insert loop from rbt_chart.py."""
+    rbt = RedBlackTree(color_only=False)
+    start = time.perf_counter()
+    for num in nums:
+        rbt.insert(num)
+        rbt.rebalance_batch(1)
+    rbt.steps.clear()
+    return time.perf_counter() - start
+
+
+def sharded(nums, shards):
+    """Seconds to start the workers, ingest everything and merge one tree."""
+    start = time.perf_counter()
+    with ShardedTree(shards) as tree:
+        tree.insert_many(nums)
+        ingested = time.perf_counter() - start
+        tree.merge()
+    return ingested, time.perf_counter() - start
+
+
+# workers may be started with "spawn", which re-imports this file
+if __name__ == "__main__":
+    nums = random.sample(range(N * 10), N)
+    base = single_process(nums)
+    print(f"single process: {base:.2f} s ({N / base:,.0f} keys/sec)")
+
+    cores = list(range(1, multiprocessing.cpu_count() + 1))
+    ingest_times, total_times = [], []
+    for shards in cores:
+        ingested, total = sharded(nums, shards)
+        ingest_times.append(ingested)
+        total_times.append(total)
+        print(f"{shards} shards: ingest {ingested:.2f} s ({base / ingested:.2f}x), "
+              f"ingest + merge {total:.2f} s")
+
+    # --- plot the speedup chart ---
+    plt.figure()
+    plt.plot(cores, [base / t for t in ingest_times], marker='o', label="ingest")
+    plt.plot(cores, [base / t for t in total_times], marker='o', label="ingest + merge")
+    plt.plot(cores, cores, linestyle='--', color='gray', label="linear")
+    plt.title(f"Range-Sharded Red-Black Tree Ingestion ({N:,} keys)")
+    plt.xlabel("Shards (worker processes)")
+    plt.ylabel("Speedup over one process")
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+
+    plt.savefig("sharded_chart.png")
+    plt.show()
@@ -0,0 +1,289 @@
+# sharded_tree.py  –  range-sharded RedBlackTrees in worker processes
+
+import multiprocessing
+import random
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, List, Optional, Sequence, Set
+
+from rbt_logic import RedBlackTree
+from tree_walks import range_values
+
+
+def sample_boundaries(values: Sequence[int], shards: int, sample_size: int = 10000,
+                      rng: Optional[random.Random] = None) -> List[int]:
+    """``shards - 1`` split points at the quantiles of a random sample, so
+    each shard gets about the same number of keys even for skewed input."""
+    if shards <= 1 or not values:
+        return []
+    rng = rng or random.Random()
+    sample = sorted(values if len(values) <= sample_size else rng.sample(values, sample_size))
+    splits = [sample[len(sample) * i // shards] for i in range(1, shards)]
+    return sorted(set(splits))           # heavy duplicates can merge shards
+
+
+# --------------------------------------------------
+#  WORKER PROCESS
+# --------------------------------------------------
+def _shard_main(conn) -> None:
+    """One shard: a private tree driven by (op, payload) messages.  Values
+    travel as array('q') so a batch pickles as one block of bytes."""
+    tree = RedBlackTree()
+    nil = tree.nil
+    size = 0
+    while True:
+        op, payload = conn.recv()
+        if op == "insert":
+            inserted = 0
+            for value in payload:
+                if tree.insert(value):
+                    tree.rebalance_batch(1)
+                    inserted += 1
+            tree.steps.clear()
+            size += inserted
+            conn.send(inserted)
+        elif op == "delete":
+            deleted = sum(1 for value in payload if tree.delete(value))
+            tree.steps.clear()
+            size -= deleted
+            conn.send(deleted)
+        elif op == "contains":
+            search = tree.search_value
+            conn.send(bytes(search(value) is not None for value in payload))
+        elif op == "range":
+            conn.send(array("q", range_values(tree.root, payload[0], payload[1], nil)))
+        elif op == "dump":
+            out = array("q")
+            stack = []
+            node = tree.root
+            while stack or node is not nil:
+                while node is not nil:
+                    stack.append(node)
+                    node = node.left
+                node = stack.pop()
+                out.append(node.value)
+                node = node.right
+            conn.send(out)
+        elif op == "size":
+            conn.send(size)
+        else:                            # "stop"
+            conn.close()
+            return
+
+
+class _Shard:
+    def __init__(self, context) -> None:
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_shard_main, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+        self.in_flight = 0               # batches sent whose reply is unread
+
+    def call(self, op: str, payload=None):
+        self.conn.send((op, payload))
+        return self.conn.recv()
+
+
+class ShardedTree:
+    """Keys split by value range across ``shards`` worker processes.
+
+    Shard ``i`` owns the keys between ``boundaries[i - 1]`` (inclusive) and
+    ``boundaries[i]`` (exclusive).  Unless given, the boundaries are sampled
+    once ``shards * min_sample_per_shard`` keys have been written.
+    Until then, keys wait in this process, so a few early single inserts
+    cannot fix lopsided shards for good.  Bulk loads are sorted in chunks, cut into
+    per-shard batches of about ``batch_size`` and pipelined, with at most
+    ``max_in_flight`` unanswered batches per shard.  Every shard builds its part of the tree on its own
+    core.  Because the shards are ordered, concatenating their in-order dumps
+    is already the merged sorted stream.
+    """
+
+    def __init__(self, shards: Optional[int] = None, boundaries: Optional[List[int]] = None,
+                 batch_size: int = 65536, max_in_flight: int = 4, sample_size: int = 10000,
+                 min_sample_per_shard: int = 256) -> None:
+        self.shard_count = shards or multiprocessing.cpu_count()
+        self.boundaries = boundaries
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        self.sample_size = sample_size
+        self.min_sample_per_shard = min_sample_per_shard
+        self.size = 0
+        self._shards: List[_Shard] = []
+        self._staged: Set[int] = set()       # keys written before the boundaries exist
+        if boundaries is not None:
+            self._start(len(boundaries) + 1)
+
+    def _start(self, count: int) -> None:
+        context = multiprocessing.get_context()
+        self._shards = [_Shard(context) for _ in range(count)]
+
+    def _stage(self, op: str, values: Sequence[int]) -> int:
+        """Writes before the boundaries are known.  Once enough keys have
+        arrived, they are sampled, the workers start and the staged keys
+        are loaded.  Returns how many keys were new (or removed)."""
+        staged = self._staged
+        before = len(staged)
+        if op == "delete":
+            staged.difference_update(values)
+            return before - len(staged)
+        threshold = self.shard_count * self.min_sample_per_shard
+        if len(values) < threshold:
+            staged.update(values)
+            if len(staged) < threshold:
+                return len(staged) - before
+            pending = list(staged)
+        else:
+            # a big first load skips the set: the shards drop duplicates themselves
+            pending = list(staged) + list(values) if staged else values
+        staged.clear()
+        self.boundaries = sample_boundaries(pending, self.shard_count, self.sample_size)
+        self._start(len(self.boundaries) + 1)
+        return self._write(op, pending) - before
+
+    def shard_for(self, value: int) -> int:
+        return bisect_right(self.boundaries, value)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __enter__(self) -> "ShardedTree":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # --------------------------------------------------
+    #  WRITES
+    # --------------------------------------------------
+    def _send_batch(self, shard: _Shard, op: str, batch: array) -> int:
+        """Sends without waiting; returns the total of any replies that had
+        to be read first to stay under ``max_in_flight``."""
+        done = 0
+        if shard.in_flight >= self.max_in_flight:
+            done += shard.conn.recv()
+            shard.in_flight -= 1
+        shard.conn.send((op, batch))
+        shard.in_flight += 1
+        return done
+
+    def _drain(self) -> int:
+        done = 0
+        for shard in self._shards:
+            while shard.in_flight:
+                done += shard.conn.recv()
+                shard.in_flight -= 1
+        return done
+
+    def _write(self, op: str, values: Iterable[int]) -> int:
+        if not isinstance(values, (list, array, range)):
+            values = list(values)
+        if not values:
+            return 0
+        if self.boundaries is None:
+            return self._stage(op, values)
+        boundaries = self.boundaries
+        shards = self._shards
+        done = 0
+        # route a chunk at a time: one C-level sort, then one bisect per
+        # boundary instead of one per value
+        step = self.batch_size * len(shards)
+        for i in range(0, len(values), step):
+            chunk = sorted(values[i:i + step])
+            start = 0
+            for shard, boundary in zip(shards, boundaries + [None]):
+                end = len(chunk) if boundary is None else bisect_left(chunk, boundary, start)
+                if end > start:
+                    done += self._send_batch(shard, op, array("q", chunk[start:end]))
+                start = end
+        return done + self._drain()
+
+    def insert_many(self, values: Iterable[int]) -> int:
+        """Bulk load; returns how many values were new."""
+        inserted = self._write("insert", values)
+        self.size += inserted
+        return inserted
+
+    def delete_many(self, values: Iterable[int]) -> int:
+        deleted = self._write("delete", values)
+        self.size -= deleted
+        return deleted
+
+    def insert(self, value: int) -> bool:
+        return self.insert_many([value]) == 1
+
+    def delete(self, value: int) -> bool:
+        return self.delete_many([value]) == 1
+
+    # --------------------------------------------------
+    #  QUERIES
+    # --------------------------------------------------
+    def contains(self, value: int) -> bool:
+        if not self._shards:
+            return value in self._staged
+        return self._shards[self.shard_for(value)].call("contains", array("q", [value]))[0] == 1
+
+    def contains_many(self, values: Sequence[int]) -> List[bool]:
+        """Batched lookups: one round trip per shard, all shards at once."""
+        if not self._shards:
+            return [value in self._staged for value in values]
+        routed: List[List[int]] = [[] for _ in self._shards]
+        for i, value in enumerate(values):
+            routed[self.shard_for(value)].append(i)
+        asked = []
+        for shard, positions in zip(self._shards, routed):
+            if positions:
+                shard.conn.send(("contains", array("q", (values[i] for i in positions))))
+                asked.append((shard, positions))
+        result = [False] * len(values)
+        for shard, positions in asked:
+            for i, found in zip(positions, shard.conn.recv()):
+                result[i] = found == 1
+        return result
+
+    def range(self, lo: int, hi: int) -> array:
+        """Keys in [lo, hi], ascending; only shards whose span overlaps are asked."""
+        if lo > hi:
+            return array("q")
+        if not self._shards:
+            return array("q", sorted(value for value in self._staged if lo <= value <= hi))
+        first, last = self.shard_for(lo), self.shard_for(hi)
+        for shard in self._shards[first:last + 1]:
+            shard.conn.send(("range", (lo, hi)))
+        out = array("q")
+        for shard in self._shards[first:last + 1]:
+            out += shard.conn.recv()
+        return out
+
+    # --------------------------------------------------
+    #  MERGE
+    # --------------------------------------------------
+    def sorted_stream(self) -> Iterator[int]:
+        """All keys ascending, one shard at a time."""
+        if not self._shards:
+            yield from sorted(self._staged)
+        for shard in self._shards:
+            yield from shard.call("dump")
+
+    def merge(self) -> RedBlackTree:
+        """One balanced RedBlackTree holding every key, built in O(n)."""
+        values = array("q", sorted(self._staged))
+        for shard in self._shards:
+            shard.conn.send(("dump", None))
+        for shard in self._shards:
+            values += shard.conn.recv()
+        return RedBlackTree.from_sorted(values)
+
+    def shard_sizes(self) -> List[int]:
+        return [shard.call("size") for shard in self._shards]
+
+    def close(self) -> None:
+        for shard in self._shards:
+            try:
+                shard.conn.send(("stop", None))
+            except (BrokenPipeError, OSError):
+                pass
+            shard.process.join(timeout=5)
+            if shard.process.is_alive():
+                shard.process.terminate()
+            shard.conn.close()
+        self._shards = []
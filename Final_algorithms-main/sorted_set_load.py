@@ -0,0 +1,148 @@
+# sorted_set_load.py  –  load generator for sorted_set_server.py
+"""Measures throughput and latency of the sorted-set server on one machine.
+
+Without ``--connect`` a server is started in a child process on a free
+port and stopped afterwards::
+
+    python sorted_set_load.py --clients 8 --depth 32 --seconds 5
+    python sorted_set_load.py --connect /tmp/sorted_set.sock --mix C=90,I=10
+
+``--depth`` is how many requests each connection keeps in flight
+(pipelining); latency is measured per request from queueing to response.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from sorted_set_server import SortedSetClient
+
+DEFAULT_MIX = "I=30,D=10,C=45,K=10,R=5"
+
+
+def parse_mix(text: str) -> Tuple[List[str], List[float]]:
+    ops, weights = [], []
+    for part in text.split(","):
+        op, _, weight = part.partition("=")
+        op = op.strip().upper()
+        if op not in ("I", "D", "C", "K", "R"):
+            raise argparse.ArgumentTypeError(f"unknown op '{op}' in mix")
+        ops.append(op)
+        weights.append(float(weight or 1))
+    return ops, weights
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+async def preload(client: SortedSetClient, count: int, keys: int) -> None:
+    # one pipelined burst per 10k keys instead of a round trip each
+    for start in range(0, count, 10000):
+        await asyncio.gather(*(client.send(f"I {random.randrange(keys)}")
+                               for _ in range(min(10000, count - start))))
+
+
+async def run_load(address: Tuple[Optional[str], int, Optional[str]], clients: int, depth: int,
+                   seconds: float, keys: int, mix: Tuple[List[str], List[float]],
+                   range_width: int, preload_count: int) -> Dict[str, List[float]]:
+    host, port, path = address
+    connections = [await SortedSetClient.connect(host, port, path) for _ in range(clients)]
+    if preload_count:
+        await preload(connections[0], preload_count, keys)
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    ops, weights = mix
+    deadline = time.perf_counter() + seconds
+
+    async def worker(client: SortedSetClient) -> None:
+        rng = random.Random()
+        choose = rng.choices
+        while time.perf_counter() < deadline:
+            op = choose(ops, weights)[0]
+            value = rng.randrange(keys)
+            request = f"R {value} {value + range_width} 100" if op == "R" else f"{op} {value}"
+            start = time.perf_counter()
+            await client.send(request)
+            latencies[op].append(time.perf_counter() - start)
+
+    await asyncio.gather(*(worker(client) for client in connections for _ in range(depth)))
+    for client in connections:
+        await client.close()
+    return latencies
+
+
+def report(latencies: Dict[str, List[float]], seconds: float) -> None:
+    total = sum(len(values) for values in latencies.values())
+    print(f"{total:,} requests in {seconds:.1f} s -> {total / seconds:,.0f} req/sec")
+    print(f"{'op':>4} {'count':>10} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    everything: List[float] = []
+    for op in sorted(latencies):
+        values = sorted(latencies[op])
+        everything.extend(values)
+        print(f"{op:>4} {len(values):>10,} {percentile(values, .5) * 1e3:>8.2f} "
+              f"{percentile(values, .9) * 1e3:>8.2f} {percentile(values, .99) * 1e3:>8.2f} "
+              f"{values[-1] * 1e3:>8.2f}")
+    everything.sort()
+    if everything:
+        print(f"{'all':>4} {len(everything):>10,} {percentile(everything, .5) * 1e3:>8.2f} "
+              f"{percentile(everything, .9) * 1e3:>8.2f} {percentile(everything, .99) * 1e3:>8.2f} "
+              f"{everything[-1] * 1e3:>8.2f}")
+
+
+def start_server() -> Tuple[subprocess.Popen, Tuple[Optional[str], int, Optional[str]]]:
+    here = os.path.dirname(os.path.abspath(__file__))
+    server = subprocess.Popen([sys.executable, os.path.join(here, "sorted_set_server.py"), "--port", "0"],
+                              stdout=subprocess.PIPE, text=True)
+    line = server.stdout.readline().strip()          # "listening on host:port"
+    if not line.startswith("listening on "):
+        server.kill()
+        raise RuntimeError("sorted_set_server.py did not start")
+    host, _, port = line[len("listening on "):].rpartition(":")
+    return server, (host, int(port), None)
+
+
+def parse_address(text: str) -> Tuple[Optional[str], int, Optional[str]]:
+    if ":" in text:
+        host, _, port = text.rpartition(":")
+        return host, int(port), None
+    return None, 0, text                             # a Unix socket path
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Load generator for sorted_set_server.py.")
+    parser.add_argument("--connect", metavar="HOST:PORT|PATH", help="use a running server")
+    parser.add_argument("--clients", type=int, default=4, help="connections")
+    parser.add_argument("--depth", type=int, default=16, help="requests in flight per connection")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--keys", type=int, default=1_000_000, help="size of the key space")
+    parser.add_argument("--preload", type=int, default=100_000, help="random keys inserted first")
+    parser.add_argument("--range-width", type=int, default=1000)
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"op weights, default {DEFAULT_MIX}")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.connect:
+        address = parse_address(args.connect)
+    else:
+        server, address = start_server()
+    try:
+        latencies = asyncio.run(run_load(address, args.clients, args.depth, args.seconds, args.keys,
+                                         args.mix, args.range_width, args.preload))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    report(latencies, args.seconds)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,363 @@
+# sorted_set_server.py  –  asyncio sorted-set service backed by RedBlackTree
+"""A shared ordered key set for local processes, over TCP or a Unix socket.
+
+One request per line, one response line per request, in order, so a
+client can pipeline as many requests as it likes before reading::
+
+    I <v>                 insert          -> 1 if added, 0 if present
+    D <v>                 delete          -> 1 if removed, 0 if absent
+    C <v>                 contains        -> 1 or 0
+    K <v>                 rank            -> how many members are < v
+    R <lo> <hi> [limit]   range           -> <count> <v> <v> ... (lo <= v <= hi)
+    N                     size            -> member count
+    anything else                         -> E <message>
+
+Writes from every connection that arrive in the same event-loop tick are
+applied to the tree together, once per tick.  A connection's requests still
+take effect in the order it sent them: a read that follows one of its own
+writes waits for that tick's commit.  ``rank`` and ``range`` are answered
+from an immutable sorted snapshot plus the few writes made since it was
+taken (see SortedSetStore), so they never walk or lock the tree; a long
+range reply is streamed while writers keep committing.
+
+    python sorted_set_server.py --port 7878
+    python sorted_set_server.py --unix /tmp/sorted_set.sock
+"""
+
+import argparse
+import asyncio
+import sys
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+from rbt_logic import RedBlackTree
+
+STREAM_VALUES = 4096        # range replies longer than this are sent in pieces
+READ_SIZE = 1 << 16
+
+
+class SortedSetStore:
+    """The tree plus a sorted snapshot of it for order-statistic reads.
+
+    The snapshot is an immutable sorted list.  Writes since it was taken
+    sit in two small sorted overlays (values added, values removed), so
+    ``rank`` and ``range`` are exact without rebuilding it.  The overlays
+    are folded into a fresh snapshot once they pass ``len/64`` entries,
+    which keeps a write's share of the rebuild constant.
+    """
+
+    def __init__(self) -> None:
+        self.tree = RedBlackTree()
+        self.size = 0
+        self._snapshot: List[int] = []
+        self._added: List[int] = []       # in the tree, not in the snapshot
+        self._removed: List[int] = []     # in the snapshot, not in the tree
+
+    def insert(self, value: int) -> bool:
+        if not self.tree.insert(value):
+            return False
+        self.tree.rebalance_batch(1)
+        self.size += 1
+        if not _discard(self._removed, value):
+            insort(self._added, value)
+        return True
+
+    def delete(self, value: int) -> bool:
+        if not self.tree.delete(value):
+            return False
+        self.size -= 1
+        if not _discard(self._added, value):
+            insort(self._removed, value)
+        return True
+
+    def contains(self, value: int) -> bool:
+        return self.tree.search_value(value) is not None
+
+    def end_batch(self) -> None:
+        # nothing reads the step log here; don't let it grow without bound
+        self.tree.steps.clear()
+        if len(self._added) + len(self._removed) > max(1024, len(self._snapshot) >> 6):
+            self._fold()
+
+    def _fold(self) -> None:
+        # a new list every time: readers may still hold the old one
+        removed = set(self._removed)
+        values = [value for value in self._snapshot if value not in removed] if removed \
+            else self._snapshot[:]
+        values += self._added
+        values.sort()               # two sorted runs: one C-level merge
+        self._snapshot = values
+        self._added = []
+        self._removed = []
+
+    def rank(self, value: int) -> int:
+        """How many members are smaller than ``value``."""
+        return (bisect_left(self._snapshot, value) + bisect_left(self._added, value)
+                - bisect_left(self._removed, value))
+
+    def range(self, lo: int, hi: int, limit: Optional[int] = None) -> List[int]:
+        """Members in [lo, hi], ascending, at most ``limit`` of them.  The
+        result is a fresh list, safe to stream after later writes."""
+        snapshot, added, removed = self._snapshot, self._added, self._removed
+        start = bisect_left(snapshot, lo)
+        end = bisect_right(snapshot, hi)
+        gone = removed[bisect_left(removed, lo):bisect_right(removed, hi)]
+        new = added[bisect_left(added, lo):bisect_right(added, hi)]
+        if limit is not None:
+            # enough of the snapshot to survive the removals
+            end = min(end, start + max(0, limit) + len(gone))
+        values = snapshot[start:end]
+        if gone:
+            gone_set = set(gone)
+            values = [value for value in values if value not in gone_set]
+        if new:
+            values += new
+            values.sort()
+        if limit is not None:
+            del values[max(0, limit):]
+        return values
+
+
+def _discard(values: List[int], value: int) -> bool:
+    """Removes ``value`` from a sorted list if present."""
+    i = bisect_left(values, value)
+    if i < len(values) and values[i] == value:
+        del values[i]
+        return True
+    return False
+
+
+class SortedSetServer:
+    def __init__(self, store: Optional[SortedSetStore] = None) -> None:
+        self.store = store if store is not None else SortedSetStore()
+        # (op, value, response list, index) for the batch being collected
+        self._batch: List[Tuple[bytes, int, list, int]] = []
+        self._tick: Optional[asyncio.Future] = None
+        self.commits = 0
+        self.writes = 0
+
+    # --------------------------------------------------
+    #  WRITE BATCHING
+    # --------------------------------------------------
+    def _submit(self, op: bytes, value: int, out: list, index: int) -> asyncio.Future:
+        """Queues a write; its response lands in ``out[index]`` when the
+        returned future (shared by the whole tick) is done."""
+        if self._tick is None:
+            loop = asyncio.get_running_loop()
+            self._tick = loop.create_future()
+            loop.call_soon(self._commit)
+        self._batch.append((op, value, out, index))
+        return self._tick
+
+    def _commit(self) -> None:
+        batch, tick = self._batch, self._tick
+        self._batch, self._tick = [], None
+        store = self.store
+        for op, value, out, index in batch:
+            changed = store.insert(value) if op == b"I" else store.delete(value)
+            out[index] = b"1\n" if changed else b"0\n"
+        store.end_batch()
+        self.commits += 1
+        self.writes += len(batch)
+        tick.set_result(None)
+
+    # --------------------------------------------------
+    #  CONNECTIONS
+    # --------------------------------------------------
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        carry = b""
+        try:
+            while True:
+                data = await reader.read(READ_SIZE)
+                if not data:
+                    break
+                lines = (carry + data).split(b"\n")
+                carry = lines.pop()
+                await self._run(lines, writer)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _run(self, lines: List[bytes], writer: asyncio.StreamWriter) -> None:
+        """Answers one pipelined burst with a single write (plus pieces of
+        any long range reply)."""
+        out: list = []
+        tick: Optional[asyncio.Future] = None
+        store = self.store
+        for line in lines:
+            parts = line.split()
+            if not parts:
+                continue
+            op = parts[0].upper()
+            try:
+                if op == b"I" or op == b"D":
+                    if len(parts) != 2:
+                        raise ValueError
+                    value = int(parts[1])
+                    out.append(None)    # filled in by the commit
+                    tick = self._submit(op, value, out, len(out) - 1)
+                    continue
+                if tick is not None:
+                    # our own earlier writes come first; shielded because the
+                    # tick's future is shared with every other writer
+                    await asyncio.shield(tick)
+                    tick = None
+                if op == b"C" and len(parts) == 2:
+                    out.append(b"1\n" if store.contains(int(parts[1])) else b"0\n")
+                elif op == b"K" and len(parts) == 2:
+                    out.append(b"%d\n" % store.rank(int(parts[1])))
+                elif op == b"N" and len(parts) == 1:
+                    out.append(b"%d\n" % store.size)
+                elif op == b"R" and len(parts) in (3, 4):
+                    limit = int(parts[3]) if len(parts) == 4 else None
+                    await self._range(int(parts[1]), int(parts[2]), limit, out, writer)
+                    out = []
+                else:
+                    out.append(b"E unknown request\n")
+            except ValueError:
+                out.append(b"E bad request\n")
+        if tick is not None:
+            await asyncio.shield(tick)
+        if out:
+            writer.write(b"".join(out))
+
+    async def _range(self, lo: int, hi: int, limit: Optional[int], out: list,
+                     writer: asyncio.StreamWriter) -> None:
+        values = self.store.range(lo, hi, limit)
+        count = len(values)
+        if count <= STREAM_VALUES:
+            out.append(f"{count} {' '.join(map(str, values))}\n".encode() if count else b"0\n")
+            writer.write(b"".join(out))
+            return
+        # long reply: stream it in pieces, yielding to other connections (and
+        # the commits they trigger) in between; values is ours alone
+        writer.write(b"".join(out) + b"%d" % count)
+        for i in range(0, count, STREAM_VALUES):
+            writer.write((" " + " ".join(map(str, values[i:i + STREAM_VALUES]))).encode())
+            await writer.drain()
+        writer.write(b"\n")
+
+    async def start(self, host: str = "127.0.0.1", port: int = 7878,
+                    path: Optional[str] = None) -> asyncio.AbstractServer:
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle, path=path)
+        return await asyncio.start_server(self.handle, host, port)
+
+
+# --------------------------------------------------
+#  CLIENT
+# --------------------------------------------------
+class SortedSetClient:
+    """Pipelining client: any number of coroutines may have requests in
+    flight on one connection; requests queued in the same tick go out in
+    one write and responses are matched up in order."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._outgoing: List[bytes] = []
+        self._flush_scheduled = False
+        self._reading = asyncio.get_running_loop().create_task(self._read_responses())
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = 7878,
+                      path: Optional[str] = None) -> "SortedSetClient":
+        limit = 1 << 26             # range replies can be long single lines
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=limit)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=limit)
+        return cls(reader, writer)
+
+    def send(self, request: str) -> asyncio.Future:
+        """Queues one request line; the future gets its response line."""
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        self._outgoing.append(request.encode() + b"\n")
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            loop.call_soon(self._flush)
+        return waiter
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        self._writer.write(b"".join(self._outgoing))
+        self._outgoing.clear()
+
+    async def request(self, request: str) -> str:
+        response = await self.send(request)
+        if response.startswith("E "):
+            raise ValueError(response[2:])
+        return response
+
+    async def insert(self, value: int) -> bool:
+        return await self.request(f"I {value}") == "1"
+
+    async def delete(self, value: int) -> bool:
+        return await self.request(f"D {value}") == "1"
+
+    async def contains(self, value: int) -> bool:
+        return await self.request(f"C {value}") == "1"
+
+    async def rank(self, value: int) -> int:
+        return int(await self.request(f"K {value}"))
+
+    async def range(self, lo: int, hi: int, limit: Optional[int] = None) -> List[int]:
+        response = await self.request(f"R {lo} {hi}" + (f" {limit}" if limit is not None else ""))
+        return [int(value) for value in response.split()[1:]]
+
+    async def size(self) -> int:
+        return int(await self.request("N"))
+
+    async def _read_responses(self) -> None:
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                self._waiters.popleft().set_result(line.decode().rstrip("\n"))
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError) as e:
+            error: BaseException = e
+        else:
+            error = ConnectionError("server closed the connection")
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_exception(error)
+
+    async def close(self) -> None:
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        self._reading.cancel()
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    server = await SortedSetServer().start(args.host, args.port, args.unix)
+    where = args.unix or "%s:%d" % server.sockets[0].getsockname()[:2]
+    # the load generator reads this line to find a server it started itself
+    print(f"listening on {where}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Sorted-set server backed by a red-black tree.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7878, help="0 picks a free port")
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead")
+    try:
+        asyncio.run(_serve(parser.parse_args(argv)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,140 @@
+# tk_asyncio.py  –  runs asyncio tasks from Tk's event loop without polling
+
+import asyncio
+import heapq
+import math
+import tkinter as tk
+from typing import Any, Coroutine, List, Optional
+
+
+class TkEventLoop(asyncio.SelectorEventLoop):
+    """Selector loop that tells its bridge whenever work is scheduled, so the
+    bridge can arm exactly one Tk ``after()`` for the next thing due."""
+
+    def __init__(self, bridge: "TkAsyncioBridge") -> None:
+        super().__init__()
+        self._bridge = bridge
+
+    def call_soon(self, callback, *args, context=None):  # type: ignore[override]
+        handle = super().call_soon(callback, *args, context=context)
+        self._bridge._wake_soon()
+        return handle
+
+    def call_at(self, when, callback, *args, context=None):  # type: ignore[override]
+        handle = super().call_at(when, callback, *args, context=context)
+        self._bridge._wake_at(when)
+        return handle
+
+    def call_soon_threadsafe(self, callback, *args, context=None):  # type: ignore[override]
+        handle = super().call_soon_threadsafe(callback, *args, context=context)
+        self._bridge._wake_threadsafe()
+        return handle
+
+
+class TkAsyncioBridge:
+    """Drives a private asyncio loop from Tk's mainloop.
+
+    Each tick is ``loop.stop(); loop.run_forever()``, which runs everything
+    ready plus every timer that is due and returns without blocking.  Ticks
+    are only armed when the loop has something to do, at the deadline of the
+    earliest timer (Tk ``after`` has 1 ms resolution), so an idle window has
+    no wakeups at all.  The loop is closed when ``widget`` is destroyed.
+    """
+
+    def __init__(self, widget: tk.Misc) -> None:
+        self.widget = widget
+        self.loop = TkEventLoop(self)
+        self._deadlines: List[float] = []     # heap of loop.time() deadlines
+        self._after_id: Optional[str] = None
+        self._armed_for: Optional[float] = None
+        self._soon = False
+        self._ticking = False
+        self._close_pending = False
+        self.closed = False
+        self.ticks = 0
+        widget.bind("<Destroy>", self._on_destroy, add="+")
+
+    # --------------------------------------------------
+    #  PUBLIC
+    # --------------------------------------------------
+    def create_task(self, coro: Coroutine[Any, Any, Any]) -> "asyncio.Task[Any]":
+        return self.loop.create_task(coro)
+
+    def close(self) -> None:
+        """Cancels outstanding tasks, lets them unwind, and closes the loop."""
+        if self.closed:
+            return
+        if self._ticking:
+            # destroyed from inside a task: finish this tick first
+            self._close_pending = True
+            return
+        self.closed = True
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        tasks = [t for t in asyncio.all_tasks(self.loop) if not t.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+        self.loop.close()
+
+    # --------------------------------------------------
+    #  WAKEUPS
+    # --------------------------------------------------
+    def _wake_soon(self) -> None:
+        self._soon = True
+        if not self._ticking:
+            self._arm(self.loop.time())
+
+    def _wake_at(self, when: float) -> None:
+        heapq.heappush(self._deadlines, when)
+        if not self._ticking:
+            self._arm(when)
+
+    def _wake_threadsafe(self) -> None:
+        # tkinter hands calls from other threads to the Tcl thread
+        if not self.closed:
+            self.widget.after(0, self._wake_soon)
+
+    def _arm(self, when: float) -> None:
+        if self.closed:
+            return
+        if self._after_id is not None:
+            if self._armed_for is not None and self._armed_for <= when:
+                return
+            self.widget.after_cancel(self._after_id)
+        delay_ms = max(0, math.ceil((when - self.loop.time()) * 1000))
+        self._armed_for = when
+        self._after_id = self.widget.after(delay_ms, self._tick)
+
+    def _tick(self) -> None:
+        self._after_id = None
+        self._armed_for = None
+        if self.closed:
+            return
+        self._soon = False
+        self._ticking = True
+        try:
+            self.loop.stop()
+            self.loop.run_forever()
+        finally:
+            self._ticking = False
+        self.ticks += 1
+        if self._close_pending:
+            self.close()
+            return
+
+        # timers that have fired are done; cancelled ones cost one spare tick
+        now = self.loop.time()
+        while self._deadlines and self._deadlines[0] <= now:
+            heapq.heappop(self._deadlines)
+        if self._soon:
+            self._arm(now)
+        elif self._deadlines:
+            self._arm(self._deadlines[0])
+
+    def _on_destroy(self, event: tk.Event) -> None:
+        if event.widget is self.widget:
+            self.close()
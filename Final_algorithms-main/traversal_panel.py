@@ -0,0 +1,158 @@
+# traversal_panel.py  –  virtualized, scrollable row of traversal results
+
+import tkinter as tk
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+from canvas_items import CanvasItemCache
+
+
+class TraversalPanel:
+    """Shows a (possibly huge) sequence of values as a horizontal row of cells.
+
+    Values are pulled from the iterator only as far as the user has scrolled
+    or the animation has revealed, and canvas items exist only for the cells
+    in view, so showing a million-node traversal costs one screenful.  With
+    ``animate=True`` cells are revealed one per ``step_ms`` from ``after()``
+    callbacks; ``on_step(index, value)`` is called for each one and
+    ``on_done()`` once the last cell has been revealed.
+    """
+
+    def __init__(self, parent: tk.Misc, width: int, height: int = 60,
+                 cell_width: int = 91, font: Any = ("Arial", 15, "bold", "italic")) -> None:
+        self.frame = tk.Frame(parent)
+        self.canvas = tk.Canvas(self.frame, width=width, height=height, bg="white",
+                                highlightthickness=0)
+        self.canvas.pack(side=tk.TOP, fill=tk.X)
+        self.scroll = tk.Scrollbar(self.frame, orient=tk.HORIZONTAL, command=self._xview)
+        self.scroll.pack(side=tk.BOTTOM, fill=tk.X)
+        self.canvas.configure(xscrollcommand=self.scroll.set)
+        self.canvas.bind("<Configure>", lambda event: self.render())
+
+        self.cell_width = cell_width
+        self.height = height
+        self.font = font
+        self.items = CanvasItemCache(self.canvas, tag="cell")
+        self.values: List[Any] = []
+        self._source: Optional[Iterator[Any]] = None
+        self._total: Optional[int] = 0           # known length, None while unknown
+        self._revealed: Optional[int] = None     # cells shown so far when animating
+        self._on_step: Optional[Callable[[int, Any], None]] = None
+        self._on_done: Optional[Callable[[], None]] = None
+        self._step_ms = 0
+        self._after_id: Optional[str] = None
+
+    def place(self, **kwargs: Any) -> None:
+        self.frame.place(**kwargs)
+
+    # --------------------------------------------------
+    #  PUBLIC
+    # --------------------------------------------------
+    def show(self, values: Iterable[Any], total: Optional[int] = None, animate: bool = False,
+             step_ms: int = 400, on_step: Optional[Callable[[int, Any], None]] = None,
+             on_done: Optional[Callable[[], None]] = None) -> None:
+        """Replaces the row with ``values``; ``total`` (if known) sizes the
+        scrollbar up front instead of growing it as values are pulled."""
+        self.cancel()
+        self.values = []
+        self._source = iter(values)
+        self._total = total
+        self._on_step = on_step
+        self._on_done = on_done
+        self._step_ms = step_ms
+        self._revealed = 0 if animate else None
+        self.canvas.xview_moveto(0)
+        self.render()
+        if animate:
+            self._after_id = self.canvas.after(0, self._step)
+
+    def clear(self) -> None:
+        self.show(())
+
+    def detach(self) -> None:
+        """Stops pulling from the source (e.g. because the tree it walks is
+        about to change) and keeps what has been pulled so far."""
+        self.cancel()
+        if self._source is not None:
+            self._source = None
+            self._total = len(self.values)
+            self._revealed = None
+            self.render()
+
+    def cancel(self) -> None:
+        """Stops an animation; cells already revealed stay."""
+        if self._after_id is not None:
+            self.canvas.after_cancel(self._after_id)
+            self._after_id = None
+
+    @property
+    def animating(self) -> bool:
+        return self._after_id is not None
+
+    # --------------------------------------------------
+    #  INTERNALS
+    # --------------------------------------------------
+    def _pull(self, count: int) -> None:
+        """Makes sure the first ``count`` values are materialized, if they exist."""
+        source = self._source
+        values = self.values
+        while source is not None and len(values) < count:
+            try:
+                values.append(next(source))
+            except StopIteration:
+                self._source = source = None
+                self._total = len(values)
+
+    def _length(self) -> int:
+        """Cells the scrollregion should cover right now."""
+        limit = self._total
+        if limit is None:
+            # unknown length: one spare cell keeps the scrollbar growing
+            limit = len(self.values) + (1 if self._source is not None else 0)
+        if self._revealed is not None:
+            limit = min(limit, self._revealed)
+        return limit
+
+    def _xview(self, *args: Any) -> None:
+        self.canvas.xview(*args)
+        self.render()
+
+    def render(self) -> None:
+        width = self.canvas.winfo_width()
+        x0 = self.canvas.canvasx(0)
+        first = max(0, int(x0 // self.cell_width))
+        last = int((x0 + width) // self.cell_width)
+        if self._revealed is not None:
+            last = min(last, self._revealed - 1)
+        self._pull(last + 1)
+
+        self.items.begin()
+        for i in range(first, min(last + 1, len(self.values))):
+            x = i * self.cell_width
+            self.items.sync(("cell", i), "rectangle",
+                            (x + 4, 6, x + self.cell_width - 4, self.height - 6),
+                            fill="white", outline="gray40", width=3)
+            self.items.sync(("value", i), "text", (x + self.cell_width / 2, self.height / 2),
+                            text=str(self.values[i]), fill="black", font=self.font)
+        self.items.end()
+        self.canvas.configure(scrollregion=(0, 0, max(width, self._length() * self.cell_width),
+                                            self.height))
+
+    def _step(self) -> None:
+        self._after_id = None
+        index = self._revealed
+        self._pull(index + 1)
+        if index >= len(self.values):
+            self._revealed = None      # done: the whole row is now browsable
+            self.render()
+            if self._on_done is not None:
+                self._on_done()
+            return
+        self._revealed = index + 1
+        self.render()
+        # the scrollregion ends at the newest cell; keep it in view
+        if (index + 1) * self.cell_width > self.canvas.canvasx(self.canvas.winfo_width()):
+            self.canvas.xview_moveto(1.0)
+            self.render()
+        if self._on_step is not None:
+            self._on_step(index, self.values[index])
+        self._after_id = self.canvas.after(self._step_ms, self._step)
@@ -0,0 +1,319 @@
+# tree_cli.py  –  headless command-stream driver for the tree engines
+"""Feeds a stream of commands to a tree without Tk.
+
+One command per line, values separated by spaces or commas::
+
+    insert 5 3 8        delete 3            search 5 9
+    range 1 100         dump [inorder|preorder|postorder|levelorder]
+    clear               # comments and blank lines are skipped
+
+``search`` prints ``<value> found`` or ``<value> not found`` per value,
+``range`` and ``dump`` print the matching values on one line, and
+``insert``/``delete``/``clear`` print nothing.  The ``rbt-color-only``
+engine reports ``delete`` lines as errors, because its trees do not keep
+the invariants deletion needs.  Traces written by the
+visualizers (see op_trace.py) use the same format and replay as-is::
+
+    python tree_cli.py --tree rbt --stats trace.txt
+    generate_ops | python tree_cli.py --tree bst > results.txt
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from itertools import islice
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from bst_logic import BinarySearchTree, CompactBinarySearchTree
+from rbt_logic import RedBlackTree
+from tree_walks import range_values
+
+ORDERS = ("inorder", "preorder", "postorder", "levelorder")
+Command = Tuple[str, list]
+
+
+class CommandError(ValueError):
+    """A line that does not parse; reported with its line number and skipped."""
+
+
+def parse_line(line: str) -> Optional[Command]:
+    """``(name, args)`` for a command line, None for a blank or comment line."""
+    fields = line.replace(",", " ").split()
+    if not fields or fields[0].startswith("#"):
+        return None
+    name, args = fields[0].lower(), fields[1:]
+    if name == "dump":
+        if len(args) > 1 or (args and args[0].lower() not in ORDERS):
+            raise CommandError(f"dump takes one of {', '.join(ORDERS)}")
+        return name, [args[0].lower() if args else "inorder"]
+    if name == "clear":
+        if args:
+            raise CommandError("clear takes no values")
+        return name, []
+    if name not in ("insert", "delete", "search", "range"):
+        raise CommandError(f"unknown command '{fields[0]}'")
+    try:
+        values = [int(arg) for arg in args]
+    except ValueError as e:
+        raise CommandError(f"{name}: {e}") from None
+    if name == "range" and len(values) != 2:
+        raise CommandError("range takes exactly two values: low high")
+    if not values:
+        raise CommandError(f"{name} needs at least one value")
+    return name, values
+
+
+# --------------------------------------------------
+#  ENGINES
+# --------------------------------------------------
+class BSTEngine:
+    """Drives ``BinarySearchTree`` (or its compact variant)."""
+
+    # command -> why this engine refuses it; checked per line by run()
+    unsupported: Dict[str, str] = {}
+
+    def __init__(self, compact: bool = False) -> None:
+        self.tree_class = CompactBinarySearchTree if compact else BinarySearchTree
+        self.tree = self.tree_class()
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def insert(self, values: List[int]) -> int:
+        insert = self.tree.insert
+        inserted = sum(1 for value in values if insert(value))
+        self.size += inserted
+        return inserted
+
+    def delete(self, values: List[int]) -> int:
+        delete = self.tree.delete
+        deleted = sum(1 for value in values if delete(value))
+        self.size -= deleted
+        return deleted
+
+    def contains(self, value: int) -> bool:
+        return self.tree.search(value) is not None
+
+    def range(self, lo: int, hi: int) -> List[int]:
+        return range_values(self.tree.root, lo, hi)
+
+    def dump(self, order: str) -> Iterator[int]:
+        walks = {"inorder": self.tree.iter_in_order, "preorder": self.tree.iter_pre_order,
+                 "postorder": self.tree.iter_post_order, "levelorder": self.tree.iter_level_order}
+        return walks[order]()
+
+    def clear(self) -> None:
+        self.tree = self.tree_class()
+        self.size = 0
+
+    def end_batch(self) -> None:
+        pass
+
+
+class RBTEngine:
+    """Drives ``RedBlackTree``, fixing each insert up straight away as the
+    visualizer's animation eventually does."""
+
+    def __init__(self, color_only: bool = False) -> None:
+        self.tree = RedBlackTree(color_only=color_only)
+        self.size = 0
+        # color-only fix-up skips rotations, so red-red chains and unequal
+        # black heights remain, and the delete fix-up walks off the tree
+        self.unsupported: Dict[str, str] = (
+            {"delete": "delete is not supported on a color-only tree"} if color_only else {})
+
+    def __len__(self) -> int:
+        return self.size
+
+    def insert(self, values: List[int]) -> int:
+        tree = self.tree
+        inserted = 0
+        for value in values:
+            if tree.insert(value):
+                tree.rebalance_batch(1)
+                inserted += 1
+        self.size += inserted
+        return inserted
+
+    def delete(self, values: List[int]) -> int:
+        delete = self.tree.delete
+        deleted = sum(1 for value in values if delete(value))
+        self.size -= deleted
+        return deleted
+
+    def contains(self, value: int) -> bool:
+        return self.tree.search_value(value) is not None
+
+    def range(self, lo: int, hi: int) -> List[int]:
+        return range_values(self.tree.root, lo, hi, self.tree.nil)
+
+    def dump(self, order: str) -> Iterator[int]:
+        # iterative: a color-only tree skips rotations and can be very deep
+        nil = self.tree.nil
+        root = self.tree.root
+        if root is nil:
+            return
+        if order == "levelorder":
+            level = [root]
+            while level:
+                yield from (node.value for node in level)
+                level = [child for node in level for child in (node.left, node.right)
+                         if child is not nil]
+        elif order == "preorder":
+            stack = [root]
+            while stack:
+                node = stack.pop()
+                yield node.value
+                if node.right is not nil:
+                    stack.append(node.right)
+                if node.left is not nil:
+                    stack.append(node.left)
+        elif order == "postorder":
+            # reversed (node, right, left) preorder
+            stack, out = [root], []
+            while stack:
+                node = stack.pop()
+                out.append(node.value)
+                if node.left is not nil:
+                    stack.append(node.left)
+                if node.right is not nil:
+                    stack.append(node.right)
+            yield from reversed(out)
+        else:
+            stack = []
+            node = root
+            while stack or node is not nil:
+                while node is not nil:
+                    stack.append(node)
+                    node = node.left
+                node = stack.pop()
+                yield node.value
+                node = node.right
+
+    def clear(self) -> None:
+        self.tree.clear()
+        self.size = 0
+
+    def end_batch(self) -> None:
+        # nobody reads the step log here; don't let it grow without bound
+        self.tree.steps.clear()
+
+
+ENGINES = {
+    "bst": BSTEngine,
+    "bst-compact": lambda: BSTEngine(compact=True),
+    "rbt": RBTEngine,
+    "rbt-color-only": lambda: RBTEngine(color_only=True),
+}
+
+
+# --------------------------------------------------
+#  RUNNER
+# --------------------------------------------------
+class Stats:
+    def __init__(self) -> None:
+        self.ops: Counter = Counter()       # per command, counting each value
+        self.lines = 0
+        self.errors = 0
+        self.parse_time = 0.0
+        self.exec_time = 0.0
+
+    def report(self, engine, elapsed: float, out: IO[str]) -> None:
+        total = sum(self.ops.values())
+        rate = total / elapsed if elapsed > 0 else float("inf")
+        print(f"lines: {self.lines:,}  errors: {self.errors:,}  final size: {len(engine):,}", file=out)
+        for name, count in sorted(self.ops.items()):
+            print(f"  {name:>7}: {count:,}", file=out)
+        print(f"parse {self.parse_time:.3f} s, execute {self.exec_time:.3f} s, "
+              f"wall {elapsed:.3f} s -> {rate:,.0f} ops/sec", file=out)
+
+
+def run(lines: Iterable[str], engine, out: IO[str], err: IO[str], batch: int = 4096) -> Stats:
+    """Parses ``batch`` lines, executes them, then writes all their output
+    with a single ``write``."""
+    stats = Stats()
+    lines = iter(lines)
+    while True:
+        chunk = list(islice(lines, batch))
+        if not chunk:
+            break
+
+        start = time.perf_counter()
+        commands: List[Command] = []
+        for offset, line in enumerate(chunk):
+            try:
+                command = parse_line(line)
+                if command is not None and command[0] in engine.unsupported:
+                    raise CommandError(engine.unsupported[command[0]])
+            except CommandError as e:
+                stats.errors += 1
+                print(f"tree_cli: line {stats.lines + offset + 1}: {e}", file=err)
+                continue
+            if command is not None:
+                commands.append(command)
+        stats.lines += len(chunk)
+        parsed = time.perf_counter()
+
+        results: List[str] = []
+        for name, args in commands:
+            if name == "insert":
+                engine.insert(args)
+            elif name == "delete":
+                engine.delete(args)
+            elif name == "search":
+                contains = engine.contains
+                results.extend(f"{value} found" if contains(value) else f"{value} not found"
+                               for value in args)
+            elif name == "range":
+                results.append(" ".join(map(str, engine.range(*args))))
+            elif name == "dump":
+                results.append(" ".join(map(str, engine.dump(args[0]))))
+            else:
+                engine.clear()
+            stats.ops[name] += len(args) if name in ("insert", "delete", "search") else 1
+        engine.end_batch()
+        if results:
+            results.append("")
+            out.write("\n".join(results))
+        stats.parse_time += parsed - start
+        stats.exec_time += time.perf_counter() - parsed
+    out.flush()
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run tree commands from a file or stdin.")
+    parser.add_argument("input", nargs="?", default="-", help="command file ('-' for stdin)")
+    parser.add_argument("--tree", choices=sorted(ENGINES), default="rbt")
+    parser.add_argument("--batch", type=int, default=4096, help="lines parsed and executed per batch")
+    parser.add_argument("--stats", action="store_true", help="report ops/sec on stderr")
+    args = parser.parse_args(argv)
+    if args.batch < 1:
+        parser.error("--batch must be >= 1")
+
+    engine = ENGINES[args.tree]()
+    # output is written a batch at a time; a large buffer keeps it in few syscalls
+    out = open(sys.stdout.fileno(), "w", encoding="utf-8", buffering=1 << 16, closefd=False)
+    start = time.perf_counter()
+    try:
+        with (sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")) as source:
+            stats = run(source, engine, out, sys.stderr, args.batch)
+        out.close()
+    except BrokenPipeError:
+        # the reader went away (e.g. "| head"); send what is still buffered
+        # to devnull so the interpreter's exit flush doesn't fail again
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except OSError as e:
+        print(f"tree_cli: {e}", file=sys.stderr)
+        return 1
+    if args.stats:
+        stats.report(engine, time.perf_counter() - start, sys.stderr)
+    return 1 if stats.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+# tree_map.py  –  sorted map and multiset modes for the BST and Red-Black engines
+
+from typing import Any, Iterator, Optional, Tuple, Union
+
+from bst_logic import BinarySearchTree
+from rbt_logic import RedBlackTree
+
+Tree = Union[BinarySearchTree, RedBlackTree]
+
+_MISSING = object()
+
+
+class _TreeMode:
+    """Shared plumbing: the engine, single-descent lookups and an in-order
+    walk over (key, payload).  Payloads live on the tree nodes, so every
+    operation is one descent with no side dict to keep in step."""
+
+    def __init__(self, engine: str = "rbt", pool_size: int = 0) -> None:
+        if engine == "rbt":
+            self.tree: Tree = RedBlackTree(pool_size=pool_size)
+            self._nil = self.tree.nil
+            self._find = self.tree.search_value
+        elif engine == "bst":
+            self.tree = BinarySearchTree(pool_size=pool_size)
+            self._nil = None
+            self._find = self.tree.search
+        else:
+            raise ValueError(f"unknown engine {engine!r} (expected 'rbt' or 'bst')")
+
+    def _find_or_insert(self, key: int) -> Tuple[Any, bool]:
+        node, created = self.tree.find_or_insert(key)
+        if created and self._nil is not None:
+            self.tree.rebalance_batch(1)
+            self.tree.steps.clear()
+        return node, created
+
+    def _remove(self, node: Any) -> None:
+        if self._nil is not None:
+            self.tree._delete_node(node)        # already found: no second descent
+            self.tree.steps.clear()
+        else:
+            self.tree.delete(node.value)
+
+    def __contains__(self, key: int) -> bool:
+        return self._find(key) is not None
+
+    def _clear_tree(self) -> None:
+        self.tree.clear()
+        if self._nil is not None:
+            self.tree.steps.clear()
+
+    def _walk(self, lo: Optional[int] = None, hi: Optional[int] = None) -> Iterator[Tuple[int, Any]]:
+        """(key, payload) for lo <= key <= hi, ascending; subtrees outside
+        the bounds are skipped.  The tree must not change during the walk."""
+        nil = self._nil
+        stack = []
+        node = self.tree.root
+        while stack or node is not nil:
+            while node is not nil:
+                if lo is not None and node.value < lo:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            if hi is not None and node.value > hi:
+                return
+            yield node.value, node.payload
+            node = node.right
+
+
+class TreeMap(_TreeMode):
+    """Sorted int → value mapping.  ``len()`` is O(1); lookups, updates and
+    ``in`` are one descent, so O(log n) on the ``"rbt"`` engine."""
+
+    def __init__(self, engine: str = "rbt", pool_size: int = 0) -> None:
+        super().__init__(engine, pool_size)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, key: int) -> Any:
+        node = self._find(key)
+        if node is None:
+            raise KeyError(key)
+        return node.payload
+
+    def __setitem__(self, key: int, value: Any) -> None:
+        node, created = self._find_or_insert(key)
+        node.payload = value
+        if created:
+            self._size += 1
+
+    def __delitem__(self, key: int) -> None:
+        node = self._find(key)
+        if node is None:
+            raise KeyError(key)
+        self._remove(node)
+        self._size -= 1
+
+    def get(self, key: int, default: Any = None) -> Any:
+        node = self._find(key)
+        return default if node is None else node.payload
+
+    def setdefault(self, key: int, default: Any = None) -> Any:
+        node, created = self._find_or_insert(key)
+        if created:
+            node.payload = default
+            self._size += 1
+        return node.payload
+
+    def pop(self, key: int, default: Any = _MISSING) -> Any:
+        node = self._find(key)
+        if node is None:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        value = node.payload
+        self._remove(node)
+        self._size -= 1
+        return value
+
+    def __iter__(self) -> Iterator[int]:
+        return (key for key, _ in self._walk())
+
+    def keys(self) -> Iterator[int]:
+        return iter(self)
+
+    def values(self) -> Iterator[Any]:
+        return (value for _, value in self._walk())
+
+    def items(self, lo: Optional[int] = None, hi: Optional[int] = None) -> Iterator[Tuple[int, Any]]:
+        """(key, value) pairs in key order, optionally only lo <= key <= hi."""
+        return self._walk(lo, hi)
+
+    def clear(self) -> None:
+        self._clear_tree()
+        self._size = 0
+
+
+class TreeMultiset(_TreeMode):
+    """Sorted multiset of ints: one node per distinct value, with its count
+    kept on the node.  ``len()`` is the total count, in O(1)."""
+
+    def __init__(self, engine: str = "rbt", pool_size: int = 0) -> None:
+        super().__init__(engine, pool_size)
+        self._size = 0
+        self.distinct = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, value: int, count: int = 1) -> int:
+        """Adds ``count`` copies; returns the new count of ``value``."""
+        if count < 1:
+            raise ValueError("count must be >= 1")
+        node, created = self._find_or_insert(value)
+        if created:
+            node.payload = count
+            self.distinct += 1
+        else:
+            node.payload += count
+        self._size += count
+        return node.payload
+
+    def remove(self, value: int, count: int = 1) -> int:
+        """Removes up to ``count`` copies (KeyError if there are none);
+        returns how many are left."""
+        if count < 1:
+            raise ValueError("count must be >= 1")
+        node = self._find(value)
+        if node is None:
+            raise KeyError(value)
+        return self._take(node, count)
+
+    def discard(self, value: int, count: int = 1) -> int:
+        """Like remove, but a missing value is not an error."""
+        if count < 1:
+            raise ValueError("count must be >= 1")
+        node = self._find(value)
+        return 0 if node is None else self._take(node, count)
+
+    def _take(self, node: Any, count: int) -> int:
+        if node.payload > count:
+            node.payload -= count
+            self._size -= count
+            return node.payload
+        self._size -= node.payload
+        self.distinct -= 1
+        self._remove(node)
+        return 0
+
+    def count(self, value: int) -> int:
+        node = self._find(value)
+        return 0 if node is None else node.payload
+
+    def __iter__(self) -> Iterator[int]:
+        """Every copy, ascending."""
+        for value, count in self._walk():
+            for _ in range(count):
+                yield value
+
+    def items(self, lo: Optional[int] = None, hi: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+        """(value, count) pairs in value order, optionally only lo <= value <= hi."""
+        return self._walk(lo, hi)
+
+    def clear(self) -> None:
+        self._clear_tree()
+        self._size = 0
+        self.distinct = 0
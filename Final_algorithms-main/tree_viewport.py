@@ -0,0 +1,115 @@
+# tree_viewport.py  –  viewport culling + level-of-detail for in-order tree layouts
+#
+# Both visualizers place a node at column = in-order rank and row = depth, so a
+# subtree always covers the contiguous columns [rank - size(left), rank + size(right)].
+# That lets us skip whole subtrees that are off screen or too narrow to read
+# without ever looking at their nodes.
+
+import math
+import tkinter as tk
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+Children = Callable[[Any], Tuple[Optional[Any], Optional[Any]]]
+
+
+def visible_region(canvas: tk.Canvas, pad: int = 0) -> Tuple[float, float, float, float]:
+    """Canvas coordinates (x0, y0, x1, y1) of the part currently scrolled into view."""
+    x0 = canvas.canvasx(0) - pad
+    y0 = canvas.canvasy(0) - pad
+    x1 = canvas.canvasx(canvas.winfo_width()) + pad
+    y1 = canvas.canvasy(canvas.winfo_height()) + pad
+    return x0, y0, x1, y1
+
+
+def subtree_stats(root: Any, children: Children) -> Dict[Hashable, Tuple[int, int]]:
+    """node -> (size, height) for every node, in one iterative post-order pass."""
+    stats: Dict[Hashable, Tuple[int, int]] = {}
+    if root is None:
+        return stats
+    stack: List[Tuple[Any, bool]] = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        left, right = children(node)
+        if not expanded:
+            stack.append((node, True))
+            if right is not None:
+                stack.append((right, False))
+            if left is not None:
+                stack.append((left, False))
+            continue
+        size, height = 1, 1
+        for child in (left, right):
+            if child is not None:
+                child_size, child_height = stats[child]
+                size += child_size
+                height = max(height, child_height + 1)
+        stats[node] = (size, height)
+    return stats
+
+
+class ViewportCull:
+    """Result of one culling pass.
+
+    ``nodes``     nodes whose own cell is inside the viewport
+    ``edges``     (parent, child) pairs with at least one end worth drawing
+    ``collapsed`` subtree roots too narrow to draw node by node
+    """
+
+    def __init__(self) -> None:
+        self.nodes: List[Any] = []
+        self.edges: List[Tuple[Any, Any]] = []
+        self.collapsed: List[Any] = []
+
+
+def cull(root: Any, children: Children, cell: Callable[[Any], Tuple[int, int]],
+         stats: Dict[Hashable, Tuple[int, int]],
+         columns: Tuple[float, float], rows: Tuple[float, float],
+         min_columns: int = 1) -> ViewportCull:
+    """Walks down from root, pruning subtrees outside ``columns``/``rows``
+    (inclusive ranges, in layout cells) and collapsing subtrees that span
+    fewer than ``min_columns`` columns.  ``cell(node)`` gives (rank, depth)."""
+    result = ViewportCull()
+    if root is None:
+        return result
+    c0, c1 = columns
+    r0, r1 = rows
+
+    def span(node: Any) -> Tuple[int, int]:
+        left, right = children(node)
+        rank = cell(node)[0]
+        lo = rank - (stats[left][0] if left is not None else 0)
+        hi = rank + (stats[right][0] if right is not None else 0)
+        return lo, hi
+
+    def in_view(node: Any) -> bool:
+        lo, hi = span(node)
+        return hi >= c0 and lo <= c1 and cell(node)[1] <= r1
+
+    if not in_view(root):
+        return result
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        rank, depth = cell(node)
+        if stats[node][0] < min_columns:
+            result.collapsed.append(node)
+            continue
+        shown = c0 <= rank <= c1 and r0 <= depth <= r1
+        if shown:
+            result.nodes.append(node)
+        for child in children(node):
+            if child is None:
+                continue
+            child_in_view = in_view(child)
+            if shown or child_in_view:
+                result.edges.append((node, child))
+            if child_in_view:
+                stack.append(child)
+    return result
+
+
+def min_columns_for(gap_px: float, lod_px: float) -> int:
+    """Smallest subtree (in columns) still drawn node by node at this gap."""
+    if gap_px <= 0:
+        return 1
+    return max(1, math.ceil(lod_px / gap_px))
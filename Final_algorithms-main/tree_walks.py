@@ -0,0 +1,27 @@
+# tree_walks.py  –  traversals shared by the tree engines and their wrappers
+
+from typing import List
+
+
+def range_values(root, lo: int, hi: int, nil=None) -> List[int]:
+    """Values in [lo, hi] in order; subtrees wholly outside are never entered.
+    Any node with value/left/right works; ``nil`` is the empty child (None,
+    or a RedBlackTree's sentinel)."""
+    out: List[int] = []
+    stack = []
+    node = root
+    while stack or node is not nil:
+        while node is not nil:
+            if node.value < lo:
+                node = node.right       # it and its left subtree are too small
+            else:
+                stack.append(node)
+                node = node.left
+        if not stack:
+            break
+        node = stack.pop()
+        if node.value > hi:
+            break
+        out.append(node.value)
+        node = node.right
+    return out
@@ -0,0 +1,171 @@
+# tree_worker.py  –  runs heavy tree operations off the Tk thread
+
+import queue
+import threading
+import time
+import tkinter as tk
+from typing import Any, Callable, Optional
+
+
+class JobCancelled(Exception):
+    """Raised inside a job by ``Job.check()`` once the job has been cancelled."""
+
+
+class Job:
+    """Handle shared by the UI and the worker for one submitted operation.
+
+    The job function receives it as its first argument and calls
+    ``report(done, total)`` as it goes and ``check()`` at safe points, where
+    a pending cancel raises ``JobCancelled``.  Reports are throttled to
+    ``report_interval`` seconds so a tight loop can call ``report`` freely.
+    """
+
+    report_interval = 0.05
+
+    def __init__(self, name: str, events: "queue.Queue[tuple[str, Job, Any]]") -> None:
+        self.name = name
+        self._events = events
+        self._cancel = threading.Event()
+        self._last_report = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def check(self) -> None:
+        if self._cancel.is_set():
+            raise JobCancelled(self.name)
+
+    def report(self, done: int, total: int, snapshot: Any = None) -> None:
+        now = time.perf_counter()
+        if done < total and now - self._last_report < self.report_interval:
+            return
+        self._last_report = now
+        self._events.put(("progress", self, (done, total, snapshot)))
+
+
+class TreeWorker:
+    """One background thread that runs submitted jobs in order.
+
+    Jobs must only touch data the UI leaves alone while they run (a tree the
+    UI is not drawing, or one it only reads).  Everything they produce comes
+    back through a thread-safe queue that the Tk side drains from ``after()``
+    callbacks, which are armed only while a job is outstanding, so callbacks
+    always run on the Tk thread.
+    """
+
+    def __init__(self, widget: tk.Misc, poll_ms: int = 30) -> None:
+        self.widget = widget
+        self.poll_ms = poll_ms
+        self._jobs: "queue.Queue[Optional[tuple[Job, Callable[..., Any], tuple]]]" = queue.Queue()
+        self._events: "queue.Queue[tuple[str, Job, Any]]" = queue.Queue()
+        self._handlers: dict = {}
+        self._thread: Optional[threading.Thread] = None
+        self._after_id: Optional[str] = None
+        self._outstanding = 0
+        self.current: Optional[Job] = None
+
+    # --------------------------------------------------
+    #  PUBLIC (Tk thread)
+    # --------------------------------------------------
+    def submit(self, name: str, fn: Callable[..., Any], *args: Any,
+               on_progress: Optional[Callable[[int, int, Any], None]] = None,
+               on_done: Optional[Callable[[Any], None]] = None,
+               on_cancel: Optional[Callable[[], None]] = None,
+               on_error: Optional[Callable[[BaseException], None]] = None) -> Job:
+        """Queues ``fn(job, *args)``; its return value goes to ``on_done``."""
+        job = Job(name, self._events)
+        self._handlers[job] = (on_progress, on_done, on_cancel, on_error)
+        self._outstanding += 1
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="tree-worker", daemon=True)
+            self._thread.start()
+        self._jobs.put((job, fn, args))
+        self._arm()
+        return job
+
+    @property
+    def busy(self) -> bool:
+        return self._outstanding > 0
+
+    def cancel_all(self) -> None:
+        for job in self._handlers:
+            job.cancel()
+
+    def close(self) -> None:
+        self.cancel_all()
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        if self._thread is not None:
+            self._jobs.put(None)
+        self._handlers.clear()
+        self._outstanding = 0
+
+    # --------------------------------------------------
+    #  WORKER THREAD
+    # --------------------------------------------------
+    def _run(self) -> None:
+        while True:
+            item = self._jobs.get()
+            if item is None:
+                return
+            job, fn, args = item
+            self.current = job
+            try:
+                job.check()
+                result = fn(job, *args)
+                self._events.put(("done", job, result))
+            except JobCancelled:
+                self._events.put(("cancelled", job, None))
+            except BaseException as e:   # reported to the UI, never lost
+                self._events.put(("error", job, e))
+            finally:
+                self.current = None
+
+    # --------------------------------------------------
+    #  TK SIDE
+    # --------------------------------------------------
+    def _arm(self) -> None:
+        if self._after_id is None and self._outstanding:
+            self._after_id = self.widget.after(self.poll_ms, self._drain)
+
+    def _drain(self) -> None:
+        self._after_id = None
+        latest = {}
+        finished = []
+        while True:
+            try:
+                kind, job, payload = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                latest[job] = payload          # only the newest report matters
+            else:
+                latest.pop(job, None)
+                finished.append((kind, job, payload))
+
+        try:
+            for job, (done, total, snapshot) in latest.items():
+                on_progress = self._handlers.get(job, (None,))[0]
+                if on_progress is not None:
+                    on_progress(done, total, snapshot)
+            for kind, job, payload in finished:
+                handlers = self._handlers.pop(job, None)
+                if handlers is None:
+                    continue
+                self._outstanding -= 1
+                _, on_done, on_cancel, on_error = handlers
+                if kind == "done" and on_done is not None:
+                    on_done(payload)
+                elif kind == "cancelled" and on_cancel is not None:
+                    on_cancel()
+                elif kind == "error":
+                    if on_error is None:
+                        raise payload
+                    on_error(payload)
+        finally:
+            self._arm()